@@ -1,17 +1,33 @@
 """일간 Daily 데이터베이스에 새 페이지를 추가하고 템플릿을 적용하는 스크립트."""
+import os
+import json
 import time
+import sqlite3
+import hashlib
 import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from notion_client import Client
-from notion_config import get_client, DAILY_DS_ID, DAILY_DB_ID, TEMPLATE_PAGE_ID
+from notion_config import (
+    get_client, query_all, page_date, DAILY_DS_ID, DAILY_DB_ID, TEMPLATE_PAGE_ID, STATE_DIR,
+    SYNCED_LABELS,
+)
 
 log = logging.getLogger("notion_daily")
 
-# synced_block으로 감쌀 heading 이름
-_SYNCED_HEADINGS = {"기록 - 개인", "기록 - 업무"}
-
 # API로 생성 불가능한 블록 타입
 _SKIP_TYPES = {"unsupported", "child_page", "child_database", "link_preview"}
 
+# 템플릿 계획을 프로세스 안에서 재사용하는 시간 (초)
+TEMPLATE_CACHE_SEC = float(os.environ.get("NOTION_TEMPLATE_CACHE_SEC", "600"))
+
+# 페이지별 템플릿 계획 기록
+TEMPLATE_STATE_PATH = STATE_DIR / "template_plans.sqlite"
+
+# 범위 실행에서 Daily 페이지를 동시에 만들 개수 (속도 제한은 토큰별로 공유)
+DAILY_CONCURRENCY = int(os.environ.get("NOTION_DAILY_CONCURRENCY", "4"))
+
 
 # ── 블록 읽기 (재귀) ──
 
@@ -60,41 +76,72 @@ def clean_block(block: dict) -> dict | None:
     return cleaned
 
 
-# ── 템플릿 복사 (synced_block 감싸기 포함) ──
+# ── 템플릿 계획 ──
+#
+# 템플릿을 한 번 읽어 "만들 블록 트리"(계획)로 변환해 둔다.
+# 노드: {"sig", "hash", "label", "block", "children"}
+#   sig: 블록 내용의 서명 (synced 노드는 "synced:<label>")
+#   hash: 자식까지 포함한 서명 (하위 트리가 같으면 같은 값)
+#   label: synced_block으로 감싼 heading 이름, 아니면 None
+#   block: 생성 요청에 그대로 쓰는 블록
+# synced 노드의 children은 [내부 heading_3 노드] 하나이며, heading은 synced_block과 함께 생성된다.
 
+_template_cache = {}  # template_page_id → (읽은 시각, plan)
+_template_lock = threading.Lock()
 
-def copy_template_with_synced(
-    notion: Client, template_page_id: str, target_page_id: str
-) -> dict:
-    """
-    템플릿 블록을 복사하되, '기록-개인/업무' heading_3는 synced_block으로 감싼다.
-    rich_text(색상 등)를 그대로 유지한다.
 
-    Returns:
-        {"기록 - 개인": synced_block_id, "기록 - 업무": synced_block_id}
-    """
-    template_blocks = read_blocks(notion, template_page_id)
+def _normalize(value):
+    """서명 계산용: 응답에만 있는 plain_text/href를 빼고 키를 정렬한다."""
+    if isinstance(value, dict):
+        return {
+            k: _normalize(v) for k, v in sorted(value.items())
+            if k not in ("plain_text", "href", "children")
+        }
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
 
-    # 1단계: 최상위 블록 목록 구성 (heading_3 → synced_block 변환)
-    blocks_to_create = []
-    # 각 블록에 대해 (synced_heading_name or None, children) 기록
-    block_meta = []
 
-    for block in template_blocks:
+def block_signature(block: dict) -> str:
+    """블록 내용(타입 + 타입 데이터)의 서명. 템플릿 블록과 페이지 블록을 같은 방식으로 비교한다."""
+    btype = block.get("type", "")
+    raw = json.dumps(
+        {"type": btype, btype: _normalize(block.get(btype) or {})},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _make_node(block: dict, children: list, label: str | None = None) -> dict:
+    sig = f"synced:{label}" if label else block_signature(block)
+    digest = hashlib.sha1(sig.encode())
+    for child in children:
+        digest.update(child["hash"].encode())
+    return {
+        "sig": sig,
+        "hash": digest.hexdigest()[:16],
+        "label": label,
+        "block": block,
+        "children": children,
+    }
+
+
+def _plan_nodes(blocks: list) -> list:
+    nodes = []
+    for block in blocks:
         btype = block.get("type")
         if not btype or btype in _SKIP_TYPES:
             continue
 
+        children = _plan_nodes(block.get("_children", []))
         text = get_text(block)
-        children = block.get("_children", [])
 
-        if btype == "heading_3" and text in _SYNCED_HEADINGS:
+        if btype == "heading_3" and text in SYNCED_LABELS:
             # heading_3의 원본 rich_text와 속성을 그대로 사용
             heading_data = block.get("heading_3", {})
-            original_rich_text = heading_data.get("rich_text", [])
             # rich_text에서 href만 정리 (복사 시 불필요한 링크 제거)
             clean_rich_text = []
-            for rt in original_rich_text:
+            for rt in heading_data.get("rich_text", []):
                 clean_rt = {
                     "type": rt.get("type", "text"),
                     "text": rt.get("text", {}),
@@ -103,99 +150,306 @@ def copy_template_with_synced(
                     clean_rt["annotations"] = rt["annotations"]
                 clean_rich_text.append(clean_rt)
 
-            blocks_to_create.append({
+            heading = {
+                "type": "heading_3",
+                "heading_3": {"rich_text": clean_rich_text, "is_toggleable": True},
+            }
+            synced = {
                 "type": "synced_block",
-                "synced_block": {
-                    "synced_from": None,
-                    "children": [{
-                        "type": "heading_3",
-                        "heading_3": {
-                            "rich_text": clean_rich_text,
-                            "is_toggleable": True,
-                        },
-                    }],
-                },
-            })
-            block_meta.append((text, children))
+                "synced_block": {"synced_from": None, "children": [heading]},
+            }
+            nodes.append(_make_node(synced, [_make_node(heading, children)], label=text))
         else:
             cleaned = clean_block(block)
             if cleaned:
-                blocks_to_create.append(cleaned)
-                block_meta.append((None, children))
+                nodes.append(_make_node(cleaned, children))
+    return nodes
 
-    # 2단계: 블록 일괄 생성
-    log.info(f"  블록 {len(blocks_to_create)}개 생성 중...")
-    created = []
-    for i in range(0, len(blocks_to_create), 100):
-        batch = blocks_to_create[i : i + 100]
-        resp = notion.blocks.children.append(block_id=target_page_id, children=batch)
-        created.extend(resp.get("results", []))
-        if i + 100 < len(blocks_to_create):
-            time.sleep(0.35)
 
-    # 3단계: synced_block ID 수집 + heading children 복원
-    synced_ids = {}
-    for idx, (label, children) in enumerate(block_meta):
-        if idx >= len(created):
-            break
+def compile_template(
+    notion: Client, template_page_id: str, refresh: bool = False
+) -> dict:
+    """
+    템플릿 페이지를 읽어 생성 계획으로 변환한다.
+    같은 프로세스에서는 TEMPLATE_CACHE_SEC 동안 다시 읽지 않는다 (refresh=True면 항상 새로 읽음).
+
+    Returns:
+        {"template_id", "hash", "nodes"}
+    """
+    with _template_lock:
+        cached = _template_cache.get(template_page_id)
+    if cached and not refresh and time.monotonic() - cached[0] < TEMPLATE_CACHE_SEC:
+        return cached[1]
+
+    nodes = _plan_nodes(read_blocks(notion, template_page_id))
+    digest = hashlib.sha1()
+    for node in nodes:
+        digest.update(node["hash"].encode())
+    plan = {"template_id": template_page_id, "hash": digest.hexdigest()[:16], "nodes": nodes}
+
+    with _template_lock:
+        _template_cache[template_page_id] = (time.monotonic(), plan)
+    save_template_plan(plan)
+    return plan
+
+
+# ── 템플릿 계획 기록 ──
+# 페이지마다 어떤 계획으로 만들어졌는지 남겨 두면,
+# 템플릿 동기화가 바뀐 부분만 골라 읽고 고칠 수 있다 (template_sync.py).
+
+_PLAN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    hash TEXT PRIMARY KEY,
+    template_id TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_plans (
+    page_id TEXT PRIMARY KEY,
+    plan_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_synced (
+    page_id TEXT PRIMARY KEY,
+    synced TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pending_pages (
+    page_id TEXT PRIMARY KEY,
+    template_id TEXT NOT NULL
+);
+"""
+
+
+def _plan_db() -> sqlite3.Connection:
+    TEMPLATE_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(TEMPLATE_STATE_PATH, timeout=60)
+    conn.executescript(_PLAN_SCHEMA)
+    return conn
+
+
+def save_template_plan(plan: dict):
+    conn = _plan_db()
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO plans (hash, template_id, plan, created) VALUES (?, ?, ?, ?)",
+            (plan["hash"], plan["template_id"], json.dumps(plan, ensure_ascii=False), time.time()),
+        )
+    conn.close()
+
+
+def record_page_plan(page_id: str, plan_hash: str):
+    """page_id가 plan_hash 계획과 같은 구성임을 기록한다."""
+    conn = _plan_db()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO page_plans (page_id, plan_hash) VALUES (?, ?)",
+            (page_id, plan_hash),
+        )
+    conn.close()
+
+
+def load_page_plan(page_id: str) -> dict | None:
+    """페이지를 만들 때(또는 마지막 동기화 때) 쓴 계획. 기록이 없으면 None."""
+    conn = _plan_db()
+    row = conn.execute(
+        "SELECT p.plan FROM page_plans pp JOIN plans p ON p.hash = pp.plan_hash "
+        "WHERE pp.page_id = ?",
+        (page_id,),
+    ).fetchone()
+    conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def load_template_plan(template_id: str) -> dict | None:
+    """template_id로 마지막에 컴파일한 계획 (API 호출 없음). 기록이 없으면 None."""
+    conn = _plan_db()
+    row = conn.execute(
+        "SELECT plan FROM plans WHERE template_id = ? ORDER BY created DESC LIMIT 1",
+        (template_id,),
+    ).fetchone()
+    conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def record_page_synced(page_id: str, synced_ids: dict):
+    """페이지의 synced_block 원본 ID({label: block_id})를 기록한다."""
+    conn = _plan_db()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO page_synced (page_id, synced) VALUES (?, ?)",
+            (page_id, json.dumps(synced_ids, ensure_ascii=False)),
+        )
+    conn.close()
+
+
+def load_page_synced(page_id: str) -> dict | None:
+    conn = _plan_db()
+    row = conn.execute(
+        "SELECT synced FROM page_synced WHERE page_id = ?", (page_id,)
+    ).fetchone()
+    conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def mark_template_pending(page_id: str, template_id: str | None):
+    """
+    템플릿 적용을 시작하기 전에 페이지를 기록하고, 끝나면 template_id=None으로 지운다.
+    기록이 남은 페이지는 적용이 중간에 실패한 것이다 (daily_synced_ids가 마저 채운다).
+    """
+    conn = _plan_db()
+    with conn:
+        if template_id:
+            conn.execute(
+                "INSERT OR REPLACE INTO pending_pages (page_id, template_id) VALUES (?, ?)",
+                (page_id, template_id),
+            )
+        else:
+            conn.execute("DELETE FROM pending_pages WHERE page_id = ?", (page_id,))
+    conn.close()
+
+
+def is_template_pending(page_id: str) -> bool:
+    conn = _plan_db()
+    row = conn.execute(
+        "SELECT 1 FROM pending_pages WHERE page_id = ?", (page_id,)
+    ).fetchone()
+    conn.close()
+    return row is not None
+
+
+def find_synced_ids(
+    notion: Client, page_id: str, template_page_id: str | None = None, refresh: bool = False
+) -> dict:
+    """
+    기존 Daily 페이지의 synced_block 원본 ID.
+    기록된 결과가 템플릿의 label을 모두 가지면 API를 호출하지 않고,
+    없으면 페이지를 읽어 원본마다 label을 확인해 찾은 뒤 기록한다.
+    refresh=True면 기록을 무시하고 페이지를 다시 읽는다 (점검용).
+    """
+    plan = load_page_plan(page_id) or (
+        load_template_plan(template_page_id) if template_page_id else None
+    )
+    layout = [node["label"] for node in plan["nodes"] if node["label"]] if plan else None
+
+    stored = None if refresh else load_page_synced(page_id)
+    if stored and all(label in stored for label in layout or stored):
+        return stored
+
+    from add_journal_entry import find_synced_ids_from_page
+    synced_ids = find_synced_ids_from_page(notion, page_id, layout)
+    if synced_ids:
+        record_page_synced(page_id, synced_ids)
+    return synced_ids
+
+
+# ── 템플릿 복사 (synced_block 감싸기 포함) ──
+
+
+def copy_template_with_synced(
+    notion: Client, template_page_id: str, target_page_id: str
+) -> dict:
+    """
+    템플릿 블록을 복사하되, '기록-개인/업무' heading_3는 synced_block으로 감싼다.
+    rich_text(색상 등)를 그대로 유지한다.
 
-        block = created[idx]
+    Returns:
+        {"기록 - 개인": synced_block_id, "기록 - 업무": synced_block_id}
+    """
+    plan = compile_template(notion, template_page_id)
+    nodes = plan["nodes"]
+
+    log.info(f"  블록 {len(nodes)}개 생성 중...")
+    created = write_plan_nodes(notion, target_page_id, nodes)
+    record_page_plan(target_page_id, plan["hash"])
+
+    synced_ids = {
+        node["label"]: block["id"]
+        for node, block in zip(nodes, created)
+        if node["label"]
+    }
+    record_page_synced(target_page_id, synced_ids)
+    return synced_ids
+
+
+def write_plan_nodes(
+    notion: Client, parent_id: str, nodes: list, after_block_id: str | None = None
+) -> list:
+    """
+    계획 노드들을 parent_id 아래에 생성하고 자식까지 재귀로 채운다.
+    after_block_id를 주면 그 블록 바로 뒤에, "start"면 맨 앞에 넣는다.
+
+    Returns:
+        생성된 최상위 블록 목록 (nodes와 같은 순서)
+    """
+    created = []
+    for i in range(0, len(nodes), 100):
+        batch = [node["block"] for node in nodes[i : i + 100]]
+        kwargs = {"block_id": parent_id, "children": batch}
+        if after_block_id == "start":
+            kwargs["position"] = {"type": "start"}
+        elif after_block_id:
+            kwargs["position"] = {"type": "after_block", "after_block": {"id": after_block_id}}
+        resp = notion.blocks.children.append(**kwargs)
+        results = resp.get("results", [])
+        created.extend(results)
+        if after_block_id and results:
+            after_block_id = results[-1]["id"]
+        if i + 100 < len(nodes):
+            time.sleep(0.35)
 
-        if label:
+    for node, block in zip(nodes, created):
+        if node["label"]:
             # synced_block → 내부 heading_3 찾아서 children 추가
-            synced_ids[label] = block["id"]
-            if children:
+            heading = node["children"][0]
+            if heading["children"]:
                 time.sleep(0.35)
                 inner = notion.blocks.children.list(block_id=block["id"])
                 heading_id = inner["results"][0]["id"] if inner["results"] else None
                 if heading_id:
-                    child_blocks = []
-                    for c in children:
-                        cleaned = clean_block(c)
-                        if cleaned:
-                            child_blocks.append(cleaned)
-                    if child_blocks:
-                        notion.blocks.children.append(
-                            block_id=heading_id, children=child_blocks
-                        )
-        elif children:
-            # 일반 블록의 자식 재귀 처리
+                    write_plan_nodes(notion, heading_id, heading["children"])
+        elif node["children"]:
             time.sleep(0.35)
-            _write_children_recursive(notion, block["id"], children)
+            write_plan_nodes(notion, block["id"], node["children"])
 
-    return synced_ids
-
-
-def _write_children_recursive(notion: Client, parent_id: str, blocks: list):
-    """자식 블록을 재귀적으로 추가한다."""
-    to_create = []
-    children_map = []
-    for block in blocks:
-        cleaned = clean_block(block)
-        if cleaned:
-            to_create.append(cleaned)
-            children_map.append(block.get("_children", []))
+    return created
 
-    if not to_create:
-        return
 
-    resp = notion.blocks.children.append(block_id=parent_id, children=to_create)
-    created = resp.get("results", [])
+def plan_write_cost(nodes: list) -> dict:
+    """
+    write_plan_nodes(nodes)가 보낼 요청 수를 미리 센다 (--plan 비용 추정용).
 
-    for idx, children in enumerate(children_map):
-        if children and idx < len(created):
-            time.sleep(0.35)
-            _write_children_recursive(notion, created[idx]["id"], children)
+    Returns:
+        {"writes": append 호출 수, "reads": 목록 조회 수, "sleeps": 0.35초 대기 수, "blocks": 생성 블록 수}
+    """
+    batches = -(-len(nodes) // 100)
+    cost = {"writes": batches, "reads": 0, "sleeps": max(0, batches - 1), "blocks": len(nodes)}
+    for node in nodes:
+        if node["label"]:
+            heading = node["children"][0]
+            cost["blocks"] += 1  # synced_block 안 heading_3는 같은 요청에서 생성
+            if not heading["children"]:
+                continue
+            cost["reads"] += 1
+            sub = plan_write_cost(heading["children"])
+        elif node["children"]:
+            sub = plan_write_cost(node["children"])
+        else:
+            continue
+        cost["sleeps"] += 1
+        for key in cost:
+            cost[key] += sub[key]
+    return cost
 
 
 # ── 페이지 생성 ──
 
 
-def find_daily_page(notion: Client, title: str) -> dict | None:
+def find_daily_page(
+    notion: Client, title: str, data_source_id: str | None = None
+) -> dict | None:
     """제목으로 Daily 페이지를 검색한다. 날짜 부분(YYYY-MM-DD)만으로 매칭."""
     date_part = title.split(" ")[0]  # "2026-02-25 (화)" → "2026-02-25"
     resp = notion.data_sources.query(
-        data_source_id=DAILY_DS_ID,
+        data_source_id=data_source_id or DAILY_DS_ID,
         filter={
             "property": "일간",
             "title": {"contains": date_part},
@@ -211,9 +465,12 @@ def create_daily_page(
     date: str,
     year: str = "2026년",
     template_page_id: str | None = None,
+    data_source_id: str | None = None,
+    database_id: str | None = None,
 ) -> tuple[dict, dict, bool]:
     """
     일간 Daily DB에 새 페이지를 생성한다. 이미 존재하면 기존 페이지를 반환.
+    data_source_id/database_id를 생략하면 .env의 DAILY_DS_ID/DAILY_DB_ID를 사용한다.
 
     Returns:
         (page_dict, synced_ids, is_new)
@@ -221,13 +478,19 @@ def create_daily_page(
         is_new: True면 신규 생성, False면 기존 페이지
     """
     # 중복 체크
-    existing = find_daily_page(notion, title)
+    existing = find_daily_page(notion, title, data_source_id)
     if existing:
         log.info(f"이미 존재하는 페이지: {existing['id']}")
-        from add_journal_entry import find_synced_ids_from_page
-        synced_ids = find_synced_ids_from_page(notion, existing["id"])
+        synced_ids = daily_synced_ids(notion, existing["id"], template_page_id)
         return existing, synced_ids, False
 
+    new_page = _new_daily_page(notion, title, date, year, database_id)
+    return new_page, _apply_template(notion, new_page["id"], template_page_id), True
+
+
+def _new_daily_page(
+    notion: Client, title: str, date: str, year: str, database_id: str | None
+) -> dict:
     properties = {
         "일간": {"title": [{"text": {"content": title}}]},
         "년도": {"select": {"name": year}},
@@ -235,19 +498,143 @@ def create_daily_page(
     }
 
     new_page = notion.pages.create(
-        parent={"database_id": DAILY_DB_ID},
+        parent={"database_id": database_id or DAILY_DB_ID},
         properties=properties,
     )
     log.info(f"페이지 생성 완료: {new_page['id']}")
     log.info(f"URL: {new_page.get('url', '')}")
+    return new_page
+
+
+def _apply_template(notion: Client, page_id: str, template_page_id: str | None) -> dict:
+    """새 페이지에 템플릿을 적용한다. 중간에 실패하면 pending 기록이 남는다."""
+    if not template_page_id:
+        return {}
+    log.info("템플릿 적용 중 (synced_block 포함)...")
+    mark_template_pending(page_id, template_page_id)
+    synced_ids = copy_template_with_synced(notion, template_page_id, page_id)
+    mark_template_pending(page_id, None)
+    log.info(f"  synced_block: {synced_ids}")
+    return synced_ids
 
-    synced_ids = {}
-    if template_page_id:
-        log.info("템플릿 적용 중 (synced_block 포함)...")
-        synced_ids = copy_template_with_synced(notion, template_page_id, new_page["id"])
-        log.info(f"  synced_block: {synced_ids}")
 
-    return new_page, synced_ids, True
+def daily_synced_ids(notion: Client, page_id: str, template_page_id: str | None) -> dict:
+    """
+    기존 Daily 페이지의 synced_block 원본 ID.
+    템플릿 적용이 중간에 실패한 페이지면 빠진 템플릿 블록(synced_block 내부 포함)만 마저 추가한 뒤
+    다시 찾는다 (template_sync.sync_page — 이미 있는 블록은 건드리지 않는다).
+    페이지가 템플릿과 맞는 것을 확인해야 pending 기록을 지우므로, 이번에 다 채우지 못하면 다음에 다시 채운다.
+    """
+    if not (template_page_id and is_template_pending(page_id)):
+        return find_synced_ids(notion, page_id, template_page_id)
+
+    from response_cache import bypass
+    from template_sync import sync_page
+    log.warning(f"  템플릿 적용이 끝나지 않은 페이지: {page_id} — 빠진 블록을 추가합니다")
+    with bypass():
+        result = sync_page(notion, page_id, compile_template(notion, template_page_id))
+    log.info(f"  블록 추가 {result['appended']}개")
+    if not result["complete"]:
+        log.warning(f"  아직 빠진 템플릿 블록이 있습니다: {page_id} (다음 실행에서 다시 채움)")
+    return find_synced_ids(notion, page_id, template_page_id, refresh=True)
+
+
+# ── 범위 일괄 생성 ──
+
+
+def find_daily_pages(
+    notion: Client, start: str, end: str, data_source_id: str | None = None
+) -> dict:
+    """
+    start~end(YYYY-MM-DD) Daily 페이지를 범위 조회로 찾는다.
+    '날짜' 속성이 빠진 페이지도 찾도록 제목의 YYYY-MM도 함께 조건에 넣는다 (find_daily_page와 같은 기준).
+    compound filter는 조건 100개까지라 달이 많으면 조회를 나눈다.
+
+    Returns:
+        {"2026-03-01": page_dict} (같은 날짜가 여럿이면 먼저 조회된 페이지)
+    """
+    months = sorted({
+        f"{y:04d}-{m:02d}"
+        for y in range(int(start[:4]), int(end[:4]) + 1)
+        for m in range(1, 13)
+        if start[:7] <= f"{y:04d}-{m:02d}" <= end[:7]
+    })
+    date_filter = {"and": [
+        {"property": "날짜", "date": {"on_or_after": start}},
+        {"property": "날짜", "date": {"on_or_before": end}},
+    ]}
+    title_filters = [{"property": "일간", "title": {"contains": m}} for m in months]
+    # 첫 조회는 날짜 조건 + 제목 99개, 이후는 제목 100개씩
+    chunks = [[date_filter] + title_filters[:99]] + [
+        title_filters[i:i + 100] for i in range(99, len(title_filters), 100)
+    ]
+    found = {}
+    for chunk in chunks:
+        for page in query_all(notion, data_source_id or DAILY_DS_ID, {"or": chunk}):
+            d = page_date(page)
+            key = d.isoformat() if d else None
+            if key and start <= key <= end:
+                found.setdefault(key, page)
+    return found
+
+
+def create_daily_pages(
+    notion: Client,
+    days: list,
+    template_page_id: str | None = None,
+    data_source_id: str | None = None,
+    database_id: str | None = None,
+) -> dict:
+    """
+    범위의 Daily 페이지를 한꺼번에 준비한다.
+    범위 조회로 기존 페이지를 찾고, 없는 날짜는 DAILY_CONCURRENCY개씩 동시에 생성해
+    미리 컴파일한 템플릿 계획 하나를 적용한다. 전체 속도는 토큰별 속도 제한이 정한다.
+
+    Args:
+        days: calendar_plan.DayPlan 목록 (날짜순)
+
+    Returns:
+        {"2026-03-01": (page_dict | None, synced_ids, is_new, error | None)}
+        실패한 날짜도 error와 함께 남는다. 페이지를 만든 뒤 템플릿 적용에 실패했으면
+        page_dict가 있으므로, 날짜별 단계에서 daily_synced_ids로 마저 채운다.
+    """
+    if not days:
+        return {}
+    existing = find_daily_pages(notion, days[0].date_str, days[-1].date_str, data_source_id)
+    if template_page_id:
+        compile_template(notion, template_page_id)  # 모든 스레드가 같은 계획을 쓴다
+
+    def _prepare(day):
+        page = existing.get(day.date_str)
+        if page:
+            try:
+                return page, daily_synced_ids(notion, page["id"], template_page_id), False, None
+            except Exception as e:
+                return page, {}, False, e
+        try:
+            page = _new_daily_page(notion, day.title, day.date_str, day.year, database_id)
+        except Exception as e:
+            return None, {}, False, e
+        try:
+            return page, _apply_template(notion, page["id"], template_page_id), True, None
+        except Exception as e:
+            return page, {}, True, e
+
+    missing = sum(1 for day in days if day.date_str not in existing)
+    log.info(f"Daily 일괄 준비: {len(days)}일 중 기존 {len(days) - missing}, 생성 {missing}")
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(DAILY_CONCURRENCY, len(days))), thread_name_prefix="daily"
+    ) as pool:
+        futures = {
+            day.date_str: pool.submit(contextvars.copy_context().run, _prepare, day)
+            for day in days
+        }
+        prepared = {date_str: future.result() for date_str, future in futures.items()}
+    for date_str, (_, _, _, error) in prepared.items():
+        if error:
+            log.error(f"  {date_str} Daily 준비 실패: {error}")
+    return prepared
 
 
 if __name__ == "__main__":
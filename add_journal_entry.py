@@ -5,7 +5,7 @@ add_daily.py의 create_daily_page()가 반환하는 synced_ids를 사용한다.
 import time
 import logging
 from notion_client import Client
-from notion_config import get_client, JOURNAL_PAGE_ID
+from notion_config import get_client, JOURNAL_PAGE_ID, SYNCED_LABELS
 
 log = logging.getLogger("notion_daily")
 
@@ -31,28 +31,71 @@ def get_text(block: dict) -> str:
     return "".join(t.get("plain_text", "") for t in rich_text)
 
 
-def find_synced_ids_from_page(notion: Client, daily_page_id: str) -> dict:
-    """이미 생성된 Daily 페이지에서 synced_block 원본 ID를 찾는다."""
+def find_synced_ids_from_page(
+    notion: Client, daily_page_id: str, layout: list | None = None
+) -> dict:
+    """
+    이미 생성된 Daily 페이지에서 synced_block 원본 ID를 찾는다.
+    위치만으로 정하지 않고 원본마다 첫 블록(heading)의 label을 확인한다
+    (사용자가 순서를 바꾸거나 블록을 바꿔도 다른 label에 연결되지 않도록).
+
+    Args:
+        layout: 템플릿 계획의 synced_block label 순서 (["기록 - 개인", "기록 - 업무"])
+
+    페이지 목록 1회 + 원본마다 1회 읽되, label을 모두 찾으면 멈춘다.
+    """
     blocks = get_blocks(notion, daily_page_id)
+    originals = [
+        b for b in blocks
+        if b.get("type") == "synced_block" and b.get("synced_block", {}).get("synced_from") is None
+    ]
+    labels = layout or SYNCED_LABELS
     synced_ids = {}
-    for b in blocks:
-        if b.get("type") == "synced_block" and b.get("synced_block", {}).get("synced_from") is None:
-            children = get_blocks(notion, b["id"])
-            for c in children:
-                text = get_text(c)
-                if "기록 - 개인" in text:
-                    synced_ids["기록 - 개인"] = b["id"]
-                elif "기록 - 업무" in text:
-                    synced_ids["기록 - 업무"] = b["id"]
+    for b in originals:
+        for c in get_blocks(notion, b["id"])[:1]:
+            text = get_text(c)
+            for label in labels:
+                if label in text and label not in synced_ids:
+                    synced_ids[label] = b["id"]
+                    break
+        if len(synced_ids) == len(labels):
+            break
     return synced_ids
 
 
+def ensure_journal_year(
+    notion: Client, year: str, journal_page_id: str | None = None
+) -> dict:
+    """Journal Overall 페이지에서 년도(heading_1) 토글을 찾고, 없으면 생성한다."""
+    journal_page_id = journal_page_id or JOURNAL_PAGE_ID
+
+    top_blocks = get_blocks(notion, journal_page_id)
+    for b in top_blocks:
+        if b.get("type") == "heading_1" and get_text(b) == year:
+            return b
+
+    log.info(f"  년도 토글 '{year}' 생성 중...")
+    resp = notion.blocks.children.append(
+        block_id=journal_page_id,
+        children=[{
+            "type": "heading_1",
+            "heading_1": {
+                "rich_text": [{"type": "text", "text": {"content": year}}],
+                "is_toggleable": True,
+            },
+        }],
+    )
+    time.sleep(0.35)
+    return resp["results"][0]
+
+
 def add_to_journal(
     notion: Client,
     year: str,
     month: str,
     date_title: str,
     synced_block_ids: dict,
+    journal_page_id: str | None = None,
 ) -> bool:
     """
     Journal Overall 페이지에 날짜 토글 + synced_block 참조를 추가한다.
@@ -62,33 +105,13 @@ def add_to_journal(
         month: "2026년 3월"
         date_title: "2026년 3월 1일 (일)"
         synced_block_ids: {"기록 - 개인": id, "기록 - 업무": id}
+        journal_page_id: 생략하면 .env의 JOURNAL_PAGE_ID
 
     Returns:
         True면 신규 추가, False면 이미 존재하여 스킵
     """
-    # 1) 년도 토글 찾기
-    top_blocks = get_blocks(notion, JOURNAL_PAGE_ID)
-    year_block = None
-    for b in top_blocks:
-        if b.get("type") == "heading_1" and get_text(b) == year:
-            year_block = b
-            break
-
-    if not year_block:
-        log.info(f"  년도 토글 '{year}' 생성 중...")
-        resp = notion.blocks.children.append(
-            block_id=JOURNAL_PAGE_ID,
-            children=[{
-                "type": "heading_1",
-                "heading_1": {
-                    "rich_text": [{"type": "text", "text": {"content": year}}],
-                    "is_toggleable": True,
-                },
-            }],
-        )
-        year_block = resp["results"][0]
-        time.sleep(0.35)
-
+    # 1) 년도 토글 찾기/생성
+    year_block = ensure_journal_year(notion, year, journal_page_id)
     year_id = year_block["id"]
 
     # 2) 월 토글 찾기
@@ -142,7 +165,7 @@ def add_to_journal(
     time.sleep(0.35)
 
     synced_refs = []
-    for label in ["기록 - 개인", "기록 - 업무"]:
+    for label in SYNCED_LABELS:
         if label in synced_block_ids:
             synced_refs.append({
                 "type": "synced_block",
@@ -19,10 +19,12 @@ def get_month_info(d: date) -> dict:
     }
 
 
-def find_monthly_page(notion: Client, title: str) -> dict | None:
+def find_monthly_page(
+    notion: Client, title: str, data_source_id: str | None = None
+) -> dict | None:
     """제목으로 월간 페이지를 검색한다."""
     resp = notion.data_sources.query(
-        data_source_id=MONTHLY_DS_ID,
+        data_source_id=data_source_id or MONTHLY_DS_ID,
         filter={
             "property": "월간",
             "title": {"equals": title},
@@ -37,6 +39,7 @@ def create_monthly_page(
     title: str,
     year: str,
     weekly_page_id: str,
+    database_id: str | None = None,
 ) -> dict:
     """월간 Monthly 페이지를 새로 생성한다."""
     properties = {
@@ -45,7 +48,7 @@ def create_monthly_page(
         "주간": {"relation": [{"id": weekly_page_id}]},
     }
     return notion.pages.create(
-        parent={"database_id": MONTHLY_DB_ID},
+        parent={"database_id": database_id or MONTHLY_DB_ID},
         properties=properties,
     )
 
@@ -73,23 +76,32 @@ def add_weekly_to_monthly(
     )
 
 
-def ensure_monthly(notion: Client, daily_date: str, weekly_page_id: str) -> tuple[dict, bool]:
+def ensure_monthly(
+    notion: Client,
+    daily_date: str,
+    weekly_page_id: str,
+    data_source_id: str | None = None,
+    database_id: str | None = None,
+    month: dict | None = None,
+) -> tuple[dict, bool]:
     """
     Daily 날짜에 해당하는 월간 페이지를 찾거나 생성하고, 주간 relation을 연결한다.
 
     Args:
         daily_date: "2026-03-01"
         weekly_page_id: Weekly 페이지 ID
+        data_source_id/database_id: 생략하면 .env의 MONTHLY_DS_ID/MONTHLY_DB_ID
+        month: 미리 계산한 get_month_info() 결과 (calendar_plan). 생략하면 계산
 
     Returns:
         (월간 페이지 dict, is_new)
     """
     d = date.fromisoformat(daily_date)
-    month = get_month_info(d)
+    month = month or get_month_info(d)
 
     log.info(f"  날짜: {daily_date} → {month['title']}")
 
-    existing = find_monthly_page(notion, month["title"])
+    existing = find_monthly_page(notion, month["title"], data_source_id)
 
     if existing:
         log.info(f"  기존 월간 페이지 발견: {existing['id']}")
@@ -99,7 +111,7 @@ def ensure_monthly(notion: Client, daily_date: str, weekly_page_id: str) -> tupl
     else:
         log.info(f"  월간 페이지 생성 중: {month['title']}")
         new_page = create_monthly_page(
-            notion, month["title"], month["year"], weekly_page_id
+            notion, month["title"], month["year"], weekly_page_id, database_id
         )
         log.info(f"  생성 완료: {new_page['id']}")
         log.info(f"  URL: {new_page.get('url', '')}")
@@ -67,10 +67,12 @@ def get_week_info(d: date) -> dict:
 # ── 주간 페이지 검색/생성 ──
 
 
-def find_weekly_page(notion: Client, title: str) -> dict | None:
+def find_weekly_page(
+    notion: Client, title: str, data_source_id: str | None = None
+) -> dict | None:
     """제목으로 주간 페이지를 검색한다."""
     resp = notion.data_sources.query(
-        data_source_id=WEEKLY_DS_ID,
+        data_source_id=data_source_id or WEEKLY_DS_ID,
         filter={
             "property": "주간",
             "title": {"equals": title},
@@ -85,6 +87,7 @@ def create_weekly_page(
     title: str,
     year: str,
     daily_page_id: str,
+    database_id: str | None = None,
 ) -> dict:
     """주간 Weekly 페이지를 새로 생성한다."""
     properties = {
@@ -94,7 +97,7 @@ def create_weekly_page(
     }
 
     new_page = notion.pages.create(
-        parent={"database_id": WEEKLY_DB_ID},
+        parent={"database_id": database_id or WEEKLY_DB_ID},
         properties=properties,
     )
     return new_page
@@ -129,19 +132,28 @@ def add_daily_to_weekly(
 # ── 메인 함수 ──
 
 
-def ensure_weekly(notion: Client, daily_date: str, daily_page_id: str) -> tuple[dict, bool]:
+def ensure_weekly(
+    notion: Client,
+    daily_date: str,
+    daily_page_id: str,
+    data_source_id: str | None = None,
+    database_id: str | None = None,
+    week: dict | None = None,
+) -> tuple[dict, bool]:
     """
     Daily 날짜에 해당하는 주간 페이지를 찾거나 생성하고, 일간 relation을 연결한다.
 
     Args:
         daily_date: "2026-03-01"
         daily_page_id: Daily 페이지 ID
+        data_source_id/database_id: 생략하면 .env의 WEEKLY_DS_ID/WEEKLY_DB_ID
+        week: 미리 계산한 get_week_info() 결과 (calendar_plan). 생략하면 계산
 
     Returns:
         (주간 페이지 dict, is_new)
     """
     d = date.fromisoformat(daily_date)
-    week = get_week_info(d)
+    week = week or get_week_info(d)
 
     log.info(f"  날짜: {daily_date} → {week['title']}")
 
@@ -150,7 +162,7 @@ def ensure_weekly(notion: Client, daily_date: str, daily_page_id: str) -> tuple[
         log.info(f"  연도 경계: 입력 {d.year}년, 주간 {week['year_full']}")
 
     # 검색
-    existing = find_weekly_page(notion, week["title"])
+    existing = find_weekly_page(notion, week["title"], data_source_id)
 
     if existing:
         log.info(f"  기존 주간 페이지 발견: {existing['id']}")
@@ -160,7 +172,7 @@ def ensure_weekly(notion: Client, daily_date: str, daily_page_id: str) -> tuple[
     else:
         log.info(f"  주간 페이지 생성 중: {week['title']}")
         new_page = create_weekly_page(
-            notion, week["title"], week["year_full"], daily_page_id
+            notion, week["title"], week["year_full"], daily_page_id, database_id
         )
         log.info(f"  생성 완료: {new_page['id']}")
         log.info(f"  URL: {new_page.get('url', '')}")
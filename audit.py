@@ -0,0 +1,409 @@
+"""
+Daily/Weekly/Monthly/Journal 그래프 일괄 점검 및 복구.
+- 각 데이터 소스와 Journal 트리를 페이지네이션 조회로 한 번에 읽어 메모리에서 조인한다
+- 빠진 relation, synced_block 없는 Daily, 잘못된 synced_block을 가리키는 Journal 날짜를 찾는다
+- --fix 시 페이지별로 묶어서 한 번씩만 갱신한다
+- last_edited_time 워터마크와 Journal 날짜 토글의 참조 기록을 저장해 두고,
+  다음 점검은 워터마크 이후 바뀐 Daily/Journal 월만 다시 읽는다 (relation은 매번 전체 조인)
+"""
+import re
+import json
+import time
+import logging
+from datetime import date, datetime, timezone
+from notion_client import Client
+from notion_config import (
+    Profile, STATE_DIR, SYNCED_LABELS, query_all, page_date, page_title, relation_ids,
+    edited_since, make_watermark,
+)
+from response_cache import bypass
+from calendar_plan import plan_day
+from add_journal_entry import get_blocks, get_text, add_to_journal
+from add_daily import find_synced_ids
+
+log = logging.getLogger("notion_daily")
+
+AUDIT_STATE_PATH = STATE_DIR / "audit.json"
+
+_JOURNAL_DATE = re.compile(r"(\d+)년 (\d+)월 (\d+)일")
+
+
+def _issue(kind: str, d: date, detail: str, **data) -> dict:
+    return {"kind": kind, "date": d.isoformat(), "detail": detail, **data}
+
+
+# ── 점검 ──
+
+
+def read_journal_dates(
+    notion: Client,
+    journal_page_id: str,
+    months: set,
+    known: set = frozenset(),
+    changed_since: str | None = None,
+) -> dict:
+    """
+    Journal Overall에서 months({"2026년 3월", ...})에 속한 날짜 토글을 읽는다.
+    known에 있는 월은 월 토글이 changed_since 이후 수정되지 않았으면 날짜 목록을 읽지 않는다
+    (호출한 쪽이 기록을 갖고 있는 월).
+
+    Returns:
+        {
+            "years": {"2026년": year_block_id},
+            "months": {"2026년 3월": month_block_id},
+            "dates": {date: heading_3 블록},
+            "skipped": 날짜 목록을 읽지 않은 월,
+        }
+    """
+    years = {m.split(" ")[0] for m in months}
+    found = {"years": {}, "months": {}, "dates": {}, "skipped": set()}
+    for yb in get_blocks(notion, journal_page_id):
+        if yb.get("type") != "heading_1" or get_text(yb) not in years:
+            continue
+        found["years"][get_text(yb)] = yb["id"]
+        for mb in get_blocks(notion, yb["id"]):
+            label = get_text(mb)
+            if mb.get("type") != "heading_2" or label not in months:
+                continue
+            found["months"][label] = mb["id"]
+            if label in known and not edited_since(mb.get("last_edited_time", ""), changed_since):
+                found["skipped"].add(label)
+                continue
+            for db in get_blocks(notion, mb["id"]):
+                m = _JOURNAL_DATE.search(get_text(db)) if db.get("type") == "heading_3" else None
+                if m:
+                    found["dates"][date(*map(int, m.groups()))] = db
+    return found
+
+
+def audit(
+    notion: Client, profile: Profile, since: str | None = None, journal_refs: dict | None = None
+) -> dict:
+    """
+    그래프를 점검한다. 데이터 소스는 매번 전체를 페이지네이션 조회로 읽어 relation을 조인한다.
+    since(ISO 시각)를 주면 그 이전에 마지막으로 수정된 Daily는 기록된 synced_block ID를,
+    그 이전에 수정된 Journal 날짜 토글은 journal_refs에 기록된 참조를 그대로 쓴다.
+
+    Args:
+        journal_refs: 이전 점검의 {"2026-03-01": {"toggle", "edited", "refs", "ref_ids"}}
+
+    Returns:
+        {"checked": Daily 수, "issues": [{"kind", "date", "detail", ...}],
+         "journal": read_journal_dates() 결과, "weekly_ids": {주간 제목: id},
+         "journal_refs": 이번 점검 기준으로 갱신한 참조 기록, "reads": 다시 읽은 Daily/토글 수}
+    """
+    journal_refs = (journal_refs or {}) if since else {}
+    dailies = query_all(notion, profile.daily_ds_id)
+    weeklies = {page_title(p, "주간"): p for p in query_all(notion, profile.weekly_ds_id)}
+    monthlies = {page_title(p, "월간"): p for p in query_all(notion, profile.monthly_ds_id)}
+    log.info(f"  조회: Daily {len(dailies)}개, Weekly {len(weeklies)}개, Monthly {len(monthlies)}개")
+
+    by_date = {}
+    for page in dailies:
+        d = page_date(page)
+        if d:
+            by_date.setdefault(d, []).append(page)
+
+    def _changed(page):
+        return edited_since(page.get("last_edited_time", ""), since)
+
+    plans = {d: plan_day(d) for d in by_date}
+    # 바뀐 Daily가 없고 모든 날짜의 참조 기록이 있는 월은 월 토글이 바뀌었을 때만 다시 읽는다
+    known = {p.journal["month"] for p in plans.values()}
+    for d, pages in by_date.items():
+        if d.isoformat() not in journal_refs or any(_changed(p) for p in pages):
+            known.discard(plans[d].journal["month"])
+    journal = read_journal_dates(
+        notion, profile.journal_page_id, {p.journal["month"] for p in plans.values()},
+        known=known, changed_since=since,
+    )
+
+    refs_out = {}
+    reads = {"daily": 0, "toggle": 0}
+    issues = []
+    for d in sorted(by_date):
+        pages = by_date[d]
+        day = plans[d]
+        page = pages[0]
+        if len(pages) > 1:
+            ids = ", ".join(p["id"] for p in pages)
+            issues.append(_issue("daily_duplicate", d, f"같은 날짜의 Daily {len(pages)}개: {ids}"))
+
+        # Weekly / Monthly relation
+        weekly = weeklies.get(day.week["title"])
+        if not weekly:
+            issues.append(_issue(
+                "weekly_missing", d, f"주간 페이지 없음: {day.week['title']}",
+                daily_id=page["id"], week=day.week,
+            ))
+        elif page["id"] not in relation_ids(weekly, "일간"):
+            issues.append(_issue(
+                "weekly_relation", d, f"주간 '{day.week['title']}'에 Daily 미연결",
+                daily_id=page["id"], weekly_id=weekly["id"],
+            ))
+        monthly = monthlies.get(day.month["title"])
+        if not monthly:
+            issues.append(_issue(
+                "monthly_missing", d, f"월간 페이지 없음: {day.month['title']}",
+                week_title=day.week["title"], month=day.month,
+            ))
+        elif not weekly or weekly["id"] not in relation_ids(monthly, "주간"):
+            issues.append(_issue(
+                "monthly_relation", d,
+                f"월간 '{day.month['title']}'에 주간 '{day.week['title']}' 미연결",
+                week_title=day.week["title"], monthly_id=monthly["id"],
+            ))
+
+        # synced_block: 워터마크 이후 바뀐 Daily만 페이지를 다시 읽어 기록도 갱신
+        refresh = _changed(page)
+        reads["daily"] += refresh
+        synced_ids = find_synced_ids(notion, page["id"], profile.template_page_id, refresh=refresh)
+        if len(synced_ids) < len(SYNCED_LABELS):
+            issues.append(_issue(
+                "synced_missing", d, f"synced_block 부족: {sorted(synced_ids)}",
+                daily_id=page["id"],
+            ))
+        if not synced_ids:
+            continue
+        expected = [synced_ids[label] for label in SYNCED_LABELS if label in synced_ids]
+        record = journal_refs.get(d.isoformat())
+        if day.journal["month"] in journal["skipped"]:
+            toggle = {"id": record["toggle"], "last_edited_time": record["edited"]}
+        else:
+            toggle = journal["dates"].get(d)
+        if not toggle:
+            issues.append(_issue(
+                "journal_missing", d, f"Journal 날짜 토글 없음: {day.journal['date_title']}",
+                synced_ids=synced_ids, journal=day.journal,
+            ))
+            continue
+        edited = toggle.get("last_edited_time", "")
+        if (
+            record and record["toggle"] == toggle["id"]
+            and record["edited"] == edited and not edited_since(edited, since)
+        ):
+            actual, ref_ids = record["refs"], record["ref_ids"]
+        else:
+            reads["toggle"] += 1
+            refs = [
+                b for b in get_blocks(notion, toggle["id"])
+                if b.get("type") == "synced_block" and b["synced_block"].get("synced_from")
+            ]
+            actual = [b["synced_block"]["synced_from"].get("block_id") for b in refs]
+            ref_ids = [b["id"] for b in refs]
+        refs_out[d.isoformat()] = {
+            "toggle": toggle["id"], "edited": edited, "refs": actual, "ref_ids": ref_ids,
+        }
+        if actual != expected:
+            issues.append(_issue(
+                "journal_ref", d, f"Journal 동기화 블록 불일치 ({len(actual)}개 → {len(expected)}개)",
+                toggle_id=toggle["id"], ref_ids=ref_ids, expected=expected,
+            ))
+
+    return {
+        "checked": len(by_date),
+        "issues": issues,
+        "journal": journal,
+        "weekly_ids": {title: p["id"] for title, p in weeklies.items()},
+        "journal_refs": refs_out,
+        "reads": reads,
+    }
+
+
+# ── 복구 ──
+
+
+def repair(notion: Client, profile: Profile, report: dict) -> dict:
+    """
+    audit() 결과를 복구한다. 같은 페이지에 대한 변경은 한 번의 update로 묶는다.
+    synced_block이 없는 Daily와 중복 Daily는 자동 복구하지 않는다 (사용자 내용 보호).
+
+    Returns:
+        {"kind": 복구한 개수}
+    """
+    issues = report["issues"]
+    fixed = {}
+
+    def _count(kind, n=1):
+        fixed[kind] = fixed.get(kind, 0) + n
+
+    # 1) 주간: 페이지 생성 + relation 추가 (주간 페이지별로 한 번씩)
+    weekly_adds = {}      # weekly_id → [daily_id]
+    weekly_ids = dict(report["weekly_ids"])  # week title → weekly_id (새로 만든 페이지 포함)
+    new_weeks = {}        # week title → (week, [daily_id])
+    for i in issues:
+        if i["kind"] == "weekly_relation":
+            weekly_adds.setdefault(i["weekly_id"], []).append(i["daily_id"])
+        elif i["kind"] == "weekly_missing":
+            new_weeks.setdefault(i["week"]["title"], (i["week"], []))[1].append(i["daily_id"])
+
+    for title, (week, daily_ids) in new_weeks.items():
+        page = notion.pages.create(
+            parent={"database_id": profile.weekly_db_id},
+            properties={
+                "주간": {"title": [{"text": {"content": title}}]},
+                "년도": {"select": {"name": week["year_full"]}},
+                "일간": {"relation": [{"id": pid} for pid in daily_ids]},
+            },
+        )
+        weekly_ids[title] = page["id"]
+        _count("weekly_missing", len(daily_ids))
+    for weekly_id, daily_ids in weekly_adds.items():
+        _add_relations(notion, weekly_id, "일간", daily_ids)
+        _count("weekly_relation", len(daily_ids))
+
+    # 2) 월간: 주간 페이지 id가 확정된 뒤 처리
+    monthly_adds = {}     # monthly_id → {week title}
+    new_months = {}       # month title → (month, {week title})
+    for i in issues:
+        if i["kind"] == "monthly_relation":
+            monthly_adds.setdefault(i["monthly_id"], set()).add(i["week_title"])
+        elif i["kind"] == "monthly_missing":
+            new_months.setdefault(i["month"]["title"], (i["month"], set()))[1].add(i["week_title"])
+    for title, (month, week_titles) in new_months.items():
+        ids = [weekly_ids[t] for t in sorted(week_titles) if t in weekly_ids]
+        notion.pages.create(
+            parent={"database_id": profile.monthly_db_id},
+            properties={
+                "월간": {"title": [{"text": {"content": title}}]},
+                "년도": {"select": {"name": month["year"]}},
+                "주간": {"relation": [{"id": pid} for pid in ids]},
+            },
+        )
+        _count("monthly_missing")
+    for monthly_id, week_titles in monthly_adds.items():
+        ids = [weekly_ids[t] for t in sorted(week_titles) if t in weekly_ids]
+        _add_relations(notion, monthly_id, "주간", ids)
+        _count("monthly_relation", len(ids))
+
+    # 3) Journal 동기화 블록 교체 (토글마다 잘못된 참조 삭제 + 한 번에 추가)
+    for i in issues:
+        if i["kind"] != "journal_ref":
+            continue
+        for ref_id in i["ref_ids"]:
+            notion.blocks.delete(block_id=ref_id)
+        notion.blocks.children.append(
+            block_id=i["toggle_id"],
+            children=[_synced_ref(bid) for bid in i["expected"]],
+        )
+        # 다음 점검에서 토글을 다시 읽도록 기록을 버린다
+        report["journal_refs"].pop(i["date"], None)
+        _count("journal_ref")
+
+    # 4) Journal 날짜 토글 추가 (최신순 위치를 유지하도록 바로 다음 날짜 토글 뒤에 삽입)
+    missing = sorted((i for i in issues if i["kind"] == "journal_missing"), key=lambda i: i["date"])
+    existing = report["journal"]["dates"]
+    for i in missing:
+        d = date.fromisoformat(i["date"])
+        month_id = report["journal"]["months"].get(i["journal"]["month"])
+        if not month_id:
+            # 월 토글이 없으면 기존 경로로 생성 (년/월 토글 포함)
+            add_to_journal(
+                notion, i["journal"]["year"], i["journal"]["month"],
+                i["journal"]["date_title"], i["synced_ids"], profile.journal_page_id,
+            )
+            _count("journal_missing")
+            continue
+        _insert_journal_date(notion, month_id, d, i, existing)
+        _count("journal_missing")
+
+    return fixed
+
+
+def _add_relations(notion: Client, page_id: str, prop: str, new_ids: list):
+    """relation에 여러 페이지를 한 번의 update로 추가한다."""
+    page = notion.pages.retrieve(page_id=page_id)
+    ids = relation_ids(page, prop)
+    ids += [pid for pid in new_ids if pid not in ids]
+    notion.pages.update(
+        page_id=page_id,
+        properties={prop: {"relation": [{"id": pid} for pid in ids]}},
+    )
+
+
+def _synced_ref(block_id: str) -> dict:
+    return {"type": "synced_block", "synced_block": {"synced_from": {"block_id": block_id}}}
+
+
+def _insert_journal_date(notion: Client, month_id: str, d: date, issue: dict, existing: dict):
+    """날짜 토글을 같은 월의 바로 다음(더 최신) 날짜 토글 뒤에 넣는다. 없으면 맨 앞."""
+    newer = [x for x in existing if x > d and (x.year, x.month) == (d.year, d.month)]
+    if newer:
+        position = {"type": "after_block", "after_block": {"id": existing[min(newer)]["id"]}}
+    else:
+        position = {"type": "start"}
+    resp = notion.blocks.children.append(
+        block_id=month_id,
+        children=[{
+            "type": "heading_3",
+            "heading_3": {
+                "rich_text": [{"type": "text", "text": {"content": issue["journal"]["date_title"]}}],
+                "is_toggleable": True,
+            },
+        }],
+        position=position,
+    )
+    heading = resp["results"][0]
+    existing[d] = heading
+    time.sleep(0.35)
+    refs = [
+        _synced_ref(issue["synced_ids"][label])
+        for label in SYNCED_LABELS if label in issue["synced_ids"]
+    ]
+    notion.blocks.children.append(block_id=heading["id"], children=refs)
+
+
+# ── 워터마크 ──
+
+
+def _load_state() -> dict:
+    if not AUDIT_STATE_PATH.exists():
+        return {}
+    return json.loads(AUDIT_STATE_PATH.read_text(encoding="utf-8"))
+
+
+def load_watermark(profile_name: str) -> str | None:
+    return _load_state().get(profile_name, {}).get("watermark")
+
+
+def save_state(profile_name: str, started: datetime | None, journal_refs: dict):
+    """
+    점검 상태를 저장한다. started가 있으면 워터마크도 옮긴다.
+    journal_refs는 워터마크와 함께 쓰이므로 워터마크가 없으면 저장하지 않는다.
+    """
+    state = _load_state()
+    entry = state.get(profile_name, {})
+    if started is not None:
+        entry["watermark"] = make_watermark(started)
+    if entry.get("watermark"):
+        entry["journal"] = journal_refs
+    state[profile_name] = entry
+    AUDIT_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    AUDIT_STATE_PATH.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+
+
+def run_audit(notion: Client, profile: Profile, fix: bool = False, full: bool = False) -> dict:
+    """
+    점검(+복구)을 실행하고 결과를 로그로 남긴다.
+    문제가 없거나 모두 복구를 시도했으면 워터마크를 이번 실행 시작 시각으로 옮긴다.
+    """
+    started = datetime.now(timezone.utc)
+    state = _load_state().get(profile.name, {})
+    since = None if full else state.get("watermark")
+    log.info(f"[점검] {profile.name} ({'전체' if since is None else f'{since} 이후 변경분'})")
+
+    with bypass():
+        report = audit(notion, profile, since, state.get("journal"))
+    issues = report["issues"]
+    log.info(
+        f"  Daily {report['checked']}개 점검 (다시 읽은 Daily {report['reads']['daily']}, "
+        f"Journal 토글 {report['reads']['toggle']}), 문제 {len(issues)}개"
+    )
+    for i in issues:
+        log.warning(f"  {i['date']} | {i['kind']:16s} | {i['detail']}")
+
+    if fix and issues:
+        report["fixed"] = repair(notion, profile, report)
+        log.info(f"  복구: {report['fixed']}")
+    save_state(profile.name, started if not issues or fix else None, report["journal_refs"])
+    return report
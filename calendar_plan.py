@@ -0,0 +1,93 @@
+"""
+날짜 범위의 제목/주차/월 정보를 한 번에 계산하는 달력 플래너.
+범위 실행, 작업 큐, 일괄 생성이 날짜마다 다시 계산하지 않고 이 표를 사용한다.
+
+주/월 정보는 add_weekly.get_week_info, add_monthly.get_month_info를 주/월마다 한 번만 호출해 만든다.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+_DAY_NAMES_KO = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+@dataclass
+class DayPlan:
+    """날짜 하나의 계산 결과."""
+
+    date: date
+    date_str: str      # "2026-03-01"
+    title: str         # Daily 제목 "2026-03-01 (일)"
+    year: str          # "2026년"
+    journal: dict      # {"year", "month", "date_title"} (Journal 토글 제목)
+    week: dict         # get_week_info() 형식 (같은 주의 날짜끼리 공유)
+    month: dict        # get_month_info() 형식 (같은 월의 날짜끼리 공유)
+
+
+@dataclass
+class CalendarPlan:
+    """
+    범위 전체의 계산 결과.
+    weeks/months는 제목 → 해당 날짜 목록이며, 범위 순서를 유지한다.
+    연도 경계 주("25년 52주 12.28-1.3")는 두 해의 날짜를 함께 가진다.
+    """
+
+    days: list[DayPlan] = field(default_factory=list)
+    weeks: dict[str, list[DayPlan]] = field(default_factory=dict)
+    months: dict[str, list[DayPlan]] = field(default_factory=dict)
+
+    def __iter__(self):
+        return iter(self.days)
+
+    def __len__(self):
+        return len(self.days)
+
+
+def plan_range(start: date, end: date) -> CalendarPlan:
+    """
+    start~end(포함)의 모든 날짜를 한 번에 계산한다.
+    주 정보는 주가 바뀔 때만, 월 정보는 월이 바뀔 때만 계산한다.
+    """
+    # notion_client를 끌어오므로 기동 시간 단축을 위해 여기서 import한다
+    from add_weekly import get_week_info
+    from add_monthly import get_month_info
+
+    plan = CalendarPlan()
+    week = None
+    month = None
+    weekday = start.weekday()
+    d = start
+    while d <= end:
+        if week is None or d > week["end"]:
+            week = get_week_info(d)
+            plan.weeks[week["title"]] = []
+        if month is None or d.day == 1:
+            month = get_month_info(d)
+            plan.months[month["title"]] = []
+
+        day_name = _DAY_NAMES_KO[weekday]
+        year = f"{d.year}년"
+        day = DayPlan(
+            date=d,
+            date_str=d.isoformat(),
+            title=f"{d.isoformat()} ({day_name})",
+            year=year,
+            journal={
+                "year": year,
+                "month": f"{d.year}년 {d.month}월",
+                "date_title": f"{d.year}년 {d.month}월 {d.day}일 ({day_name})",
+            },
+            week=week,
+            month=month,
+        )
+        plan.days.append(day)
+        plan.weeks[week["title"]].append(day)
+        plan.months[month["title"]].append(day)
+
+        d += timedelta(days=1)
+        weekday = (weekday + 1) % 7
+    return plan
+
+
+def plan_day(d: date) -> DayPlan:
+    """날짜 하나의 계산 결과."""
+    return plan_range(d, d).days[0]
@@ -0,0 +1,244 @@
+"""
+Daily 페이지를 로컬 SQLite로 미러링한다 (run_daily.py export). 분석은 API 대신 이 파일을 읽는다.
+- pages: Daily 페이지 1행 (속성, 최상위 블록 해시 목록, 단어 수)
+- blocks: 내용 주소 방식 블록 표. 해시 = 타입/내용 + 자식 해시이므로 템플릿처럼 같은 블록은 한 번만 저장
+- 마지막 동기화 이후 last_edited_time이 바뀐 페이지만 블록 트리를 다시 읽는다 (여러 페이지 동시에)
+- 읽기는 open_export()로 연다 (읽기 전용 + mmap)
+"""
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import contextvars
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from notion_client import Client
+from notion_config import (
+    Profile, STATE_DIR, query_all, page_date, page_title, edited_since_filter, make_watermark,
+)
+from response_cache import bypass
+from add_daily import read_blocks, get_text
+
+log = logging.getLogger("notion_daily")
+
+EXPORT_PATH = Path(os.environ.get("NOTION_EXPORT_PATH", STATE_DIR / "export.sqlite"))
+# 블록 트리를 동시에 읽을 페이지 수 (속도 제한은 토큰별로 공유)
+EXPORT_CONCURRENCY = int(os.environ.get("NOTION_EXPORT_CONCURRENCY", "4"))
+# 읽기 연결의 mmap 크기 (MB, 0이면 끔)
+EXPORT_MMAP_MB = int(os.environ.get("NOTION_EXPORT_MMAP_MB", "256"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    profile TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    date TEXT,
+    title TEXT NOT NULL,
+    last_edited TEXT NOT NULL,
+    properties TEXT NOT NULL,
+    root TEXT NOT NULL,
+    words INTEGER NOT NULL,
+    PRIMARY KEY (profile, page_id)
+);
+CREATE INDEX IF NOT EXISTS pages_date ON pages (profile, date);
+CREATE TABLE IF NOT EXISTS blocks (
+    hash TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    text TEXT NOT NULL,
+    data TEXT NOT NULL,
+    children TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_blocks (
+    profile TEXT NOT NULL,
+    page_id TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (profile, page_id, hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS page_blocks_hash ON page_blocks (hash);
+CREATE TABLE IF NOT EXISTS sync_state (
+    profile TEXT PRIMARY KEY,
+    watermark TEXT NOT NULL
+);
+"""
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA mmap_size={EXPORT_MMAP_MB * 1024 * 1024}")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def open_export(path: str | Path | None = None) -> sqlite3.Connection:
+    """
+    분석용 읽기 전용 연결. 큰 기록도 mmap으로 읽어 페이지 캐시를 공유한다.
+
+    예: SELECT date, words FROM pages WHERE profile = 'default' ORDER BY date
+    """
+    path = Path(path or EXPORT_PATH)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.execute(f"PRAGMA mmap_size={EXPORT_MMAP_MB * 1024 * 1024}")
+    return conn
+
+
+# ── 블록 트리 → 내용 주소 행 ──
+
+
+def _flatten(blocks: list, rows: dict) -> list:
+    """read_blocks() 트리를 rows({hash: 행})에 넣고 최상위 해시 목록을 반환한다."""
+    hashes = []
+    for block in blocks:
+        children = _flatten(block.get("_children", []), rows)
+        btype = block.get("type", "")
+        data = {k: v for k, v in (block.get(btype) or {}).items() if k != "children"}
+        raw = json.dumps([btype, data, children], ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        rows[digest] = (
+            digest, btype, get_text(block),
+            json.dumps(data, ensure_ascii=False, sort_keys=True), json.dumps(children),
+        )
+        hashes.append(digest)
+    return hashes
+
+
+def _words(blocks: list) -> int:
+    """블록 트리 전체의 단어 수 (내용이 같은 블록도 나온 만큼 센다)."""
+    return sum(
+        len(get_text(block).split()) + _words(block.get("_children", [])) for block in blocks
+    )
+
+
+def _fetch(notion: Client, page: dict) -> tuple[dict, list, dict, int]:
+    rows = {}
+    blocks = read_blocks(notion, page["id"])
+    root = _flatten(blocks, rows)
+    return page, root, rows, _words(blocks)
+
+
+def _store(
+    conn: sqlite3.Connection, profile: str, page: dict, root: list, rows: dict, words: int
+):
+    d = page_date(page)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO blocks (hash, type, text, data, children) VALUES (?, ?, ?, ?, ?)",
+            rows.values(),
+        )
+        conn.execute(
+            "DELETE FROM page_blocks WHERE profile = ? AND page_id = ?", (profile, page["id"])
+        )
+        conn.executemany(
+            "INSERT INTO page_blocks (profile, page_id, hash) VALUES (?, ?, ?)",
+            [(profile, page["id"], h) for h in rows],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO pages "
+            "(profile, page_id, date, title, last_edited, properties, root, words) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                profile, page["id"], d.isoformat() if d else None, page_title(page, "일간"),
+                page.get("last_edited_time", ""),
+                json.dumps(page.get("properties", {}), ensure_ascii=False),
+                json.dumps(root), words,
+            ),
+        )
+
+
+def _remove(conn: sqlite3.Connection, profile: str, page_ids: list):
+    with conn:
+        for page_id in page_ids:
+            conn.execute("DELETE FROM pages WHERE profile = ? AND page_id = ?", (profile, page_id))
+            conn.execute(
+                "DELETE FROM page_blocks WHERE profile = ? AND page_id = ?", (profile, page_id)
+            )
+
+
+def _collect_garbage(conn: sqlite3.Connection) -> int:
+    """어느 페이지에서도 쓰지 않는 블록 행을 지운다."""
+    with conn:
+        cur = conn.execute(
+            "DELETE FROM blocks WHERE NOT EXISTS "
+            "(SELECT 1 FROM page_blocks pb WHERE pb.hash = blocks.hash)"
+        )
+    return cur.rowcount
+
+
+# ── 동기화 ──
+
+
+def export_daily(
+    notion: Client, profile: Profile, full: bool = False, path: str | Path | None = None
+) -> dict:
+    """
+    profile의 Daily 데이터 소스를 path(기본 EXPORT_PATH)에 미러링한다.
+    full이면 워터마크 없이 전체 목록을 읽고, 원본에서 사라진 페이지와 쓰지 않는 블록을 정리한다.
+
+    Returns:
+        {"listed", "fetched", "unchanged", "removed", "blocks", "failed"}
+    """
+    started = datetime.now(timezone.utc)
+    conn = _connect(Path(path or EXPORT_PATH))
+    try:
+        with bypass():
+            return _export(notion, conn, profile, full, started)
+    finally:
+        conn.close()
+
+
+def _export(notion, conn, profile, full, started) -> dict:
+    row = conn.execute(
+        "SELECT watermark FROM sync_state WHERE profile = ?", (profile.name,)
+    ).fetchone()
+    since = None if full or not row else row[0]
+    log.info(f"[내보내기] {profile.name} ({'전체' if since is None else f'{since} 이후 변경분'})")
+
+    pages = query_all(notion, profile.daily_ds_id, edited_since_filter(since))
+
+    stored = dict(conn.execute(
+        "SELECT page_id, last_edited FROM pages WHERE profile = ?", (profile.name,)
+    ))
+    changed = [p for p in pages if stored.get(p["id"]) != p.get("last_edited_time")]
+    summary = {
+        "listed": len(pages), "fetched": 0, "unchanged": len(pages) - len(changed),
+        "removed": 0, "blocks": 0, "failed": 0,
+    }
+
+    blocks_before = conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+    workers = max(1, min(EXPORT_CONCURRENCY, len(changed)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as pool:
+        futures = {
+            pool.submit(contextvars.copy_context().run, _fetch, notion, p): p for p in changed
+        }
+        for future in as_completed(futures):
+            try:
+                page, root, rows, words = future.result()
+            except Exception as e:
+                summary["failed"] += 1
+                log.error(f"  {page_title(futures[future], '일간')} | 실패: {e}")
+                continue
+            _store(conn, profile.name, page, root, rows, words)
+            summary["fetched"] += 1
+
+    if full:
+        gone = set(stored) - {p["id"] for p in pages}
+        _remove(conn, profile.name, sorted(gone))
+        summary["removed"] = len(gone)
+    if summary["fetched"] or summary["removed"]:
+        _collect_garbage(conn)
+    summary["blocks"] = conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0] - blocks_before
+
+    if not summary["failed"]:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (profile, watermark) VALUES (?, ?)",
+                (profile.name, make_watermark(started)),
+            )
+    log.info(
+        f"  Daily {summary['listed']}개 중 {summary['fetched']}개 갱신, "
+        f"변경 없음 {summary['unchanged']}, 삭제 {summary['removed']}, "
+        f"블록 증감 {summary['blocks']:+d}, 실패 {summary['failed']}"
+    )
+    return summary
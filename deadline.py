@@ -0,0 +1,108 @@
+"""
+실행 시간 예산(deadline) 관리.
+- 전체 실행 예산 + 단계별(Daily/Journal/Weekly/Monthly) 예산
+- Notion API 호출마다 남은 예산 안에서 timeout을 나눠 준다
+- 현재 예산은 contextvar로 전파되어 notion_http의 클라이언트가 참조한다
+- 단계별 소요 시간과 API 요청 수도 함께 기록한다 (실행 기록용)
+"""
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+_current: contextvars.ContextVar["RunBudget | None"] = contextvars.ContextVar(
+    "run_budget", default=None
+)
+
+
+class DeadlineExceeded(Exception):
+    """실행 또는 단계 예산을 모두 사용했을 때 발생."""
+
+    def __init__(self, scope: str, budget_sec: float):
+        self.scope = scope
+        self.budget_sec = budget_sec
+        super().__init__(f"시간 예산 초과 ({scope}, {budget_sec:.0f}초)")
+
+
+class RunBudget:
+    """
+    한 번의 실행에 대한 시간 예산.
+
+    Args:
+        total_sec: 전체 실행 예산 (초)
+        step_budgets: {"Daily": 300, ...} 단계별 예산 (초). 없는 단계는 전체 예산만 적용
+        call_timeout_sec: API 호출 1회의 최대 timeout (초)
+    """
+
+    def __init__(self, total_sec: float, step_budgets: dict, call_timeout_sec: float):
+        self.total_sec = total_sec
+        self.step_budgets = step_budgets
+        self.call_timeout_sec = call_timeout_sec
+        self.started = time.monotonic()
+        self.total_end = self.started + total_sec
+        self.step_name = None
+        self.step_end = None
+        # 예산을 초과한 범위 목록 (단계 이름 또는 "전체")
+        self.exceeded: list[str] = []
+        # 단계별 소요 시간(초)과 API 요청 수 (재시도·hedge 포함, 캐시 적중 제외)
+        self.durations: dict[str, float] = {}
+        self.api_calls: dict[str, int] = {}
+        self._calls_lock = threading.Lock()
+
+    def _binding(self) -> tuple[str, float, float]:
+        """현재 적용되는 (범위, 예산, 종료 시각)을 반환한다."""
+        if self.step_end is not None and self.step_end < self.total_end:
+            return self.step_name, self.step_budgets[self.step_name], self.step_end
+        return "전체", self.total_sec, self.total_end
+
+    def remaining(self) -> float:
+        return self._binding()[2] - time.monotonic()
+
+    def check(self):
+        """남은 예산이 없으면 DeadlineExceeded를 발생시킨다."""
+        scope, budget, end = self._binding()
+        if end - time.monotonic() <= 0:
+            if scope not in self.exceeded:
+                self.exceeded.append(scope)
+            raise DeadlineExceeded(scope, budget)
+
+    def call_timeout(self) -> float:
+        """다음 API 호출에 줄 timeout (초). 예산이 없으면 DeadlineExceeded."""
+        self.check()
+        return min(self.remaining(), self.call_timeout_sec)
+
+    def record_call(self):
+        """API 요청 1회를 현재 단계(단계 밖이면 "전체")에 기록한다."""
+        scope = self.step_name or "전체"
+        with self._calls_lock:
+            self.api_calls[scope] = self.api_calls.get(scope, 0) + 1
+
+    @contextmanager
+    def step(self, name: str):
+        """단계 예산을 적용한다. 단계 예산은 전체 예산을 넘지 않는다."""
+        prev = (self.step_name, self.step_end)
+        self.step_name = name
+        budget = self.step_budgets.get(name)
+        started = time.monotonic()
+        self.step_end = started + budget if budget else None
+        try:
+            self.check()
+            yield self
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.monotonic() - started
+            self.step_name, self.step_end = prev
+
+
+def current() -> RunBudget | None:
+    """현재 컨텍스트의 실행 예산. 없으면 None (시간 제한 없음)."""
+    return _current.get()
+
+
+@contextmanager
+def use_budget(budget: RunBudget):
+    """이 블록 안의 Notion API 호출에 budget을 적용한다."""
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
@@ -1,16 +1,173 @@
 """Notion API 공통 설정. 모든 ID는 .env에서 로드."""
 import os
-from dotenv import load_dotenv
-from notion_client import Client
+import sys
+import json
+import time
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-load_dotenv()
+if TYPE_CHECKING:
+    from notion_client import Client
+    from notion_http import NotionClient
 
+_ENV_PATH = Path(__file__).parent / ".env"
 
-def get_client() -> Client:
-    token = os.environ.get("NOTION_TOKEN")
+
+def _load_env():
+    """
+    .env를 환경변수로 읽는다 (이미 설정된 값은 덮어쓰지 않음).
+    스크립트 옆에 .env가 없으면 기존처럼 상위 디렉터리에서 찾는다.
+    """
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_PATH if _ENV_PATH.exists() else None)
+
+
+_load_env()
+
+log = logging.getLogger("notion_daily")
+
+# 로컬 상태 파일(작업 큐, 캐시 등) 디렉터리
+STATE_DIR = Path(os.environ.get("NOTION_STATE_DIR", Path(__file__).parent / "state"))
+
+# HTTP 연결 설정 (프로세스 전체에서 하나의 커넥션 풀을 공유)
+HTTP_TIMEOUT_SEC = float(os.environ.get("NOTION_TIMEOUT_SEC", "30"))
+HTTP_CONNECT_TIMEOUT_SEC = float(os.environ.get("NOTION_CONNECT_TIMEOUT_SEC", "5"))
+HTTP_POOL_SIZE = int(os.environ.get("NOTION_POOL_SIZE", "10"))
+HTTP_KEEPALIVE_SEC = float(os.environ.get("NOTION_KEEPALIVE_SEC", "60"))
+HTTP2 = os.environ.get("NOTION_HTTP2", "") == "1"
+
+
+def _parse_budgets(value: str) -> dict:
+    """"Daily=300,Journal=120" 형태를 {"Daily": 300.0, ...}로 변환한다."""
+    budgets = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, sec = item.split("=", 1)
+            budgets[name.strip()] = float(sec)
+    return budgets
+
+
+# 실행 시간 예산 (cron 실행이 다음 실행과 겹치지 않도록)
+RUN_BUDGET_SEC = float(os.environ.get("NOTION_RUN_BUDGET_SEC", "900"))
+STEP_BUDGETS_SEC = _parse_budgets(
+    os.environ.get("NOTION_STEP_BUDGETS", "Daily=420,Journal=180,Weekly=90,Monthly=90")
+)
+# 단계별 SLO (초). 넘으면 실행 요약에 표시하고 종료 코드 3 (run_history.py)
+STEP_SLO_SEC = _parse_budgets(os.environ.get("NOTION_STEP_SLO", ""))
+# 토큰별 초당 요청 수 (Notion 평균 한도 3회/초)
+RATE_LIMIT_PER_SEC = float(os.environ.get("NOTION_RATE_LIMIT", "3"))
+RATE_LIMIT_BURST = int(os.environ.get("NOTION_RATE_BURST", "3"))
+
+# 멀티 프로필 실행 시 동시에 처리할 워크스페이스 수
+PROFILE_CONCURRENCY = int(os.environ.get("NOTION_PROFILE_CONCURRENCY", "8"))
+
+# 조회 요청이 이 시간(초) 안에 끝나지 않으면 같은 요청을 한 번 더 보낸다 (0이면 끔)
+HEDGE_AFTER_SEC = float(os.environ.get("NOTION_HEDGE_AFTER_SEC", "0"))
+
+# 조회 응답 캐시 (0이면 끔). NOTION_CACHE_DISK=1이면 STATE_DIR/cache.sqlite에도 저장
+CACHE_SIZE = int(os.environ.get("NOTION_CACHE_SIZE", "512"))
+CACHE_TTL_SEC = float(os.environ.get("NOTION_CACHE_TTL_SEC", "300"))
+CACHE_DISK = os.environ.get("NOTION_CACHE_DISK", "") == "1"
+
+# Weekly/Monthly 페이지에 Daily 요약 블록을 유지한다 (rollup.py)
+ROLLUP_ENABLED = os.environ.get("NOTION_ROLLUP", "") == "1"
+
+
+_clients: dict[str, "NotionClient"] = {}
+_limiters: dict[str, "RateLimiter"] = {}
+_lock = threading.Lock()
+
+
+class RateLimiter:
+    """
+    토큰 버킷 방식의 요청 속도 제한. 스레드 간 공유해도 안전하다.
+    rate: 초당 요청 수, burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """다음 요청을 보내도 될 때까지 대기한다."""
+        with self._lock:
+            now = time.monotonic()
+            # burst 만큼은 과거로 당겨서 바로 보낼 수 있게 한다
+            slot = max(self._next, now - (self.burst - 1) / self.rate)
+            self._next = slot + 1 / self.rate
+        wait_sec = slot - now
+        if wait_sec > 0:
+            time.sleep(wait_sec)
+
+
+def get_client(token: str | None = None) -> "NotionClient":
+    """
+    토큰별 Notion 클라이언트를 반환한다. 같은 프로세스에서는 재사용된다.
+
+    모든 클라이언트는 하나의 transport(커넥션 풀)를 공유하므로
+    범위 실행이나 동시 실행에서도 TCP/TLS 연결을 매번 새로 맺지 않는다.
+    httpx/notion_client는 여기서 처음 import된다 (API를 쓰지 않는 실행의 기동 시간 단축).
+    """
+    token = token or os.environ.get("NOTION_TOKEN")
     if not token:
         raise RuntimeError("NOTION_TOKEN이 설정되지 않았습니다.")
-    return Client(auth=token)
+
+    from notion_http import make_client
+    from response_cache import ResponseCache
+
+    with _lock:
+        client = _clients.get(token)
+        if client is None:
+            client = make_client(token)
+            client.limiter = _limiters.setdefault(
+                token, RateLimiter(RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST)
+            )
+            if CACHE_SIZE > 0:
+                client.cache = ResponseCache(
+                    CACHE_SIZE,
+                    CACHE_TTL_SEC,
+                    disk_path=STATE_DIR / "cache.sqlite" if CACHE_DISK else None,
+                    namespace=token,
+                )
+            _clients[token] = client
+        return client
+
+
+def close_clients():
+    """공유 클라이언트와 커넥션 풀을 닫는다. 프로세스 종료 시 자동 호출."""
+    with _lock:
+        _clients.clear()
+    notion_http = sys.modules.get("notion_http")
+    if notion_http is not None:
+        notion_http.close()
+
+
+atexit.register(close_clients)
+
+
+def query_all(notion: "Client", data_source_id: str, filter: dict | None = None) -> list:
+    """데이터 소스를 페이지네이션하며 끝까지 조회한다 (요청당 최대 100개)."""
+    pages = []
+    start_cursor = None
+    while True:
+        kwargs = {"data_source_id": data_source_id, "page_size": 100}
+        if filter:
+            kwargs["filter"] = filter
+        if start_cursor:
+            kwargs["start_cursor"] = start_cursor
+        resp = notion.data_sources.query(**kwargs)
+        pages.extend(resp.get("results", []))
+        if not resp.get("has_more"):
+            break
+        start_cursor = resp.get("next_cursor")
+    return pages
 
 
 # Daily
@@ -28,3 +185,119 @@ MONTHLY_DB_ID = os.environ.get("MONTHLY_DB_ID", "")
 
 # Journal
 JOURNAL_PAGE_ID = os.environ.get("JOURNAL_PAGE_ID", "")
+
+# 템플릿에서 synced_block으로 감싸는 heading_3 label (Journal/요약의 참조 순서)
+SYNCED_LABELS = ["기록 - 개인", "기록 - 업무"]
+
+
+# ── 페이지 속성 ──
+
+
+def page_date(page: dict) -> date | None:
+    """Daily 페이지의 날짜. '날짜' 속성이 없으면 제목의 YYYY-MM-DD를 쓴다."""
+    props = page.get("properties", {})
+    start = ((props.get("날짜") or {}).get("date") or {}).get("start")
+    if not start:
+        title = "".join(t.get("plain_text", "") for t in props.get("일간", {}).get("title", []))
+        start = title.split(" ")[0]
+    try:
+        return date.fromisoformat(start[:10])
+    except ValueError:
+        return None
+
+
+def page_title(page: dict, prop: str) -> str:
+    title = page.get("properties", {}).get(prop, {}).get("title", [])
+    return "".join(t.get("plain_text", "") for t in title)
+
+
+def relation_ids(page: dict, prop: str) -> list:
+    return [r["id"] for r in page.get("properties", {}).get(prop, {}).get("relation", [])]
+
+
+# ── 증분 조회 워터마크 (audit, export) ──
+
+# 워터마크는 시작 시각보다 조금 앞으로 잡는다 (Notion의 last_edited_time은 분 단위 + 시계 오차)
+_WATERMARK_SLACK = timedelta(minutes=5)
+
+
+def make_watermark(started: datetime) -> str:
+    """started(UTC)에 시작한 실행 다음의 증분 조회 기준. last_edited_time과 같은 형식."""
+    return (started - _WATERMARK_SLACK).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def edited_since(edited: str, watermark: str | None) -> bool:
+    """last_edited_time이 워터마크 이후인지. 워터마크가 없으면(전체 조회) 항상 True."""
+    return watermark is None or edited >= watermark
+
+
+def edited_since_filter(watermark: str | None) -> dict | None:
+    """edited_since와 같은 기준의 data_sources.query 필터. 워터마크가 없으면 None."""
+    if watermark is None:
+        return None
+    return {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+
+
+# ── 프로필 (워크스페이스별 토큰 + ID) ──
+
+
+@dataclass(frozen=True)
+class Profile:
+    """워크스페이스 하나의 토큰과 데이터베이스/페이지 ID."""
+
+    name: str
+    token: str
+    daily_ds_id: str
+    daily_db_id: str
+    template_page_id: str
+    weekly_ds_id: str
+    weekly_db_id: str
+    monthly_ds_id: str
+    monthly_db_id: str
+    journal_page_id: str
+
+
+# 프로필 파일 키 → Profile 필드 (.env 변수 이름과 동일)
+_PROFILE_KEYS = {
+    "NOTION_TOKEN": "token",
+    "DAILY_DS_ID": "daily_ds_id",
+    "DAILY_DB_ID": "daily_db_id",
+    "TEMPLATE_PAGE_ID": "template_page_id",
+    "WEEKLY_DS_ID": "weekly_ds_id",
+    "WEEKLY_DB_ID": "weekly_db_id",
+    "MONTHLY_DS_ID": "monthly_ds_id",
+    "MONTHLY_DB_ID": "monthly_db_id",
+    "JOURNAL_PAGE_ID": "journal_page_id",
+}
+
+
+def default_profile() -> Profile:
+    """.env 값으로 만든 기본 프로필."""
+    values = {field: os.environ.get(key, "") for key, field in _PROFILE_KEYS.items()}
+    return Profile(name="default", **values)
+
+
+def load_profiles(path: str | Path) -> list[Profile]:
+    """
+    프로필 파일(JSON 배열)을 읽는다.
+
+    각 항목은 "name"과 .env와 같은 이름의 키를 가진다. 토큰은 "NOTION_TOKEN" 대신
+    "NOTION_TOKEN_ENV"로 환경변수 이름을 줄 수 있다.
+    토큰과 ID는 모두 필수이며 .env 값을 대신 쓰지 않는다 (오타로 기본 워크스페이스에 쓰지 않도록).
+    """
+    profiles = []
+    for i, entry in enumerate(json.loads(Path(path).read_text(encoding="utf-8"))):
+        name = entry.get("name") or f"profile{i + 1}"
+        values = {field: entry.get(key, "") for key, field in _PROFILE_KEYS.items()}
+        if entry.get("NOTION_TOKEN_ENV"):
+            values["token"] = os.environ.get(entry["NOTION_TOKEN_ENV"], "")
+            if not values["token"]:
+                raise RuntimeError(
+                    f"프로필 '{name}'의 NOTION_TOKEN_ENV 환경변수가 비어 있습니다: "
+                    f"{entry['NOTION_TOKEN_ENV']}"
+                )
+        missing = [key for key, field in _PROFILE_KEYS.items() if not values[field]]
+        if missing:
+            raise RuntimeError(f"프로필 '{name}'에 필수 키가 없습니다: {', '.join(missing)}")
+        profiles.append(Profile(name=name, **values))
+    return profiles
@@ -0,0 +1,189 @@
+"""
+Notion HTTP 계층: 공유 커넥션 풀, 실행 예산/속도 제한/hedge/캐시를 적용하는 NotionClient.
+httpx와 notion_client를 불러오므로 notion_config.get_client()가 처음 호출될 때 import된다.
+"""
+import re
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import httpx
+from notion_client import Client
+from notion_client.errors import RequestTimeoutError
+
+import deadline
+import response_cache
+from response_cache import ResponseCache
+from notion_config import (
+    log, RateLimiter,
+    HTTP_TIMEOUT_SEC, HTTP_CONNECT_TIMEOUT_SEC, HTTP_POOL_SIZE, HTTP_KEEPALIVE_SEC, HTTP2,
+    HEDGE_AFTER_SEC,
+)
+
+# 중복 전송해도 안전한 조회 요청 (blocks.children.list 등 GET, data_sources.query)
+_QUERY_PATH = re.compile(r"^data_sources/[^/]+/query$")
+
+_transport: httpx.HTTPTransport | None = None
+_hedge_pool: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def _get_transport() -> httpx.HTTPTransport:
+    """keep-alive 커넥션 풀을 가진 공유 transport. 최초 호출 시 한 번만 만든다."""
+    global _transport
+    if _transport is None:
+        http2 = HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                log.warning("NOTION_HTTP2=1 이지만 h2 패키지가 없어 HTTP/1.1을 사용합니다.")
+                http2 = False
+        _transport = httpx.HTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE,
+                keepalive_expiry=HTTP_KEEPALIVE_SEC,
+            ),
+        )
+    return _transport
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(
+                max_workers=HTTP_POOL_SIZE, thread_name_prefix="notion-hedge"
+            )
+        return _hedge_pool
+
+
+def _submit(fn, *args):
+    """현재 contextvar(실행 예산 등)를 유지한 채 공유 스레드 풀에서 실행한다."""
+    ctx = contextvars.copy_context()
+    return _get_hedge_pool().submit(ctx.run, fn, *args)
+
+
+class NotionClient(Client):
+    """
+    실행 예산(deadline)과 토큰별 속도 제한을 따르는 Notion 클라이언트.
+    - 요청을 보내기 전 limiter로 토큰의 요청 속도를 맞춘다
+    - 호출마다 남은 예산 안에서 timeout을 정한다
+    - 느린 조회 요청은 HEDGE_AFTER_SEC 후 한 번 더 보내 먼저 온 응답을 쓴다
+    - 조회 응답은 cache에 두고, 쓰기 요청은 대상과 부모의 캐시를 지운다
+    """
+
+    limiter: RateLimiter | None = None
+    cache: ResponseCache | None = None
+
+    def request(self, path, method, query=None, body=None, form_data=None, auth=None):
+        if not _is_idempotent_read(method, path):
+            try:
+                response = super().request(path, method, query, body, form_data, auth)
+            except Exception:
+                # 실패한 쓰기도 일부 반영됐을 수 있으므로 무효화한다
+                if self.cache:
+                    self.cache.invalidate_write(method, path, body)
+                raise
+            if self.cache:
+                self.cache.invalidate_write(method, path, body, response)
+            return response
+
+        key = None
+        if self.cache and form_data is None and auth is None:
+            key = self.cache.make_key(method, path, query, body)
+            cached = None if response_cache.bypassed() else self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if HEDGE_AFTER_SEC > 0:
+            response = self._hedged_request(path, method, query, body, form_data, auth)
+        else:
+            response = super().request(path, method, query, body, form_data, auth)
+        if key:
+            self.cache.put(key, path, response)
+        return response
+
+    def _hedged_request(self, *args):
+        send = super().request
+        first = _submit(send, *args)
+        done, _ = wait([first], timeout=HEDGE_AFTER_SEC)
+        if done:
+            return first.result()
+
+        log.debug(f"  느린 조회 요청 재전송 (hedge): {args[1]} {args[0]}")
+        pending = {first, _submit(send, *args)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if f.exception() is None:
+                    return f.result()
+                error = f.exception()
+        raise error
+
+    def _build_request(self, method, path, query=None, body=None, form_data=None, auth=None):
+        request = super()._build_request(method, path, query, body, form_data, auth)
+        if self.limiter:
+            self.limiter.acquire()
+        budget = deadline.current()
+        if budget:
+            timeout = budget.call_timeout()
+            budget.record_call()
+            request.extensions["timeout"] = httpx.Timeout(
+                timeout, connect=min(timeout, HTTP_CONNECT_TIMEOUT_SEC)
+            ).as_dict()
+        return request
+
+    # 아래 두 메서드는 notion-client 3.x 내부 메서드를 덮어쓴다 (requirements.txt에서 3.x로 고정)
+    def _execute_single_request(self, request, method, path):
+        try:
+            return super()._execute_single_request(request, method, path)
+        except RequestTimeoutError:
+            # 예산에 맞춰 줄인 timeout에 걸린 경우 예산 초과로 보고
+            budget = deadline.current()
+            if budget:
+                budget.check()
+            raise
+
+    def _calculate_retry_delay(self, error, attempt):
+        # 재시도 대기가 남은 예산을 넘지 않도록 제한
+        delay = super()._calculate_retry_delay(error, attempt)
+        budget = deadline.current()
+        if budget:
+            delay = max(0.0, min(delay, budget.remaining()))
+        return delay
+
+
+def _is_idempotent_read(method: str, path: str) -> bool:
+    return method.upper() == "GET" or (
+        method.upper() == "POST" and _QUERY_PATH.match(path) is not None
+    )
+
+
+def make_client(token: str) -> NotionClient:
+    """공유 transport를 쓰는 새 클라이언트. 재사용은 notion_config.get_client()가 맡는다."""
+    http_client = httpx.Client(transport=_get_transport())
+    client = NotionClient(
+        auth=token,
+        client=http_client,
+        timeout_ms=int(HTTP_TIMEOUT_SEC * 1000),
+    )
+    # Client가 설정한 단일 timeout을 connect/read 분리 값으로 덮어쓴다
+    client.client.timeout = httpx.Timeout(
+        HTTP_TIMEOUT_SEC, connect=HTTP_CONNECT_TIMEOUT_SEC
+    )
+    return client
+
+
+def close():
+    """hedge 스레드 풀과 커넥션 풀을 닫는다."""
+    global _transport, _hedge_pool
+    with _lock:
+        if _hedge_pool is not None:
+            _hedge_pool.shutdown(wait=False)
+            _hedge_pool = None
+        if _transport is not None:
+            _transport.close()
+            _transport = None
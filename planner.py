@@ -0,0 +1,340 @@
+"""
+실행 계획 (run_daily.py --plan).
+일괄 조회 몇 번으로 이미 있는 Daily/Weekly/Monthly 페이지와 Journal 토글을 확인하고,
+실제 실행이 보낼 쓰기와 예상 API 호출 수, 소요 시간을 계산한다. 쓰기는 하지 않는다.
+- 단계별 호출 수는 add_daily / add_journal_entry / add_weekly / add_monthly의 호출 순서를 그대로 따른다
+- 읽기 수는 조회 캐시 적중을 빼지 않은 상한이다
+- NOTION_ROLLUP=1이면 Rollup 단계도 rollup.py의 기록(state/rollup.sqlite)과 비교해 센다
+"""
+import logging
+from collections import Counter
+from datetime import timedelta
+from notion_client import Client
+from notion_config import (
+    Profile, query_all, page_date, page_title, relation_ids,
+    RATE_LIMIT_PER_SEC, RUN_BUDGET_SEC, HTTP_TIMEOUT_SEC, ROLLUP_ENABLED,
+)
+from calendar_plan import DayPlan
+from deadline import RunBudget, use_budget
+from response_cache import bypass
+from add_daily import (
+    compile_template, load_page_plan, load_page_synced, plan_write_cost, DAILY_CONCURRENCY,
+)
+from audit import read_journal_dates
+
+log = logging.getLogger("notion_daily")
+
+STEPS = ["Daily", "Journal", "Weekly", "Monthly"] + (["Rollup"] if ROLLUP_ENABLED else [])
+
+# 단계 코드에 있는 쓰기 사이 대기 (time.sleep(0.35))
+_SLEEP_SEC = 0.35
+
+
+def plan_run(
+    notion: Client, profile: Profile, days: list[DayPlan], bulk: bool = False
+) -> dict:
+    """
+    days를 순서대로 실행했을 때의 쓰기와 API 호출 수를 계산한다.
+    bulk=True면 범위 실행처럼 Daily를 먼저 일괄 준비한다고 보고 센다 (add_daily.create_daily_pages).
+
+    Returns:
+        {
+            "profile": "default", "days": 31,
+            "lookup_calls": 계획을 세우는 데 쓴 조회 수,
+            "steps": {"Daily": {"reads", "writes", "sleeps", "blocks", "items": {종류: [대상]}}, ...},
+            "calls": 예상 API 호출 수, "writes": 예상 쓰기 수, "eta_sec": 예상 소요 시간,
+        }
+    """
+    budget = RunBudget(RUN_BUDGET_SEC, {}, HTTP_TIMEOUT_SEC)
+    # Notion에서 직접 고친 내용까지 반영해야 하므로 캐시를 거치지 않고 읽는다
+    with use_budget(budget), bypass():
+        state = _read_state(notion, profile, days)
+
+    steps = {
+        name: {"reads": 0, "writes": 0, "sleeps": 0, "blocks": 0, "items": {}}
+        for name in STEPS
+    }
+    if bulk:
+        # 범위 조회 1회 (100개씩 페이지네이션)
+        steps["Daily"]["reads"] += 1 + len(state["dailies"]) // 100
+        if state["rollup"]:
+            # 요약 단계가 처음 실행될 때 범위의 Daily가 이미 모두 있다
+            for day in days:
+                if day.date not in state["dailies"]:
+                    page_id = f"new:{day.date_str}"
+                    state["rollup"]["dailies"][day.date] = {"id": page_id, "edited": page_id}
+    for day in days:
+        _plan_day(state, day, steps, bulk)
+
+    reads = sum(s["reads"] for s in steps.values())
+    writes = sum(s["writes"] for s in steps.values())
+    sleeps = sum(s["sleeps"] for s in steps.values())
+    if bulk:
+        # Daily 생성은 DAILY_CONCURRENCY개 페이지가 동시에 진행되므로 대기도 겹친다
+        daily_sleeps = steps["Daily"]["sleeps"]
+        sleeps += daily_sleeps / max(1, DAILY_CONCURRENCY) - daily_sleeps
+    return {
+        "profile": profile.name,
+        "days": len(days),
+        "lookup_calls": sum(budget.api_calls.values()),
+        "steps": steps,
+        "calls": reads + writes,
+        "writes": writes,
+        "eta_sec": estimate_sec(reads + writes, sleeps),
+    }
+
+
+def estimate_sec(calls: int, sleeps: int) -> float:
+    """
+    속도 제한(NOTION_RATE_LIMIT)으로 calls번 호출하고 sleeps번 대기하는 시간.
+    대기 중에도 속도 제한 토큰이 채워지므로 호출 간격을 넘는 만큼만 더한다. API 응답 시간은 제외.
+    """
+    interval = 1 / RATE_LIMIT_PER_SEC if RATE_LIMIT_PER_SEC > 0 else 0.0
+    return calls * interval + sleeps * max(0.0, _SLEEP_SEC - interval)
+
+
+def _read_state(notion: Client, profile: Profile, days: list[DayPlan]) -> dict:
+    start, end = days[0].date, days[-1].date
+    first, last = start, end
+    if ROLLUP_ENABLED:
+        from rollup import month_weeks
+        # 요약은 범위 밖이라도 같은 달에 걸친 주의 Daily를 모두 참조한다
+        first, last = month_weeks(start)[0]["start"], month_weeks(end)[-1]["end"]
+
+    dailies = {}
+    rollup_dailies = {}
+    for page in query_all(notion, profile.daily_ds_id, {"and": [
+        {"property": "날짜", "date": {"on_or_after": first.isoformat()}},
+        {"property": "날짜", "date": {"on_or_before": last.isoformat()}},
+    ]}):
+        d = page_date(page)
+        if not d or d in rollup_dailies:
+            continue
+        rollup_dailies[d] = {"id": page["id"], "edited": page.get("last_edited_time", "")}
+        if start <= d <= end:
+            dailies[d] = page["id"]
+
+    weeklies = {
+        page_title(p, "주간"): {"id": p["id"], "relation": set(relation_ids(p, "일간"))}
+        for p in query_all(notion, profile.weekly_ds_id)
+    }
+    monthlies = {
+        page_title(p, "월간"): {"id": p["id"], "relation": set(relation_ids(p, "주간"))}
+        for p in query_all(notion, profile.monthly_ds_id)
+    }
+
+    journal = {"years": {}, "months": {}, "dates": {}}
+    if profile.journal_page_id:
+        journal = read_journal_dates(
+            notion, profile.journal_page_id, {day.journal["month"] for day in days}
+        )
+
+    rollup = None
+    if ROLLUP_ENABLED:
+        from rollup import load_state
+        rollup = {**load_state(), "dailies": rollup_dailies}
+
+    plan = compile_template(notion, profile.template_page_id) if profile.template_page_id else None
+    log.info(
+        f"[실행 계획] {profile.name} | {start} ~ {end} | 기존 Daily {len(dailies)}개, "
+        f"Weekly {len(weeklies)}개, Monthly {len(monthlies)}개"
+    )
+    return {
+        "dailies": dailies,
+        "weeklies": weeklies,
+        "monthlies": monthlies,
+        "journal_years": set(journal["years"]),
+        "journal_months": set(journal["months"]),
+        "journal_dates": set(journal["dates"]),
+        "plan": plan,
+        "plan_cost": plan_write_cost(plan["nodes"]) if plan else None,
+        "plan_labels": sum(1 for n in plan["nodes"] if n["label"]) if plan else 0,
+        "rollup": rollup,
+    }
+
+
+def _add(steps: dict, step: str, kind: str, target, reads=0, writes=0, sleeps=0):
+    s = steps[step]
+    s["reads"] += reads
+    s["writes"] += writes
+    s["sleeps"] += sleeps
+    if kind:
+        s["items"].setdefault(kind, []).append(target)
+
+
+def _plan_day(state: dict, day: DayPlan, steps: dict, bulk: bool):
+    # 1. Daily: 제목 검색 1회 (일괄 준비면 범위 조회로 대신),
+    #    기존 페이지는 synced_block 원본 탐색 (add_daily.find_synced_ids)
+    search = 0 if bulk else 1
+    page_id = state["dailies"].get(day.date)
+    if page_id:
+        recorded = load_page_plan(page_id) or state["plan"]
+        layout = [n["label"] for n in recorded["nodes"] if n["label"]] if recorded else []
+        stored = load_page_synced(page_id)
+        if stored and all(label in stored for label in layout or stored):
+            labels = len(stored)
+            _add(steps, "Daily", None, None, reads=search)
+        else:
+            # 목록 1회 + 원본 synced_block마다 label 확인 1회 (상한)
+            labels = len(layout)
+            _add(steps, "Daily", None, None, reads=search + 1 + (labels or 2))
+    else:
+        page_id = f"new:{day.date_str}"
+        state["dailies"][day.date] = page_id
+        if state["rollup"]:
+            state["rollup"]["dailies"][day.date] = {"id": page_id, "edited": page_id}
+        cost = state["plan_cost"] or {"writes": 0, "reads": 0, "sleeps": 0, "blocks": 0}
+        _add(
+            steps, "Daily", "페이지 생성", day.date,
+            reads=search + cost["reads"], writes=1 + cost["writes"], sleeps=cost["sleeps"],
+        )
+        steps["Daily"]["blocks"] += cost["blocks"]
+        labels = state["plan_labels"]
+
+    # 2. Journal: synced_block이 있을 때만 (년도 → 월 → 날짜 순으로 목록 조회)
+    if labels:
+        journal = day.journal
+        _add(steps, "Journal", None, None, reads=3)
+        if journal["year"] not in state["journal_years"]:
+            state["journal_years"].add(journal["year"])
+            _add(steps, "Journal", "년도 토글", journal["year"], writes=1, sleeps=1)
+        if journal["month"] not in state["journal_months"]:
+            state["journal_months"].add(journal["month"])
+            _add(steps, "Journal", "월 토글", journal["month"], writes=1, sleeps=1)
+        if day.date not in state["journal_dates"]:
+            state["journal_dates"].add(day.date)
+            _add(steps, "Journal", "날짜 토글", day.date, writes=2, sleeps=1)
+
+    # 3. Weekly: 제목 검색 1회, 기존 페이지는 relation 읽기 후 필요하면 update
+    title = day.week["title"]
+    weekly = state["weeklies"].get(title)
+    if weekly is None:
+        weekly = {"id": f"new:{title}", "relation": {page_id}}
+        state["weeklies"][title] = weekly
+        _add(steps, "Weekly", "페이지 생성", title, reads=1, writes=1)
+    elif page_id not in weekly["relation"]:
+        weekly["relation"].add(page_id)
+        _add(steps, "Weekly", "relation 추가", title, reads=2, writes=1)
+    else:
+        _add(steps, "Weekly", None, None, reads=2)
+
+    # 4. Monthly
+    title = day.month["title"]
+    monthly = state["monthlies"].get(title)
+    if monthly is None:
+        monthly = {"id": f"new:{title}", "relation": {weekly["id"]}}
+        state["monthlies"][title] = monthly
+        _add(steps, "Monthly", "페이지 생성", title, reads=1, writes=1)
+    elif weekly["id"] not in monthly["relation"]:
+        monthly["relation"].add(weekly["id"])
+        _add(steps, "Monthly", "relation 추가", title, reads=2, writes=1)
+    else:
+        _add(steps, "Monthly", None, None, reads=2)
+
+    # 5. Rollup: Weekly/Monthly 요약 (rollup.refresh_weekly / refresh_monthly)
+    if state["rollup"]:
+        _plan_rollup(state, day, steps, weekly["id"], monthly["id"])
+
+
+def _plan_rollup(state: dict, day: DayPlan, steps: dict, weekly_id: str, monthly_id: str):
+    from rollup import month_weeks
+
+    rollup = state["rollup"]
+    dailies = sorted(rollup["dailies"].items())
+
+    # Weekly: Daily 범위 조회 1회, 바뀐 Daily마다 synced_block 원본 탐색 (목록 1회 + label 확인)
+    week = day.week
+    _add(steps, "Rollup", None, None, reads=1)
+    _plan_summary(
+        rollup, steps, weekly_id, week["title"],
+        [(s["id"], s["edited"]) for d, s in dailies if week["start"] <= d <= week["end"]],
+        build_reads=1 + (state["plan_labels"] or 2),
+        rewrites=lambda old, new: False,
+    )
+
+    # Monthly: Daily 범위 조회 + Weekly 제목 조회, 항목은 기록된 synced_block으로 만든다
+    sources = []
+    for w in month_weeks(day.date):
+        weekly = state["weeklies"].get(w["title"])
+        if weekly is None:
+            continue
+        members = [s["edited"] for d, s in dailies if w["start"] <= d <= w["end"]]
+        sources.append((weekly["id"], max(members, default="") + f"#{len(members)}"))
+    _add(steps, "Rollup", None, None, reads=2)
+    _plan_summary(
+        rollup, steps, monthly_id, day.month["title"], sources,
+        build_reads=0,
+        # 주에 속한 Daily 수가 바뀌면 항목 내용도 바뀐다
+        rewrites=lambda old, new: old.rpartition("#")[2] != new.rpartition("#")[2],
+    )
+
+
+def _plan_summary(
+    rollup: dict, steps: dict, page_id: str, target: str, sources: list,
+    build_reads: int, rewrites,
+):
+    """
+    rollup._refresh_entries의 쓰기를 센다. sources: [(원본 ID, edited)]
+    원본이 바뀌었어도 rewrites(기록, 현재)가 False면 요약 내용이 같다고 보고 쓰지 않는다.
+    """
+    if page_id not in rollup["containers"]:
+        rollup["containers"].add(page_id)
+        rollup["entries"][page_id] = {}
+        _add(steps, "Rollup", "요약 heading", target, writes=1)
+    stored = rollup["entries"].setdefault(page_id, {})
+
+    for source_id, edited in sources:
+        old = stored.get(source_id)
+        if old == edited:
+            continue
+        stored[source_id] = edited
+        if old is None:
+            _add(steps, "Rollup", "항목 추가", target, reads=build_reads, writes=1)
+        elif rewrites(old, edited):
+            # 이전 항목 삭제 + 새 항목
+            _add(steps, "Rollup", "항목 갱신", target, reads=build_reads, writes=2)
+        else:
+            _add(steps, "Rollup", None, None, reads=build_reads)
+
+    current = {source_id for source_id, _ in sources}
+    for source_id in [s for s in stored if s not in current]:
+        del stored[source_id]
+        _add(steps, "Rollup", "항목 삭제", target, writes=1)
+
+
+# ── 출력 ──
+
+
+def _date_ranges(dates: list) -> str:
+    """연속된 날짜를 묶는다: 2026-03-01~2026-03-05, 2026-03-09"""
+    spans = []
+    for d in sorted(dates):
+        if spans and d == spans[-1][1] + timedelta(days=1):
+            spans[-1][1] = d
+        else:
+            spans.append([d, d])
+    return ", ".join(f"{a}~{b}" if a != b else f"{a}" for a, b in spans)
+
+
+def _targets(items: list) -> str:
+    if items and hasattr(items[0], "isoformat"):
+        return _date_ranges(items)
+    return ", ".join(f"{t} ×{n}" if n > 1 else t for t, n in Counter(items).items())
+
+
+def format_plan(result: dict) -> list[str]:
+    """plan_run() 결과를 로그 줄로 만든다."""
+    lines = []
+    for step in STEPS:
+        s = result["steps"][step]
+        lines.append(f"  {step:10s} | 조회 {s['reads']} / 쓰기 {s['writes']}")
+        for kind, items in s["items"].items():
+            extra = f" (블록 {s['blocks']}개)" if step == "Daily" and s["blocks"] else ""
+            lines.append(f"    {kind} {len(items)}건{extra}: {_targets(items)}")
+    minutes, seconds = divmod(round(result["eta_sec"]), 60)
+    lines.append(
+        f"  합계: API {result['calls']}회 (쓰기 {result['writes']}) | "
+        f"예상 {minutes}분 {seconds}초 ({RATE_LIMIT_PER_SEC:g}회/초, 응답 시간 제외) | "
+        f"계획 조회 {result['lookup_calls']}회"
+    )
+    return lines
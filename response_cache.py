@@ -0,0 +1,269 @@
+"""
+Notion 조회 응답 캐시 (read-through).
+- 메모리 LRU(크기 제한) + 선택적 디스크(SQLite) 2단계
+- 항목마다 관련 블록/페이지 ID를 태그로 달아 두고, 쓰기 요청이 오면 그 ID와 부모 ID의 항목을 지운다
+- 응답에 있는 parent 정보로 ID → 부모 ID 표를 채워, 쓰기 응답에 parent가 없어도 부모를 찾는다
+- 디스크 단계는 같은 파일을 쓰는 다른 worker 프로세스의 쓰기 무효화도 함께 본다
+"""
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+from collections import OrderedDict
+from pathlib import Path
+
+# 데이터 소스 조회 결과는 페이지 쓰기가 있으면 모두 무효화한다
+QUERY_TAG = "query"
+
+# bypass() 안에서는 캐시를 읽지 않고 항상 새로 조회한다 (결과는 캐시에 저장)
+_bypass = contextvars.ContextVar("notion_cache_bypass", default=False)
+
+_RESOURCE_PATH = re.compile(r"^(blocks|pages|databases|data_sources)/([^/]+)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS response_tags (
+    key TEXT NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS response_tags_tag ON response_tags (tag);
+"""
+
+
+def normalize_id(object_id: str) -> str:
+    """Notion ID를 하이픈 없는 소문자로 맞춘다 (같은 ID가 두 형태로 오므로)."""
+    return object_id.replace("-", "").lower()
+
+
+def request_tags(path: str) -> set:
+    """요청 경로가 가리키는 리소스 ID. 데이터 소스 조회는 QUERY_TAG도 붙는다."""
+    m = _RESOURCE_PATH.match(path)
+    if not m:
+        return set()
+    tags = {normalize_id(m.group(2))}
+    if m.group(1) == "data_sources":
+        tags.add(QUERY_TAG)
+    return tags
+
+
+@contextmanager
+def bypass():
+    """
+    Notion에서 직접 고친 내용을 반드시 봐야 하는 작업(템플릿 동기화, 점검)에서 쓴다.
+    notion_http._submit으로 넘긴 스레드에도 그대로 적용된다.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def bypassed() -> bool:
+    return _bypass.get()
+
+
+def _parent_id(obj: dict) -> str | None:
+    parent = obj.get("parent") or {}
+    ptype = parent.get("type")
+    value = parent.get(ptype) if ptype else None
+    if not isinstance(value, str):
+        value = (
+            parent.get("block_id") or parent.get("page_id")
+            or parent.get("data_source_id") or parent.get("database_id")
+        )
+    return normalize_id(value) if isinstance(value, str) else None
+
+
+class ResponseCache:
+    """
+    Args:
+        max_entries: 메모리에 남길 응답 수 (LRU)
+        ttl_sec: 응답 유효 시간. Notion에서 직접 고친 내용이 이 시간 안에는 보이지 않을 수 있다
+        disk_path: 디스크 캐시 파일. None이면 메모리만 사용
+        namespace: 디스크 키 접두어 (토큰별로 나눔)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_sec: float = 300,
+        disk_path: str | Path | None = None,
+        namespace: str = "",
+    ):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.namespace = hashlib.sha256(namespace.encode()).hexdigest()[:16]
+        self._entries = OrderedDict()  # key → (expires, value, tags)
+        self._tag_keys = {}            # tag → {key, ...}
+        self._parents = {}             # 블록/페이지 ID → 부모 ID
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "invalidations": 0}
+        self._disk = None
+        if disk_path:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._disk = sqlite3.connect(
+                Path(disk_path), timeout=60, isolation_level=None, check_same_thread=False
+            )
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(method: str, path: str, query=None, body=None) -> str:
+        return json.dumps([method.upper(), path, query or {}, body or {}], sort_keys=True)
+
+    def get(self, key: str):
+        """캐시된 응답의 복사본. 없거나 만료됐으면 None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return json.loads(entry[1])
+            if entry:
+                self._drop(key)
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT value, expires FROM responses WHERE key = ?",
+                    (self._disk_key(key),),
+                ).fetchone()
+                if row and row[1] > now:
+                    self._stats["disk_hits"] += 1
+                    value = json.loads(row[0])
+                    self._remember(key, row[0], row[1], request_tags(json.loads(key)[1]))
+                    self._learn_parents(value)
+                    return value
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, path: str, value):
+        tags = request_tags(path)
+        raw = json.dumps(value, ensure_ascii=False)
+        expires = time.time() + self.ttl_sec
+        with self._lock:
+            self._learn_parents(value)
+            self._remember(key, raw, expires, tags)
+            if self._disk is not None:
+                disk_key = self._disk_key(key)
+                self._disk.execute("BEGIN IMMEDIATE")
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires) VALUES (?, ?, ?)",
+                    (disk_key, raw, expires),
+                )
+                self._disk.execute("DELETE FROM response_tags WHERE key = ?", (disk_key,))
+                self._disk.executemany(
+                    "INSERT INTO response_tags (key, tag) VALUES (?, ?)",
+                    [(disk_key, tag) for tag in tags],
+                )
+                self._disk.execute("COMMIT")
+
+    def invalidate_write(self, method: str, path: str, body=None, response=None):
+        """
+        쓰기 요청 뒤에 호출한다. 대상 ID와 부모 ID의 응답을 지운다.
+        페이지 생성/수정은 데이터 소스 조회 결과도 모두 지운다.
+        """
+        tags = request_tags(path) - {QUERY_TAG}
+        with self._lock:
+            if isinstance(response, dict):
+                self._learn_parents(response)
+                parent = _parent_id(response)
+                if parent:
+                    tags.add(parent)
+            if isinstance(body, dict) and body.get("parent"):
+                parent = _parent_id(body)
+                if parent:
+                    tags.add(parent)
+            for object_id in list(tags):
+                parent = self._parents.get(object_id)
+                if parent:
+                    tags.add(parent)
+            if path.startswith("pages"):
+                tags.add(QUERY_TAG)
+            if not tags:
+                # 알 수 없는 쓰기는 전부 비운다
+                self._clear()
+                return
+            self._invalidate(tags)
+
+    def clear(self):
+        """메모리 단계를 비운다 (디스크는 다른 프로세스의 무효화를 따르므로 유지)."""
+        with self._lock:
+            self._entries.clear()
+            self._tag_keys.clear()
+
+    def stats(self) -> dict:
+        """{"hits", "disk_hits", "misses", "invalidations", "size"}"""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    # ── 내부 ──
+
+    def _disk_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _remember(self, key: str, raw: str, expires: float, tags: set):
+        if self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (expires, raw, tags)
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tag_keys.get(tag)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def _invalidate(self, tags: set):
+        for tag in tags:
+            for key in list(self._tag_keys.get(tag, ())):
+                self._drop(key)
+                self._stats["invalidations"] += 1
+        if self._disk is not None:
+            placeholders = ",".join("?" * len(tags))
+            self._disk.execute("BEGIN IMMEDIATE")
+            self._disk.execute(
+                f"DELETE FROM responses WHERE key IN "
+                f"(SELECT key FROM response_tags WHERE tag IN ({placeholders}))",
+                list(tags),
+            )
+            self._disk.execute(
+                f"DELETE FROM response_tags WHERE tag IN ({placeholders})", list(tags)
+            )
+            self._disk.execute("COMMIT")
+
+    def _clear(self):
+        self._entries.clear()
+        self._tag_keys.clear()
+        if self._disk is not None:
+            self._disk.execute("DELETE FROM responses")
+            self._disk.execute("DELETE FROM response_tags")
+
+    def _learn_parents(self, value):
+        """응답 안 블록/페이지 객체의 parent를 기록한다 (목록 응답은 results를 훑음)."""
+        if not isinstance(value, dict):
+            return
+        objects = value["results"] if "results" in value else [value]
+        for obj in objects or []:
+            if isinstance(obj, dict) and obj.get("id"):
+                parent = _parent_id(obj)
+                if parent:
+                    self._parents[normalize_id(obj["id"])] = parent
@@ -0,0 +1,327 @@
+"""
+Weekly/Monthly 페이지의 자동 요약 블록 (NOTION_ROLLUP=1일 때 실행 마지막 단계).
+- Weekly: 그 주의 Daily마다 토글 하나 (Daily 링크 + "기록 - 개인/업무" synced_block 참조)
+- Monthly: 그 달에 걸친 Weekly마다 토글 하나 (Weekly 링크 + 주의 Daily 링크와 synced_block 참조)
+- 요약은 페이지 끝의 토글 heading 하나(컨테이너) 아래에 둔다
+- 항목마다 원본 페이지의 last_edited_time을 기록해 두고, 바뀐 항목만 다시 읽고
+  내용이 달라졌을 때만 그 항목을 다시 쓴다 (월말에도 바뀐 주만 처리)
+"""
+import json
+import sqlite3
+import hashlib
+import logging
+from datetime import date, timedelta
+from notion_client import Client, APIResponseError
+from notion_config import (
+    Profile, STATE_DIR, SYNCED_LABELS, query_all, page_date, page_title,
+)
+from response_cache import bypass
+from calendar_plan import DayPlan, plan_range
+from add_daily import find_synced_ids
+
+log = logging.getLogger("notion_daily")
+
+ROLLUP_STATE_PATH = STATE_DIR / "rollup.sqlite"
+
+_WEEKLY_HEADING = "일간 요약"
+_MONTHLY_HEADING = "주간 요약"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS containers (
+    page_id TEXT PRIMARY KEY,
+    block_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    page_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    block_id TEXT NOT NULL,
+    edited TEXT NOT NULL,
+    sig TEXT NOT NULL,
+    PRIMARY KEY (page_id, source_id)
+);
+"""
+
+
+def _db() -> sqlite3.Connection:
+    ROLLUP_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(ROLLUP_STATE_PATH, timeout=60, isolation_level=None)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ── 블록 ──
+
+
+def _mention(page_id: str) -> list:
+    return [{"type": "mention", "mention": {"type": "page", "page": {"id": page_id}}}]
+
+
+def _synced_refs(synced_ids: dict) -> list:
+    return [
+        {"type": "synced_block", "synced_block": {"synced_from": {"block_id": synced_ids[label]}}}
+        for label in SYNCED_LABELS if label in synced_ids
+    ]
+
+
+def _toggle(rich_text: list, children: list) -> dict:
+    block = {"type": "toggle", "toggle": {"rich_text": rich_text}}
+    if children:
+        block["toggle"]["children"] = children
+    return block
+
+
+def _sig(block: dict) -> str:
+    raw = json.dumps(block, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _daily_sources(notion: Client, profile: Profile, start: date, end: date) -> list:
+    """start~end Daily 페이지 (날짜순): [{"id", "date", "edited"}]"""
+    pages = query_all(notion, profile.daily_ds_id, {"and": [
+        {"property": "날짜", "date": {"on_or_after": start.isoformat()}},
+        {"property": "날짜", "date": {"on_or_before": end.isoformat()}},
+    ]})
+    sources = [
+        {"id": p["id"], "date": page_date(p), "edited": p.get("last_edited_time", "")}
+        for p in pages
+    ]
+    return sorted((s for s in sources if s["date"]), key=lambda s: s["date"])
+
+
+# ── 증분 갱신 ──
+
+
+class _StaleContainer(Exception):
+    """요약 컨테이너나 앵커로 쓴 항목을 사용자가 지워 항목을 쓸 수 없을 때."""
+
+    def __init__(self, container_id: str, code: str):
+        self.container_id = container_id
+        self.code = code
+        super().__init__(f"요약 컨테이너 {container_id}: {code}")
+
+
+def _refresh(notion: Client, page_id: str, heading: str, sources: list, build) -> dict:
+    """
+    page_id의 요약 컨테이너 항목을 sources(순서대로, {"id", "edited"})에 맞춘다.
+    build(source)는 last_edited_time이 바뀐 항목에만 호출된다.
+
+    Returns:
+        {"added", "rewritten", "removed", "unchanged"}
+    """
+    conn = _db()
+    try:
+        try:
+            return _refresh_entries(notion, conn, page_id, heading, sources, build)
+        except _StaleContainer as e:
+            log.warning(f"  요약 블록 기록 복구 ({e.code})")
+            _recover(notion, conn, page_id, e.container_id)
+        try:
+            return _refresh_entries(notion, conn, page_id, heading, sources, build)
+        except _StaleContainer as e:
+            raise e.__cause__  # 복구 후에도 실패 → 원래 API 오류
+    finally:
+        conn.close()
+
+
+def _recover(notion: Client, conn: sqlite3.Connection, page_id: str, container_id: str):
+    """
+    컨테이너가 남아 있으면 페이지에서 사라진 항목만 기록에서 지워 다시 쓰게 하고,
+    컨테이너가 지워졌으면 (남은 블록은 가능하면 지우고) 기록을 버려 새로 만들게 한다.
+    """
+    from add_journal_entry import get_blocks
+
+    with bypass():
+        try:
+            container = notion.blocks.retrieve(block_id=container_id)
+            alive = not (container.get("archived") or container.get("in_trash"))
+        except APIResponseError as e:
+            if e.code != "object_not_found":
+                raise
+            alive = False
+        if not alive:
+            _delete(notion, container_id)
+            _forget(conn, page_id)
+            return
+        present = {b["id"] for b in get_blocks(notion, container_id)}
+    conn.executemany(
+        "DELETE FROM entries WHERE page_id = ? AND block_id = ?",
+        [
+            (page_id, block_id)
+            for (block_id,) in conn.execute(
+                "SELECT block_id FROM entries WHERE page_id = ?", (page_id,)
+            ).fetchall()
+            if block_id not in present
+        ],
+    )
+
+
+def _forget(conn: sqlite3.Connection, page_id: str):
+    conn.execute("DELETE FROM containers WHERE page_id = ?", (page_id,))
+    conn.execute("DELETE FROM entries WHERE page_id = ?", (page_id,))
+
+
+def _refresh_entries(notion, conn, page_id, heading, sources, build) -> dict:
+    counts = {"added": 0, "rewritten": 0, "removed": 0, "unchanged": 0}
+    row = conn.execute(
+        "SELECT block_id FROM containers WHERE page_id = ?", (page_id,)
+    ).fetchone()
+    if row:
+        container_id = row[0]
+    else:
+        resp = notion.blocks.children.append(block_id=page_id, children=[{
+            "type": "heading_2",
+            "heading_2": {
+                "rich_text": [{"type": "text", "text": {"content": heading}}],
+                "is_toggleable": True,
+            },
+        }])
+        container_id = resp["results"][0]["id"]
+        _forget(conn, page_id)
+        conn.execute(
+            "INSERT INTO containers (page_id, block_id) VALUES (?, ?)", (page_id, container_id)
+        )
+
+    stored = {
+        source_id: (block_id, edited, sig)
+        for source_id, block_id, edited, sig in conn.execute(
+            "SELECT source_id, block_id, edited, sig FROM entries WHERE page_id = ?", (page_id,)
+        )
+    }
+
+    anchor = None
+    for source in sources:
+        entry = stored.pop(source["id"], None)
+        if entry and entry[1] == source["edited"]:
+            anchor = entry[0]
+            counts["unchanged"] += 1
+            continue
+
+        block = build(source)
+        sig = _sig(block)
+        if entry and entry[2] == sig:
+            # 원본은 바뀌었지만 요약 내용은 같음 → 기록만 갱신
+            block_id = entry[0]
+            counts["unchanged"] += 1
+        else:
+            if entry:
+                _delete(notion, entry[0])
+            position = (
+                {"type": "after_block", "after_block": {"id": anchor}} if anchor
+                else {"type": "start"}
+            )
+            try:
+                resp = notion.blocks.children.append(
+                    block_id=container_id, children=[block], position=position
+                )
+            except APIResponseError as e:
+                # 컨테이너나 앵커 항목이 지워짐 → _refresh가 기록을 맞춘 뒤 다시 실행
+                if e.code not in ("object_not_found", "validation_error"):
+                    raise
+                raise _StaleContainer(container_id, e.code) from e
+            block_id = resp["results"][0]["id"]
+            counts["rewritten" if entry else "added"] += 1
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (page_id, source_id, block_id, edited, sig) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (page_id, source["id"], block_id, source["edited"], sig),
+        )
+        anchor = block_id
+
+    for source_id, (block_id, _, _) in stored.items():
+        _delete(notion, block_id)
+        conn.execute(
+            "DELETE FROM entries WHERE page_id = ? AND source_id = ?", (page_id, source_id)
+        )
+        counts["removed"] += 1
+    return counts
+
+
+def _delete(notion: Client, block_id: str):
+    try:
+        notion.blocks.delete(block_id=block_id)
+    except APIResponseError as e:
+        # 사용자가 먼저 지운 항목
+        log.debug(f"  요약 항목 삭제 건너뜀 {block_id}: {e.code}")
+
+
+# ── Weekly / Monthly ──
+
+
+def month_weeks(d: date) -> list[dict]:
+    """d가 속한 달에 걸친 주의 week 정보 (calendar_plan.DayPlan.week), 순서대로."""
+    first = d.replace(day=1)
+    last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return [days[0].week for days in plan_range(first, last).weeks.values()]
+
+
+def load_state() -> dict:
+    """
+    기록된 요약 상태 (API 호출 없음, --plan 비용 추정용).
+
+    Returns:
+        {"containers": {page_id, ...}, "entries": {page_id: {source_id: edited}}}
+    """
+    conn = _db()
+    try:
+        containers = {row[0] for row in conn.execute("SELECT page_id FROM containers")}
+        entries = {}
+        for page_id, source_id, edited in conn.execute(
+            "SELECT page_id, source_id, edited FROM entries"
+        ):
+            entries.setdefault(page_id, {})[source_id] = edited
+    finally:
+        conn.close()
+    return {"containers": containers, "entries": entries}
+
+
+def refresh_weekly(notion: Client, profile: Profile, day: DayPlan, weekly_page_id: str) -> dict:
+    """day가 속한 주의 Weekly 페이지 요약을 갱신한다."""
+    week = day.week
+
+    def build(source):
+        # 원본이 바뀐 Daily만 페이지를 다시 읽어 synced_block을 확인한다
+        synced_ids = find_synced_ids(
+            notion, source["id"], profile.template_page_id, refresh=True
+        )
+        return _toggle(_mention(source["id"]), _synced_refs(synced_ids))
+
+    with bypass():
+        sources = _daily_sources(notion, profile, week["start"], week["end"])
+        return _refresh(notion, weekly_page_id, _WEEKLY_HEADING, sources, build)
+
+
+def refresh_monthly(notion: Client, profile: Profile, day: DayPlan, monthly_page_id: str) -> dict:
+    """day가 속한 달의 Monthly 페이지 요약을 갱신한다 (주마다 항목 하나)."""
+    weeks = month_weeks(day.date)
+
+    with bypass():
+        dailies = _daily_sources(notion, profile, weeks[0]["start"], weeks[-1]["end"])
+        weekly_pages = query_all(notion, profile.weekly_ds_id, {
+            "or": [{"property": "주간", "title": {"equals": w["title"]}} for w in weeks]
+        })
+    weekly_ids = {page_title(p, "주간"): p["id"] for p in weekly_pages}
+
+    sources = []
+    for week in weeks:
+        if week["title"] not in weekly_ids:
+            continue
+        members = [s for s in dailies if week["start"] <= s["date"] <= week["end"]]
+        sources.append({
+            "id": weekly_ids[week["title"]],
+            # 주에 속한 Daily의 최근 수정 시각과 구성이 같으면 다시 읽지 않는다
+            "edited": max((s["edited"] for s in members), default="")
+            + f"#{len(members)}",
+            "dailies": members,
+        })
+
+    def build(source):
+        # Weekly 요약에서 갱신된 synced_block 기록을 그대로 쓴다 (대부분 API 호출 없음)
+        children = []
+        for daily in source["dailies"]:
+            children.append({"type": "paragraph", "paragraph": {"rich_text": _mention(daily["id"])}})
+            children += _synced_refs(
+                find_synced_ids(notion, daily["id"], profile.template_page_id)
+            )
+        return _toggle(_mention(source["id"]), children)
+
+    return _refresh(notion, monthly_page_id, _MONTHLY_HEADING, sources, build)
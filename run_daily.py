@@ -6,82 +6,354 @@
 3. Weekly 페이지 생성/연결
 4. Monthly 페이지 생성/연결
 """
+import os
 import sys
+import time
+
+# --startup-profile: 이후의 모든 import 시간을 잰다 (다른 import보다 먼저 설치)
+if "--startup-profile" in sys.argv:
+    import startup_profile
+    startup_profile.install()
+
 import logging
 import traceback
+import contextvars
 from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
 
 # KST (UTC+9)
 KST = timezone(timedelta(hours=9))
-from notion_client import APIResponseError
-from notion_config import get_client, TEMPLATE_PAGE_ID
+# notion_client/httpx는 get_client()와 각 단계에서 처음 필요할 때 import한다 (기동 시간 단축)
+from notion_config import (
+    get_client, default_profile, load_profiles, Profile,
+    RUN_BUDGET_SEC, STEP_BUDGETS_SEC, HTTP_TIMEOUT_SEC, PROFILE_CONCURRENCY,
+    RATE_LIMIT_PER_SEC, STATE_DIR, ROLLUP_ENABLED,
+)
+from deadline import RunBudget, DeadlineExceeded, use_budget
+from calendar_plan import DayPlan, plan_day, plan_range
 LOG_DIR = Path(__file__).parent / "logs"
+# 로그 회전: "size"(LOG_MAX_MB마다) 또는 "daily"(자정마다), 압축본 LOG_BACKUPS개 보관
+LOG_ROTATE = os.environ.get("NOTION_LOG_ROTATE", "size")
+LOG_MAX_MB = float(os.environ.get("NOTION_LOG_MAX_MB", "5"))
+LOG_BACKUPS = int(os.environ.get("NOTION_LOG_BACKUPS", "10"))
+QUEUE_PATH = Path(os.environ.get("NOTION_QUEUE_PATH", STATE_DIR / "queue.sqlite"))
 
 _DAY_NAMES_KO = ["월", "화", "수", "목", "금", "토", "일"]
 
+# 에러 없이 끝났지만 SLO 초과/회귀 단계가 있을 때의 종료 코드 (에러는 1)
+SLOW_EXIT_CODE = 3
+
+# 실행 요약에 표시할 단계 (NOTION_ROLLUP=1이면 요약 블록 갱신 단계 추가)
+STEPS = ["Daily", "Journal", "Weekly", "Monthly"] + (["Rollup"] if ROLLUP_ENABLED else [])
+
 log = logging.getLogger("notion_daily")
+run_log = logging.getLogger("notion_daily.runs")
+_log_listener = None
+
+# 멀티 프로필 실행 시 현재 스레드가 처리 중인 프로필 이름 (로그 접두어)
+_profile_name: contextvars.ContextVar[str] = contextvars.ContextVar("profile_name", default="")
+
+
+class _ProfileFilter(logging.Filter):
+    """로그 레코드에 프로필 접두어(%(profile)s)를 넣는다."""
+
+    def filter(self, record):
+        name = _profile_name.get()
+        record.profile = f"[{name}] " if name else ""
+        return True
+
+
+def _gzip_rotator(source: str, dest: str):
+    """회전된 로그 파일을 gzip으로 압축해 보관한다."""
+    import gzip
+    import shutil
+
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _rotating_handler(path: Path) -> logging.Handler:
+    """LOG_ROTATE 설정에 따라 크기/날짜 기준으로 회전하고 .gz로 압축하는 파일 핸들러."""
+    from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+
+    if LOG_ROTATE == "daily":
+        handler = TimedRotatingFileHandler(
+            path, when="midnight", backupCount=LOG_BACKUPS, encoding="utf-8"
+        )
+    else:
+        handler = RotatingFileHandler(
+            path, maxBytes=int(LOG_MAX_MB * 1024 * 1024), backupCount=LOG_BACKUPS,
+            encoding="utf-8",
+        )
+    handler.namer = lambda name: f"{name}.gz"
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+class _OnlyLogger(logging.Filter):
+    """name 로거(실행 기록)만 통과시키거나(keep=True) 걸러낸다(keep=False)."""
+
+    def __init__(self, name: str, keep: bool):
+        super().__init__()
+        self.logger_name = name
+        self.keep = keep
+
+    def filter(self, record):
+        return (record.name == self.logger_name) == self.keep
 
 
-def setup_logging():
-    """콘솔 + 파일 로깅 설정. 중복 호출 시 핸들러를 추가하지 않는다."""
+def setup_logging(suffix: str = ""):
+    """
+    콘솔 + 파일 로깅 설정. 중복 호출 시 핸들러를 추가하지 않는다.
+    로거는 큐에 넣기만 하고, 실제 출력은 QueueListener 스레드가 한다 (파이프라인이 로그 I/O를 기다리지 않음).
+    suffix: 로그 파일 이름 접미어. 동시에 도는 프로세스(worker)는 각자 다른 파일을 써야
+    회전이 서로 겹치지 않는다 (회전은 프로세스 하나만 안전하게 할 수 있음).
+    """
+    global _log_listener
     if log.handlers:
         return
 
+    import atexit
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
     LOG_DIR.mkdir(exist_ok=True)
-    log_file = LOG_DIR / "notion_daily.log"
+    log_file = LOG_DIR / f"notion_daily{suffix}.log"
+    # 실행마다 JSON 한 줄 (날짜, 단계별 상태/소요 시간/API 요청 수)
+    runs_file = LOG_DIR / f"runs{suffix}.jsonl"
 
     log.setLevel(logging.DEBUG)
+    run_log.setLevel(logging.INFO)
+    run_log.propagate = False
 
     fmt = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(message)s",
+        "%(asctime)s [%(levelname)s] %(profile)s%(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
+    skip_runs = _OnlyLogger(run_log.name, keep=False)
 
     # 콘솔: INFO 이상
     console = logging.StreamHandler()
     console.setLevel(logging.INFO)
     console.setFormatter(fmt)
-    log.addHandler(console)
+    console.addFilter(skip_runs)
 
-    # 파일: DEBUG 이상 (append 모드)
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    # 파일: DEBUG 이상, 회전 + 압축
+    file_handler = _rotating_handler(log_file)
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(fmt)
-    log.addHandler(file_handler)
+    file_handler.addFilter(skip_runs)
+
+    # 실행 기록: 한 줄에 JSON 하나
+    runs_handler = _rotating_handler(runs_file)
+    runs_handler.setFormatter(logging.Formatter("%(message)s"))
+    runs_handler.addFilter(_OnlyLogger(run_log.name, keep=True))
+
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    # 프로필 접두어는 contextvar를 읽으므로 로그를 남기는 스레드에서 붙인다
+    queue_handler.addFilter(_ProfileFilter())
+    log.addHandler(queue_handler)
+    run_log.addHandler(queue_handler)
+
+    _log_listener = QueueListener(
+        records, console, file_handler, runs_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    atexit.register(stop_logging)
 
     log.info(f"로그 파일: {log_file}")
 
 
-def make_daily_title(d: date) -> str:
-    day_name = _DAY_NAMES_KO[d.weekday()]
-    return f"{d.isoformat()} ({day_name})"
+def run_pipeline(
+    target_date: date | None = None,
+    profile: Profile | None = None,
+    day: DayPlan | None = None,
+    daily: tuple | None = None,
+) -> dict:
+    """
+    날짜 하나에 대해 4단계를 실행하고 실행 요약을 로그에 남긴다. (종료하지 않음)
+    day를 주면 calendar_plan에서 미리 계산한 제목/주차/월 정보를 그대로 사용한다.
+    daily를 주면 (prepare_dailies에서 일괄 생성한 (page, synced_ids, is_new, error)) Daily 단계는 API를 부르지 않는다.
+    일괄 준비가 실패한 날짜(error)는 날짜별로 다시 만들거나 템플릿을 마저 적용한다.
 
+    Returns:
+        {"date": "2026-03-01", "profile": "default", "results": {...},
+         "exceeded": ["Daily"], "has_error": bool, "slow": ["Journal"],
+         "durations": {"Daily": 3.2, ...}, "api_calls": {"Daily": 12, ...}}
+    """
+    profile = profile or default_profile()
+    day = day or plan_day(target_date or datetime.now(KST).date())
+    date_str = day.date_str
 
-def make_journal_params(d: date) -> dict:
-    return {
-        "year": f"{d.year}년",
-        "month": f"{d.year}년 {d.month}월",
-        "date_title": f"{d.year}년 {d.month}월 {d.day}일 ({_DAY_NAMES_KO[d.weekday()]})",
+    log.info(f"날짜: {date_str} ({_DAY_NAMES_KO[day.date.weekday()]})")
+    log.info("=" * 50)
+
+    started = datetime.now(KST)
+    notion = get_client(profile.token)
+    budget = RunBudget(RUN_BUDGET_SEC, STEP_BUDGETS_SEC, HTTP_TIMEOUT_SEC)
+    cache_before = notion.cache.stats() if notion.cache else None
+
+    with use_budget(budget):
+        results = _run_steps(notion, day, budget, profile, daily)
+
+    # 실행 요약
+    log.info("=" * 50)
+    log.info(f"[실행 요약] {date_str}")
+    has_error = False
+    for step in STEPS:
+        r = results.get(step, {"status": "미실행", "detail": ""})
+        status = r["status"]
+        detail = r["detail"]
+        if status == "실패":
+            has_error = True
+            log.error(f"  {step:10s} | {status} | {detail}")
+        else:
+            log.info(f"  {step:10s} | {status} | {detail}")
+
+    if budget.exceeded:
+        log.error(f"  시간 예산 초과: {', '.join(budget.exceeded)}")
+    cache = None
+    if cache_before:
+        stats = notion.cache.stats()
+        cache = {
+            "hits": stats["hits"] + stats["disk_hits"]
+            - cache_before["hits"] - cache_before["disk_hits"],
+            "misses": stats["misses"] - cache_before["misses"],
+        }
+        log.info(f"  조회 캐시: 적중 {cache['hits']} / 미스 {cache['misses']}")
+
+    summary = {
+        "date": date_str,
+        "profile": profile.name,
+        "results": results,
+        "exceeded": budget.exceeded,
+        "has_error": has_error,
+        "durations": dict(budget.durations),
+        "api_calls": dict(budget.api_calls),
     }
+    # 미리 준비한 Daily는 소요 시간이 0에 가까우므로 이력에 넣지 않는다
+    prepared = daily is not None and daily[3] is None
+    summary["slow"] = _check_history(summary, skip=("Daily",) if prepared else ())
+    _write_run_record(summary, started, time.monotonic() - budget.started, cache)
+    return summary
+
+
+def _check_history(summary: dict, skip: tuple = ()) -> list[str]:
+    """단계별 이력/SLO 점검 결과를 실행 요약에 남기고, 느린 단계 이름을 반환한다."""
+    import sqlite3
+    from run_history import check_run, format_alert
+
+    try:
+        alerts = check_run(summary, skip)
+    except sqlite3.Error as e:
+        log.warning(f"  실행 이력 기록 실패: {e}")
+        return []
+    for alert in alerts:
+        label = "SLO 초과" if alert["kind"] == "SLO" else "느려짐"
+        log.warning(f"  {label}: {format_alert(alert)}")
+    return list(dict.fromkeys(alert["step"] for alert in alerts))
 
 
-def run(target_date: date | None = None):
+def stop_logging():
+    """큐에 남은 로그를 모두 출력하고 listener를 멈춘다. 종료 시 자동 호출 (여러 번 호출해도 안전)."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def _write_run_record(summary: dict, started: datetime, elapsed: float, cache: dict | None):
+    """실행 결과를 logs/runs.jsonl에 한 줄로 남긴다 (setup_logging 이후에만 기록됨)."""
+    import json
+
+    steps = {
+        step: {
+            **r,
+            "duration_sec": round(summary["durations"].get(step, 0.0), 3),
+            "api_calls": summary["api_calls"].get(step, 0),
+        }
+        for step, r in summary["results"].items()
+    }
+    record = {
+        "date": summary["date"],
+        "profile": summary["profile"],
+        "started": started.isoformat(timespec="seconds"),
+        "duration_sec": round(elapsed, 3),
+        "has_error": summary["has_error"],
+        "exceeded": summary["exceeded"],
+        "slow": summary["slow"],
+        "api_calls": sum(summary["api_calls"].values()),
+        "cache": cache,
+        "steps": steps,
+    }
+    run_log.info(json.dumps(record, ensure_ascii=False))
+
+
+def run_profiles(
+    profiles: list[Profile],
+    target_date: date | None = None,
+    day: DayPlan | None = None,
+    prepared: dict | None = None,
+) -> list[dict]:
+    """
+    여러 프로필(워크스페이스)을 동시에 실행하고 전체 요약을 남긴다.
+    클라이언트는 토큰별로 만들어지고 속도 제한도 토큰별로 따로 적용된다.
+    prepared: prepare_dailies() 결과 (범위 실행)
+    """
     setup_logging()
 
-    today = target_date or datetime.now(KST).date()
-    title = make_daily_title(today)
-    date_str = today.isoformat()
-    year = f"{today.year}년"
+    def _run_one(profile: Profile) -> dict:
+        _profile_name.set(profile.name)
+        daily = (prepared or {}).get(profile.name, {}).get(day.date_str) if day else None
+        try:
+            return run_pipeline(target_date, profile, day, daily)
+        except Exception as e:
+            log.error(f"실행 실패: {e}")
+            log.debug(traceback.format_exc())
+            return {
+                "profile": profile.name, "results": {}, "exceeded": [], "has_error": True,
+                "slow": [],
+            }
+
+    workers = max(1, min(PROFILE_CONCURRENCY, len(profiles)))
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profile") as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, _run_one, p) for p in profiles
+        ]
+        summaries = [f.result() for f in futures]
 
-    log.info(f"날짜: {date_str} ({_DAY_NAMES_KO[today.weekday()]})")
     log.info("=" * 50)
+    log.info(f"[전체 요약] 프로필 {len(summaries)}개")
+    for s in summaries:
+        statuses = " | ".join(
+            f"{step} {s['results'].get(step, {}).get('status', '미실행')}"
+            for step in STEPS
+        )
+        if s["has_error"]:
+            log.error(f"  {s['profile']:12s} | {statuses}")
+        elif s["slow"]:
+            log.warning(f"  {s['profile']:12s} | {statuses} | 느림: {', '.join(s['slow'])}")
+        else:
+            log.info(f"  {s['profile']:12s} | {statuses}")
+    return summaries
+
 
-    notion = get_client()
+def _run_steps(
+    notion, day: DayPlan, budget: RunBudget, profile: Profile, daily: tuple | None = None
+) -> dict:
+    """4단계를 순서대로 실행하고 단계별 결과를 반환한다. 각 단계는 budget.step 예산을 따른다."""
+    from notion_client import APIResponseError
 
+    title = day.title
+    date_str = day.date_str
     daily_page_id = None
     synced_ids = {}
     weekly_page_id = None
+    monthly_page_id = None
 
     # 결과 추적: {step: {"status": "생성"|"기존"|"스킵"|"실패", "detail": "..."}}
     results = {}
@@ -89,18 +361,31 @@ def run(target_date: date | None = None):
     # 1. Daily
     log.info("[1/4] Daily 페이지")
     try:
-        from add_daily import create_daily_page
-        daily_page, synced_ids, is_new = create_daily_page(
-            notion, title, date_str, year, TEMPLATE_PAGE_ID
-        )
-        daily_page_id = daily_page["id"]
-        if is_new:
-            results["Daily"] = {"status": "생성", "detail": title}
-        else:
-            results["Daily"] = {"status": "기존", "detail": title}
-        log.info(f"  Daily 완료: {daily_page_id}")
+        with budget.step("Daily"):
+            if daily and daily[3] is None:
+                daily_page, synced_ids, is_new = daily[:3]
+            elif daily and daily[0]:
+                # 일괄 준비에서 페이지는 만들었지만 템플릿 적용에 실패 → 빠진 블록을 마저 채운다
+                from add_daily import daily_synced_ids
+                daily_page, is_new = daily[0], daily[2]
+                synced_ids = daily_synced_ids(notion, daily_page["id"], profile.template_page_id)
+            else:
+                from add_daily import create_daily_page
+                daily_page, synced_ids, is_new = create_daily_page(
+                    notion, title, date_str, day.year, profile.template_page_id,
+                    profile.daily_ds_id, profile.daily_db_id,
+                )
+            daily_page_id = daily_page["id"]
+            if is_new:
+                results["Daily"] = {"status": "생성", "detail": title}
+            else:
+                results["Daily"] = {"status": "기존", "detail": title}
+            log.info(f"  Daily 완료: {daily_page_id}")
+    except DeadlineExceeded as e:
+        results["Daily"] = {"status": "실패", "detail": str(e)}
+        log.error(f"  Daily 실패: {e}")
     except APIResponseError as e:
-        msg = f"Notion API 오류: {e.code} - {e.message}"
+        msg = f"Notion API 오류: {e.code} - {e}"
         results["Daily"] = {"status": "실패", "detail": msg}
         log.error(f"  Daily 실패: {msg}")
     except Exception as e:
@@ -112,19 +397,23 @@ def run(target_date: date | None = None):
     log.info("[2/4] Journal Overall")
     if daily_page_id and synced_ids:
         try:
-            from add_journal_entry import add_to_journal
-            journal = make_journal_params(today)
-            added = add_to_journal(
-                notion, journal["year"], journal["month"],
-                journal["date_title"], synced_ids,
-            )
-            if added:
-                results["Journal"] = {"status": "생성", "detail": f"동기화 블록 추가 ({journal['date_title']})"}
-            else:
-                results["Journal"] = {"status": "기존", "detail": f"날짜 토글 이미 존재 ({journal['date_title']})"}
-            log.info("  Journal 완료")
+            with budget.step("Journal"):
+                from add_journal_entry import add_to_journal
+                journal = day.journal
+                added = add_to_journal(
+                    notion, journal["year"], journal["month"],
+                    journal["date_title"], synced_ids, profile.journal_page_id,
+                )
+                if added:
+                    results["Journal"] = {"status": "생성", "detail": f"동기화 블록 추가 ({journal['date_title']})"}
+                else:
+                    results["Journal"] = {"status": "기존", "detail": f"날짜 토글 이미 존재 ({journal['date_title']})"}
+                log.info("  Journal 완료")
+        except DeadlineExceeded as e:
+            results["Journal"] = {"status": "실패", "detail": str(e)}
+            log.error(f"  Journal 실패: {e}")
         except APIResponseError as e:
-            msg = f"Notion API 오류: {e.code} - {e.message}"
+            msg = f"Notion API 오류: {e.code} - {e}"
             results["Journal"] = {"status": "실패", "detail": msg}
             log.error(f"  Journal 실패: {msg}")
         except Exception as e:
@@ -142,17 +431,24 @@ def run(target_date: date | None = None):
     log.info("[3/4] Weekly 페이지")
     if daily_page_id:
         try:
-            from add_weekly import ensure_weekly, get_week_info
-            weekly_page, is_new = ensure_weekly(notion, date_str, daily_page_id)
-            weekly_page_id = weekly_page["id"]
-            weekly_title = get_week_info(today)["title"]
-            if is_new:
-                results["Weekly"] = {"status": "생성", "detail": weekly_title}
-            else:
-                results["Weekly"] = {"status": "기존", "detail": weekly_title}
-            log.info(f"  Weekly 완료: {weekly_page_id}")
+            with budget.step("Weekly"):
+                from add_weekly import ensure_weekly
+                weekly_page, is_new = ensure_weekly(
+                    notion, date_str, daily_page_id,
+                    profile.weekly_ds_id, profile.weekly_db_id, day.week,
+                )
+                weekly_page_id = weekly_page["id"]
+                weekly_title = day.week["title"]
+                if is_new:
+                    results["Weekly"] = {"status": "생성", "detail": weekly_title}
+                else:
+                    results["Weekly"] = {"status": "기존", "detail": weekly_title}
+                log.info(f"  Weekly 완료: {weekly_page_id}")
+        except DeadlineExceeded as e:
+            results["Weekly"] = {"status": "실패", "detail": str(e)}
+            log.error(f"  Weekly 실패: {e}")
         except APIResponseError as e:
-            msg = f"Notion API 오류: {e.code} - {e.message}"
+            msg = f"Notion API 오류: {e.code} - {e}"
             results["Weekly"] = {"status": "실패", "detail": msg}
             log.error(f"  Weekly 실패: {msg}")
         except Exception as e:
@@ -167,16 +463,24 @@ def run(target_date: date | None = None):
     log.info("[4/4] Monthly 페이지")
     if weekly_page_id:
         try:
-            from add_monthly import ensure_monthly, get_month_info
-            monthly_page, is_new = ensure_monthly(notion, date_str, weekly_page_id)
-            monthly_title = get_month_info(today)["title"]
-            if is_new:
-                results["Monthly"] = {"status": "생성", "detail": monthly_title}
-            else:
-                results["Monthly"] = {"status": "기존", "detail": monthly_title}
-            log.info("  Monthly 완료")
+            with budget.step("Monthly"):
+                from add_monthly import ensure_monthly
+                monthly_page, is_new = ensure_monthly(
+                    notion, date_str, weekly_page_id,
+                    profile.monthly_ds_id, profile.monthly_db_id, day.month,
+                )
+                monthly_page_id = monthly_page["id"]
+                monthly_title = day.month["title"]
+                if is_new:
+                    results["Monthly"] = {"status": "생성", "detail": monthly_title}
+                else:
+                    results["Monthly"] = {"status": "기존", "detail": monthly_title}
+                log.info("  Monthly 완료")
+        except DeadlineExceeded as e:
+            results["Monthly"] = {"status": "실패", "detail": str(e)}
+            log.error(f"  Monthly 실패: {e}")
         except APIResponseError as e:
-            msg = f"Notion API 오류: {e.code} - {e.message}"
+            msg = f"Notion API 오류: {e.code} - {e}"
             results["Monthly"] = {"status": "실패", "detail": msg}
             log.error(f"  Monthly 실패: {msg}")
         except Exception as e:
@@ -187,33 +491,378 @@ def run(target_date: date | None = None):
         results["Monthly"] = {"status": "스킵", "detail": "Weekly 페이지 생성 실패"}
         log.warning("  Weekly 실패로 스킵")
 
-    # 실행 요약
-    log.info("=" * 50)
-    log.info(f"[실행 요약] {date_str}")
-    has_error = False
-    for step in ["Daily", "Journal", "Weekly", "Monthly"]:
-        r = results.get(step, {"status": "미실행", "detail": ""})
-        status = r["status"]
-        detail = r["detail"]
-        if status == "실패":
-            has_error = True
-            log.error(f"  {step:10s} | {status} | {detail}")
-        else:
-            log.info(f"  {step:10s} | {status} | {detail}")
+    # 5. Weekly/Monthly 요약 블록 (NOTION_ROLLUP=1)
+    if not ROLLUP_ENABLED:
+        return results
+    log.info("[요약] Weekly/Monthly 요약 블록")
+    if weekly_page_id:
+        try:
+            with budget.step("Rollup"):
+                from rollup import refresh_weekly, refresh_monthly
+                counts = {"weekly": refresh_weekly(notion, profile, day, weekly_page_id)}
+                if monthly_page_id:
+                    counts["monthly"] = refresh_monthly(notion, profile, day, monthly_page_id)
+                changed = sum(
+                    c[k] for c in counts.values() for k in ("added", "rewritten", "removed")
+                )
+                detail = ", ".join(
+                    f"{name} 추가 {c['added']} 갱신 {c['rewritten']} 삭제 {c['removed']}"
+                    for name, c in counts.items()
+                )
+                results["Rollup"] = {"status": "생성" if changed else "기존", "detail": detail}
+                log.info(f"  요약 완료: {detail}")
+        except DeadlineExceeded as e:
+            results["Rollup"] = {"status": "실패", "detail": str(e)}
+            log.error(f"  요약 실패: {e}")
+        except APIResponseError as e:
+            msg = f"Notion API 오류: {e.code} - {e}"
+            results["Rollup"] = {"status": "실패", "detail": msg}
+            log.error(f"  요약 실패: {msg}")
+        except Exception as e:
+            results["Rollup"] = {"status": "실패", "detail": str(e)}
+            log.error(f"  요약 실패: {e}")
+            log.debug(traceback.format_exc())
+    else:
+        results["Rollup"] = {"status": "스킵", "detail": "Weekly 페이지 생성 실패"}
+        log.warning("  Weekly 실패로 스킵")
+
+    return results
+
+
+# ── 작업 큐 (여러 worker 프로세스로 backfill) ──
+
+
+def task_resources(profile_name: str, day: DayPlan) -> list[str]:
+    """날짜 작업이 갱신하는 공유 리소스 키. 같은 키를 가진 작업은 한 worker만 동시에 실행한다."""
+    return [
+        f"{profile_name}:weekly:{day.week['title']}",
+        f"{profile_name}:monthly:{day.month['title']}",
+        f"{profile_name}:journal:{day.journal['month']}",
+    ]
+
+
+def enqueue_range(start: date, end: date, profiles: list[Profile]) -> int:
+    """
+    범위의 날짜 작업을 큐에 넣는다. 추가된 작업 수를 반환.
+
+    Journal 년도 토글은 여러 월이 함께 쓰므로 worker 경합을 피하려고 여기서 미리 만든다.
+    """
+    from work_queue import WorkQueue
+    from add_journal_entry import ensure_journal_year
+
+    setup_logging()
+    queue = WorkQueue(QUEUE_PATH)
+    plan = plan_range(start, end)
+    added = 0
+    for profile in profiles:
+        notion = get_client(profile.token)
+        for year in range(start.year, end.year + 1):
+            ensure_journal_year(notion, f"{year}년", profile.journal_page_id)
+        for day in plan:
+            if queue.enqueue(profile.name, day.date_str, task_resources(profile.name, day)):
+                added += 1
+    log.info(f"작업 {added}개 추가 ({QUEUE_PATH}) → {queue.counts()}")
+    queue.close()
+    return added
+
+
+def run_worker(profiles: list[Profile], worker_id: str | None = None) -> dict:
+    """
+    큐가 빌 때까지 작업을 lease해서 실행한다. 같은 큐 파일로 여러 프로세스를 띄울 수 있다.
+    토큰별 속도 제한은 큐 파일을 통해 모든 worker가 공유한다.
+
+    Returns:
+        종료 시점의 상태별 작업 수
+    """
+    import re
+    import socket
+    from work_queue import WorkQueue, SharedRateLimiter
+
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    # worker마다 로그 파일을 따로 쓴다: logs/notion_daily.worker-<id>.log
+    safe_id = re.sub(r"[^\w.-]", "_", worker_id)
+    setup_logging(f".worker-{safe_id}")
+    by_name = {p.name: p for p in profiles}
+    # lease는 한 작업의 실행 예산보다 길어야 한다
+    queue = WorkQueue(QUEUE_PATH, lease_sec=RUN_BUDGET_SEC * 1.5 + 60)
+    for profile in profiles:
+        get_client(profile.token).limiter = SharedRateLimiter(
+            QUEUE_PATH, profile.token, RATE_LIMIT_PER_SEC
+        )
+
+    log.info(f"worker 시작: {worker_id} ({QUEUE_PATH})")
+    try:
+        while True:
+            task = queue.claim(worker_id)
+            if task is None:
+                counts = queue.counts()
+                if counts["pending"] == 0 and counts["leased"] == 0:
+                    break
+                # 다른 worker가 같은 주/월을 처리 중이거나 재시도 대기 중
+                time.sleep(2)
+                continue
+
+            profile = by_name.get(task.profile)
+            if profile is None:
+                queue.fail(task, worker_id, f"알 수 없는 프로필: {task.profile}")
+                continue
+
+            log.info(f"작업 {task.id}: {task.profile} {task.date} (시도 {task.attempts})")
+            _profile_name.set(task.profile if len(by_name) > 1 else "")
+            # 다른 worker가 그사이 고쳤을 수 있으므로 메모리 캐시는 작업마다 비운다
+            notion = get_client(profile.token)
+            if notion.cache:
+                notion.cache.clear()
+            try:
+                summary = run_pipeline(date.fromisoformat(task.date), profile)
+            except Exception as e:
+                log.debug(traceback.format_exc())
+                summary = {"has_error": True, "results": {"실행": {"status": "실패", "detail": str(e)}}}
+
+            if summary["has_error"]:
+                failed = [
+                    f"{step}: {r['detail']}"
+                    for step, r in summary["results"].items() if r["status"] == "실패"
+                ]
+                queue.fail(task, worker_id, "; ".join(failed))
+            else:
+                queue.complete(task, worker_id)
+    finally:
+        queue.release(worker_id)
+
+    counts = queue.counts()
+    log.info(f"worker 종료: {worker_id} → {counts}")
+    queue.close()
+    return counts
+
 
-    if has_error:
+def prepare_dailies(days: list[DayPlan], profiles: list[Profile] | None) -> dict:
+    """
+    범위 실행 전에 프로필별 Daily 페이지를 일괄 준비한다 (add_daily.create_daily_pages).
+    날짜마다 실행 예산 하나를 준다. 실패한 날짜는 날짜별 실행에서 다시 만든다.
+
+    Returns:
+        {프로필 이름: {"2026-03-01": (page, synced_ids, is_new, error)}}
+    """
+    from add_daily import create_daily_pages
+
+    setup_logging()
+    targets = profiles or [default_profile()]
+
+    def _prepare(profile: Profile) -> dict:
+        _profile_name.set(profile.name if profiles else "")
+        budget = RunBudget(RUN_BUDGET_SEC * len(days), {}, HTTP_TIMEOUT_SEC)
+        try:
+            with use_budget(budget):
+                prepared = create_daily_pages(
+                    get_client(profile.token), days, profile.template_page_id,
+                    profile.daily_ds_id, profile.daily_db_id,
+                )
+        except Exception as e:
+            log.error(f"Daily 일괄 준비 실패 (날짜별로 생성): {e}")
+            log.debug(traceback.format_exc())
+            return {}
+        done = sum(1 for result in prepared.values() if result[3] is None)
+        log.info(
+            f"Daily 일괄 준비 완료: {done}/{len(days)}일, "
+            f"API {sum(budget.api_calls.values())}회, {time.monotonic() - budget.started:.1f}초"
+        )
+        return prepared
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = max(1, min(PROFILE_CONCURRENCY, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profile") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _prepare, p) for p in targets]
+        return {p.name: f.result() for p, f in zip(targets, futures)}
+
+
+def _run_target(
+    target_date: date | None,
+    profiles: list[Profile] | None,
+    day: DayPlan | None = None,
+    prepared: dict | None = None,
+) -> int:
+    """
+    프로필 목록이 있으면 멀티 프로필로, 없으면 .env 설정으로 실행한다. (종료하지 않음)
+
+    Returns:
+        종료 코드 — 에러가 있으면 1, SLO 초과/회귀 단계가 있으면 SLOW_EXIT_CODE, 아니면 0
+    """
+    if profiles is None:
+        setup_logging()
+        profile = default_profile()
+        daily = (prepared or {}).get(profile.name, {}).get(day.date_str) if day else None
+        summaries = [run_pipeline(target_date, profile, day, daily)]
+    else:
+        summaries = run_profiles(profiles, target_date, day, prepared)
+    if any(s["has_error"] for s in summaries):
         log.error("완료 (에러 있음)")
+        return 1
+    slow = [step for s in summaries for step in s["slow"]]
+    if slow:
+        log.warning(f"완료 (느린 단계: {', '.join(dict.fromkeys(slow))})")
+        return SLOW_EXIT_CODE
+    log.info("완료!")
+    return 0
+
+
+def run_plan(
+    days: list[DayPlan], profiles: list[Profile] | None, bulk: bool = False
+) -> list[dict]:
+    """
+    --plan: 실행하지 않고 프로필별로 보낼 쓰기와 예상 API 호출 수/소요 시간을 출력한다.
+    프로필은 토큰별 속도 제한으로 동시에 실행되므로 전체 예상 시간은 가장 긴 프로필 기준이다.
+    bulk: 범위 실행(Daily 일괄 준비)으로 계산
+    """
+    from planner import plan_run, format_plan
+
+    setup_logging()
+    results = []
+    for profile in profiles or [default_profile()]:
+        _profile_name.set(profile.name if profiles else "")
+        result = plan_run(get_client(profile.token), profile, days, bulk)
+        for line in format_plan(result):
+            log.info(line)
+        results.append(result)
+    _profile_name.set("")
+    if len(results) > 1:
+        minutes, seconds = divmod(round(max(r["eta_sec"] for r in results)), 60)
+        log.info(
+            f"[전체 계획] 프로필 {len(results)}개 | API {sum(r['calls'] for r in results)}회 | "
+            f"예상 {minutes}분 {seconds}초"
+        )
+    return results
+
+
+def _print_startup_profile():
+    """기동 구간별 import 시간을 출력한다. API는 호출하지 않는다."""
+    import startup_profile
+
+    age = startup_profile.process_age_sec()
+    lines = []
+    if age is not None:
+        lines.append(f"프로세스 시작 → main: {age * 1000:.0f} ms")
+    lines += startup_profile.report("run_daily 기동")
+
+    # 실제 실행에서는 get_client()와 각 단계가 처음 쓰일 때 불러오는 모듈
+    since = startup_profile.mark()
+    import notion_http, add_daily, add_journal_entry, add_weekly, add_monthly  # noqa: F401,E401
+    lines += startup_profile.report("API 단계 (지연 import)", since)
+    startup_profile.uninstall()
+    print("\n".join(lines))
+
+
+def _pop_option(args: list, name: str) -> str | None:
+    """args에서 '<name> <값>'을 꺼내 값을 반환한다. 없으면 None."""
+    if name not in args:
+        return None
+    i = args.index(name)
+    if i + 1 >= len(args):
+        print(f"{name} 뒤에 값이 필요합니다.")
         sys.exit(1)
-    else:
-        log.info("완료!")
+    value = args[i + 1]
+    del args[i:i + 2]
+    return value
+
+
+def _pop_flag(args: list, name: str) -> bool:
+    """args에서 플래그를 꺼낸다. 있었으면 True."""
+    if name not in args:
+        return False
+    args.remove(name)
+    return True
 
 
 if __name__ == "__main__":
     args = sys.argv[1:]
 
-    if len(args) == 0:
+    # --profiles <파일> → 파일의 모든 워크스페이스를 동시에 실행
+    profiles_path = _pop_option(args, "--profiles")
+    profiles = load_profiles(profiles_path) if profiles_path else None
+
+    if _pop_flag(args, "--startup-profile"):
+        _print_startup_profile()
+        sys.exit(0)
+
+    if args[:1] == ["enqueue"]:
+        # 범위를 작업 큐에 추가
+        try:
+            start = date.fromisoformat(args[1])
+            end = date.fromisoformat(args[2])
+        except (IndexError, ValueError):
+            print("사용법: python run_daily.py enqueue <시작일> <종료일> [--profiles 파일]")
+            sys.exit(1)
+        enqueue_range(start, end, profiles or [default_profile()])
+    elif args[:1] == ["worker"]:
+        # 큐가 빌 때까지 작업 처리 (여러 프로세스 동시 실행 가능)
+        worker_id = _pop_option(args, "--id")
+        counts = run_worker(profiles or [default_profile()], worker_id)
+        sys.exit(1 if counts["failed"] else 0)
+    elif args[:1] == ["audit"]:
+        # 그래프 점검 (--fix: 복구, --full: 워터마크 무시하고 전체 점검)
+        from audit import run_audit
+        fix = _pop_flag(args, "--fix")
+        full = _pop_flag(args, "--full")
+        setup_logging()
+        has_issue = False
+        for profile in profiles or [default_profile()]:
+            _profile_name.set(profile.name if profiles else "")
+            report = run_audit(get_client(profile.token), profile, fix=fix, full=full)
+            has_issue |= bool(report["issues"]) and not fix
+        sys.exit(1 if has_issue else 0)
+    elif args[:1] == ["template-sync"]:
+        # 템플릿 변경을 기존 Daily에 반영 (기본: 오늘 이후 전체, --dry-run: 변경 내용만 출력)
+        from template_sync import run_template_sync
+        dry_run = _pop_flag(args, "--dry-run")
+        try:
+            start = date.fromisoformat(args[1]) if len(args) > 1 else datetime.now(KST).date()
+            end = date.fromisoformat(args[2]) if len(args) > 2 else None
+        except ValueError:
+            print("사용법: python run_daily.py template-sync [시작일] [종료일] [--dry-run]")
+            sys.exit(1)
+        setup_logging()
+        failed = 0
+        for profile in profiles or [default_profile()]:
+            _profile_name.set(profile.name if profiles else "")
+            summary = run_template_sync(
+                get_client(profile.token), profile, start, end, dry_run=dry_run
+            )
+            failed += summary["failed"]
+        sys.exit(1 if failed else 0)
+    elif args[:1] == ["export"]:
+        # Daily 페이지를 로컬 SQLite로 미러링 (기본: 마지막 내보내기 이후 변경분, --full: 전체)
+        from daily_export import export_daily
+        full = _pop_flag(args, "--full")
+        setup_logging()
+        failed = 0
+        for profile in profiles or [default_profile()]:
+            _profile_name.set(profile.name if profiles else "")
+            failed += export_daily(get_client(profile.token), profile, full=full)["failed"]
+        sys.exit(1 if failed else 0)
+    elif args[:1] == ["history"]:
+        # 단계·상태별 최근 실행 이력의 p50/p95 (프로필 이름을 주면 그 프로필만)
+        from run_history import report, format_report
+        setup_logging()
+        rows = report(args[1] if len(args) > 1 else None)
+        log.info(f"[실행 이력] 단계 {len(rows)}개")
+        for line in format_report(rows):
+            log.info(line)
+    elif _pop_flag(args, "--plan"):
+        # 실행 계획만 출력 (쓰기 없음): 날짜 인자는 일반 실행과 같음
+        try:
+            dates = [date.fromisoformat(a) for a in args]
+        except ValueError:
+            print("사용법: python run_daily.py --plan [날짜] [종료날짜]")
+            sys.exit(1)
+        if len(dates) > 2 or (len(dates) == 2 and dates[0] > dates[1]):
+            print("사용법: python run_daily.py --plan [날짜] [종료날짜]")
+            sys.exit(1)
+        dates = dates or [datetime.now(KST).date()]
+        run_plan(plan_range(dates[0], dates[-1]).days, profiles, bulk=len(dates) == 2)
+    elif len(args) == 0:
         # 인자 없음 → 오늘 날짜
-        run()
+        sys.exit(_run_target(None, profiles))
     elif len(args) == 1:
         # 날짜 1개 → 해당 날짜
         try:
@@ -221,7 +870,7 @@ if __name__ == "__main__":
         except ValueError:
             print(f"잘못된 날짜 형식: {args[0]} (YYYY-MM-DD)")
             sys.exit(1)
-        run(target)
+        sys.exit(_run_target(target, profiles))
     elif len(args) == 2:
         # 날짜 2개 → 범위 순회
         try:
@@ -233,14 +882,28 @@ if __name__ == "__main__":
         if start > end:
             print(f"시작일({start})이 종료일({end})보다 큽니다.")
             sys.exit(1)
-        from datetime import timedelta
-        current = start
-        while current <= end:
-            run(current)
-            current += timedelta(days=1)
+        days = plan_range(start, end).days
+        # Daily는 범위 조회 1회 + 동시 생성으로 먼저 준비하고, 나머지 단계는 날짜순으로 실행
+        prepared = prepare_dailies(days, profiles)
+        # 한 날짜가 실패해도 나머지 날짜는 계속 실행하고, 종료 코드는 마지막에 정한다
+        codes = {day.date_str: _run_target(day.date, profiles, day, prepared) for day in days}
+        failed = [d for d, code in codes.items() if code == 1]
+        if failed:
+            log.error(f"범위 실행: {len(failed)}/{len(days)}일 에러 ({', '.join(failed)})")
+            sys.exit(1)
+        sys.exit(SLOW_EXIT_CODE if SLOW_EXIT_CODE in codes.values() else 0)
     else:
         print("사용법: python run_daily.py [날짜] [종료날짜]")
         print("  python run_daily.py              → 오늘 날짜")
         print("  python run_daily.py 2026-03-01   → 특정 날짜")
         print("  python run_daily.py 2026-03-01 2026-03-05 → 범위")
+        print("  python run_daily.py --profiles profiles.json [날짜] → 여러 워크스페이스 동시 실행")
+        print("  python run_daily.py enqueue 2026-01-01 2026-12-31 → 작업 큐에 범위 추가")
+        print("  python run_daily.py worker [--id 이름]  → 큐 작업 처리 (여러 프로세스 가능)")
+        print("  python run_daily.py audit [--fix] [--full] → Daily/Weekly/Monthly/Journal 점검")
+        print("  python run_daily.py template-sync [시작일] [종료일] [--dry-run] → 템플릿 변경 반영")
+        print("  python run_daily.py --plan [날짜] [종료날짜] → 실행 없이 쓰기/예상 API 호출 수 출력")
+        print("  python run_daily.py export [--full] → Daily 페이지를 state/export.sqlite로 미러링")
+        print("  python run_daily.py history [프로필] → 단계별 소요 시간/API 요청 수 p50/p95")
+        print("  python run_daily.py --startup-profile → 기동 시간(import) 측정")
         sys.exit(1)
@@ -0,0 +1,194 @@
+"""
+단계별 실행 이력과 SLO 점검 (state/run_history.sqlite).
+- 실행마다 단계별 소요 시간과 API 요청 수를 프로필·상태별로 기록하고 최근 HISTORY_RUNS회만 남긴다
+  ("생성"과 "기존"은 하는 일이 달라 분포가 다르므로 따로 쌓는다)
+- 이번 실행을 같은 상태의 이전 이력 p95와 비교해 느려졌거나 API 요청이 늘어난 단계를 찾는다 (회귀)
+- NOTION_STEP_SLO로 단계별 상한(초)을 주면 넘은 단계도 함께 표시한다
+"""
+import os
+import sqlite3
+from datetime import datetime, timezone
+from notion_config import STATE_DIR, STEP_SLO_SEC
+
+HISTORY_PATH = STATE_DIR / "run_history.sqlite"
+# 프로필·단계·상태별로 보관할 최근 실행 수
+HISTORY_RUNS = int(os.environ.get("NOTION_HISTORY_RUNS", "60"))
+# p95의 몇 배를 넘으면 회귀로 보는지
+REGRESSION_RATIO = float(os.environ.get("NOTION_REGRESSION_RATIO", "1.5"))
+# 이력이 이만큼 쌓이기 전에는 회귀를 판단하지 않는다
+MIN_HISTORY_RUNS = int(os.environ.get("NOTION_MIN_HISTORY_RUNS", "5"))
+
+# 짧은 단계의 흔들림은 무시한다 (p95보다 이만큼 이상 늘어야 회귀)
+_MIN_DELTA_SEC = 1.0
+_MIN_DELTA_CALLS = 2
+
+# 이 상태의 단계는 기록하지 않는다 (소요 시간이 정상 실행과 다름)
+_SKIP_STATUS = {"실패", "스킵", "미실행"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    profile TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT NOT NULL,
+    date TEXT NOT NULL,
+    recorded TEXT NOT NULL,
+    duration REAL NOT NULL,
+    api_calls INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_profile_step_status ON steps (profile, step, status, id);
+"""
+
+
+def _db() -> sqlite3.Connection:
+    HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(HISTORY_PATH, timeout=60, isolation_level=None)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def percentile(values: list, q: float) -> float:
+    """nearest-rank 백분위수 (q: 0~100). 값이 없으면 0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil
+    return float(ordered[int(rank) - 1])
+
+
+def _history(conn: sqlite3.Connection, profile: str, step: str, status: str) -> list:
+    """같은 상태로 끝난 최근 HISTORY_RUNS회의 (duration, api_calls), 최신순."""
+    return conn.execute(
+        "SELECT duration, api_calls FROM steps WHERE profile = ? AND step = ? AND status = ? "
+        "ORDER BY id DESC LIMIT ?",
+        (profile, step, status, HISTORY_RUNS),
+    ).fetchall()
+
+
+def _stats(rows: list) -> dict:
+    durations = [r[0] for r in rows]
+    calls = [r[1] for r in rows]
+    return {
+        "runs": len(rows),
+        "p50_sec": percentile(durations, 50),
+        "p95_sec": percentile(durations, 95),
+        "p50_calls": percentile(calls, 50),
+        "p95_calls": percentile(calls, 95),
+    }
+
+
+def check_run(summary: dict, skip: tuple = ()) -> list[dict]:
+    """
+    run_pipeline() 요약의 단계별 소요 시간/API 요청 수를 이력과 SLO에 비교하고 이력에 추가한다.
+    비교는 이번 실행을 넣기 전, 같은 상태("생성"/"기존" 등)로 끝난 이력으로 한다.
+
+    Args:
+        skip: 기록하지 않을 단계 (예: 범위 실행에서 미리 준비한 Daily)
+
+    Returns:
+        [{"step", "status", "kind": "SLO" | "시간" | "API", "value", "limit", "stats"}] — 넘은 항목만
+    """
+    alerts = []
+    recorded = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    conn = _db()
+    try:
+        for step, result in summary["results"].items():
+            status = result.get("status", "")
+            if step in skip or status in _SKIP_STATUS:
+                continue
+            duration = summary["durations"].get(step, 0.0)
+            calls = summary["api_calls"].get(step, 0)
+            key = (summary["profile"], step, status)
+            stats = _stats(_history(conn, *key))
+
+            slo = STEP_SLO_SEC.get(step)
+            if slo and duration > slo:
+                alerts.append({
+                    "step": step, "status": status, "kind": "SLO", "value": duration,
+                    "limit": slo, "stats": stats,
+                })
+            if stats["runs"] >= MIN_HISTORY_RUNS:
+                limit = stats["p95_sec"] * REGRESSION_RATIO
+                if duration > limit and duration - stats["p95_sec"] >= _MIN_DELTA_SEC:
+                    alerts.append({
+                        "step": step, "status": status, "kind": "시간", "value": duration,
+                        "limit": limit, "stats": stats,
+                    })
+                limit = stats["p95_calls"] * REGRESSION_RATIO
+                if calls > limit and calls - stats["p95_calls"] >= _MIN_DELTA_CALLS:
+                    alerts.append({
+                        "step": step, "status": status, "kind": "API", "value": calls,
+                        "limit": limit, "stats": stats,
+                    })
+
+            conn.execute(
+                "INSERT INTO steps (profile, step, status, date, recorded, duration, api_calls) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, summary["date"], recorded, duration, calls),
+            )
+            conn.execute(
+                "DELETE FROM steps WHERE profile = ? AND step = ? AND status = ? AND id NOT IN "
+                "(SELECT id FROM steps WHERE profile = ? AND step = ? AND status = ? "
+                "ORDER BY id DESC LIMIT ?)",
+                (*key, *key, HISTORY_RUNS),
+            )
+    finally:
+        conn.close()
+    return alerts
+
+
+def format_alert(alert: dict) -> str:
+    """check_run() 항목을 실행 요약 한 줄로 만든다."""
+    s = alert["stats"]
+    if alert["kind"] == "SLO":
+        return f"{alert['step']} {alert['value']:.1f}초 > SLO {alert['limit']:g}초"
+    if alert["kind"] == "시간":
+        return (
+            f"{alert['step']} {alert['value']:.1f}초 "
+            f"(최근 '{alert['status']}' {s['runs']}회 p50 {s['p50_sec']:.1f} / p95 {s['p95_sec']:.1f}초)"
+        )
+    return (
+        f"{alert['step']} API {alert['value']}회 "
+        f"(최근 '{alert['status']}' {s['runs']}회 p50 {s['p50_calls']:g} / p95 {s['p95_calls']:g}회)"
+    )
+
+
+def report(profile: str | None = None) -> list[dict]:
+    """
+    프로필·단계·상태별 최근 이력의 p50/p95 (run_daily.py history).
+
+    Returns:
+        [{"profile", "step", "status", "runs", "p50_sec", "p95_sec", "p50_calls", "p95_calls",
+          "slo_sec"}]
+    """
+    conn = _db()
+    try:
+        keys = conn.execute(
+            "SELECT profile, step, status FROM steps"
+            + (" WHERE profile = ?" if profile else "")
+            + " GROUP BY profile, step, status ORDER BY profile, MIN(id)",
+            (profile,) if profile else (),
+        ).fetchall()
+        return [
+            {
+                "profile": p, "step": step, "status": status,
+                **_stats(_history(conn, p, step, status)),
+                "slo_sec": STEP_SLO_SEC.get(step),
+            }
+            for p, step, status in keys
+        ]
+    finally:
+        conn.close()
+
+
+def format_report(rows: list[dict]) -> list[str]:
+    """report() 결과를 로그 줄로 만든다."""
+    lines = []
+    for r in rows:
+        slo = f" | SLO {r['slo_sec']:g}초" if r["slo_sec"] else ""
+        lines.append(
+            f"  {r['profile']:12s} {r['step']:10s} {r['status']:4s} | {r['runs']}회 | "
+            f"시간 p50 {r['p50_sec']:.1f} / p95 {r['p95_sec']:.1f}초 | "
+            f"API p50 {r['p50_calls']:g} / p95 {r['p95_calls']:g}회{slo}"
+        )
+    return lines
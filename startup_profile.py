@@ -0,0 +1,72 @@
+"""
+기동 시간 측정 (run_daily.py --startup-profile).
+python -X importtime과 비슷하게 모듈별 import 시간을 재되, CLI 안에서 바로 요약해 보여 준다.
+install()은 측정할 import보다 먼저 호출해야 한다.
+"""
+import sys
+import time
+import builtins
+
+_original_import = builtins.__import__
+_records = []   # (이름, 깊이, 누적 초, 자체 초) — import가 끝난 순서
+_stack = []     # 진행 중인 import의 자식 누적 시간
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    start = time.perf_counter()
+    _stack.append(0.0)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        _records.append((name, len(_stack), elapsed, elapsed - children))
+
+
+def install():
+    builtins.__import__ = _timed_import
+
+
+def uninstall():
+    builtins.__import__ = _original_import
+
+
+def process_age_sec() -> float | None:
+    """프로세스 시작 후 지난 시간 (Linux /proc 기준, 알 수 없으면 None)."""
+    try:
+        import os
+        fields = open("/proc/self/stat").read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        uptime = float(open("/proc/uptime").read().split()[0])
+        return uptime - started
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def mark() -> int:
+    """지금까지 기록된 import 수. report(since=...)로 구간을 나눌 때 쓴다."""
+    return len(_records)
+
+
+def report(title: str, since: int = 0, top: int = 12) -> list[str]:
+    """
+    since 이후 기록된 import를 최상위 import별 누적 시간과 자체 시간 상위 top개로 요약한다.
+    """
+    records = _records[since:]
+    base = min((depth for _, depth, _, _ in records), default=0)
+    roots = [r for r in records if r[1] == base]
+    total = sum(r[2] for r in roots)
+
+    lines = [f"{title}: {total * 1000:.1f} ms (모듈 {len(records)}개)"]
+    for name, _, cumulative, _ in sorted(roots, key=lambda r: -r[2]):
+        if cumulative >= 0.0005:
+            lines.append(f"  {cumulative * 1000:8.1f} ms  {name}")
+    if len(records) > len(roots):
+        lines.append(f"  자체 시간 상위 {top}개:")
+        for name, _, _, own in sorted(records, key=lambda r: -r[3])[:top]:
+            lines.append(f"  {own * 1000:8.1f} ms  {name}")
+    return lines
@@ -0,0 +1,320 @@
+"""
+템플릿 변경을 이미 만들어진 Daily 페이지에 반영한다.
+- 페이지 블록 트리를 현재 템플릿 계획과 비교해 필요한 추가/수정/삭제만 보낸다
+- synced_block은 지우거나 다시 만들지 않는다 (Journal이 ID로 참조)
+- 페이지를 만들 때 쓴 계획이 기록돼 있으면 (3-way) 템플릿에서 바뀐 하위 트리만 읽고,
+  사용자가 고친 블록은 건드리지 않는다
+- 기록이 없는 페이지는 (append) 사용자 수정과 템플릿 변경을 구분할 수 없으므로
+  템플릿에서 빠진 블록만 추가하고 기존 블록은 수정/삭제하지 않는다
+- 템플릿 적용이 중간에 끊긴 페이지는 (repair) synced_block 내부까지 빠진 블록을 채우고,
+  다시 읽어 빠진 블록이 없을 때만 계획을 기록한다
+"""
+import logging
+from datetime import date
+from difflib import SequenceMatcher
+from notion_client import Client
+from notion_config import Profile, query_all
+from response_cache import bypass
+from add_daily import (
+    compile_template, block_signature, write_plan_nodes,
+    load_page_plan, record_page_plan, load_page_synced,
+    is_template_pending, mark_template_pending,
+)
+from add_journal_entry import get_blocks, get_text
+
+log = logging.getLogger("notion_daily")
+
+
+class _Sync:
+    """페이지 하나의 동기화 작업. dry_run이면 읽기만 하고 바꿀 내용을 센다."""
+
+    def __init__(
+        self, notion: Client, dry_run: bool, synced_ids: dict | None = None,
+        fill_synced: bool = False,
+    ):
+        self.notion = notion
+        self.dry_run = dry_run
+        # True면 synced_block 내부도 빠진 블록을 채운다 (템플릿 적용이 끊긴 페이지 — 사용자 기록 없음)
+        self.fill_synced = fill_synced
+        self.stats = {"appended": 0, "updated": 0, "deleted": 0, "kept": 0, "reads": 0}
+        # 기록된 원본 synced_block ID → label (사용자가 순서를 바꿔도 ID는 그대로)
+        self.synced_labels = {block_id: label for label, block_id in (synced_ids or {}).items()}
+
+    def children(self, block: dict | str) -> list:
+        if isinstance(block, dict):
+            if not block.get("has_children"):
+                return []
+            block = block["id"]
+        self.stats["reads"] += 1
+        return get_blocks(self.notion, block)
+
+    def sync_level(self, parent_id: str, base: list | None, new: list, actual: list):
+        """
+        parent_id 아래 블록 목록 하나를 맞춘다.
+        base: 페이지를 만들 때 쓴 계획 노드 (None이면 기록 없음 → 빠진 블록만 추가)
+        """
+        new_labels = [n["label"] for n in new if n["label"]]
+        act_sigs = self._actual_sigs(actual)
+        if base is None:
+            self.append_missing(parent_id, new, actual, act_sigs)
+            return [label for label in new_labels if f"synced:{label}" not in act_sigs]
+
+        # 기준 계획 노드 → 페이지 블록
+        # mapped: 그대로 남아 있는 블록, touched: 같은 자리에서 사용자가 고친 블록 (위치 기준으로만 사용)
+        mapped, touched = {}, {}
+        matcher = SequenceMatcher(None, [b["sig"] for b in base], act_sigs, autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            target = mapped if op == "equal" else touched
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                target[i] = actual[j]
+
+        anchor = "start"
+        matcher = SequenceMatcher(
+            None, [b["sig"] for b in base], [n["sig"] for n in new], autojunk=False
+        )
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal":
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    block = mapped.get(i) or touched.get(i)
+                    if block:
+                        anchor = block["id"]
+                        if base[i]["hash"] != new[j]["hash"]:
+                            self.sync_children(block, base[i], new[j])
+                continue
+
+            pairs = min(i2 - i1, j2 - j1) if op == "replace" else 0
+            for k in range(pairs):
+                b, n = base[i1 + k], new[j1 + k]
+                block = mapped.get(i1 + k)
+                if i1 + k in touched:
+                    # 템플릿과 사용자가 같은 블록을 고쳤으면 사용자 쪽을 남긴다
+                    block = touched[i1 + k]
+                    if block["type"] == n["block"]["type"]:
+                        self.sync_children(block, b, n)
+                    anchor = block["id"]
+                elif block and block["type"] == n["block"]["type"] and not n["label"]:
+                    self.update(block, n)
+                    self.sync_children(block, b, n)
+                    anchor = block["id"]
+                else:
+                    if block:
+                        self.delete(block)
+                    anchor = self.append(parent_id, [n], anchor)
+            for i in range(i1 + pairs, i2):
+                if mapped.get(i):
+                    self.delete(mapped[i])
+                elif touched.get(i):
+                    anchor = touched[i]["id"]
+            if j1 + pairs < j2:
+                anchor = self.append(parent_id, new[j1 + pairs : j2], anchor)
+
+        missing = [label for label in new_labels if f"synced:{label}" not in act_sigs]
+        return missing
+
+    def append_missing(self, parent_id: str, new: list, actual: list, act_sigs: list):
+        """
+        기록이 없는 페이지: 현재 계획과 내용이 같은 블록은 하위 트리로 내려가고,
+        페이지에 대응하는 블록이 없는 계획 노드만 추가한다.
+        내용이 다른 블록은 사용자가 고친 것일 수 있으므로 수정/삭제하지 않고 그대로 둔다.
+        """
+        anchor = "start"
+        matcher = SequenceMatcher(None, act_sigs, [n["sig"] for n in new], autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "insert":
+                anchor = self.append(parent_id, new[j1:j2], anchor)
+                continue
+            if op == "equal":
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    node = new[j]
+                    if node["label"]:
+                        # synced_block 내부(사용자 기록)는 기록 없이 건드리지 않는다
+                        if self.fill_synced:
+                            self.fill_synced_block(actual[i], node)
+                        continue
+                    if not node["children"]:
+                        continue
+                    if actual[i].get("has_children"):
+                        kids = self.children(actual[i])
+                        self.sync_level(actual[i]["id"], None, node["children"], kids)
+                    else:
+                        self.append(actual[i]["id"], node["children"], "start")
+            else:
+                self.stats["kept"] += i2 - i1
+            if i2 > i1:
+                anchor = actual[i2 - 1]["id"]
+
+    def fill_synced_block(self, block: dict, node: dict):
+        """synced_block 안 heading과 그 자식 중 빠진 것만 추가한다 (fill_synced 전용)."""
+        heading = node["children"][0]
+        inner = self.children(block)
+        if not inner:
+            self.append(block["id"], [heading], "start")
+            return
+        if heading["children"]:
+            kids = self.children(inner[0])
+            self.sync_level(inner[0]["id"], None, heading["children"], kids)
+
+    def sync_children(self, block: dict, base: dict, new: dict):
+        if base["children"] is not None and (
+            [c["hash"] for c in base["children"]] == [c["hash"] for c in new["children"]]
+        ):
+            return  # 하위 트리는 템플릿에서 바뀌지 않음
+        if new["label"]:
+            # synced_block 내부: 기록된 계획이 있을 때만 템플릿 변경분을 반영
+            if base["children"] is None:
+                return
+            inner = self.children(block)
+            if not inner:
+                return
+            heading = inner[0]
+            base_kids = base["children"][0]["children"]
+            new_kids = new["children"][0]["children"]
+            self.sync_level(heading["id"], base_kids, new_kids, self.children(heading))
+            return
+        if base["children"] is None and not new["children"] and not block.get("has_children"):
+            return
+        self.sync_level(block["id"], base["children"], new["children"], self.children(block))
+
+    def _actual_sigs(self, actual: list) -> list:
+        """
+        페이지 블록의 서명. 원본 synced_block은 "synced:<label>"로 바꾼다.
+        label은 기록된 synced_block ID로 찾고, 기록에 없는 원본은 내부 heading을 읽어 확인한다.
+        (사용자가 블록 순서를 바꿀 수 있으므로 위치로 짐작하지 않는다)
+        """
+        sigs = [block_signature(b) for b in actual]
+        for i, b in enumerate(actual):
+            if b.get("type") != "synced_block" or b["synced_block"].get("synced_from"):
+                continue
+            label = self.synced_labels.get(b["id"])
+            if label is None:
+                inner = self.children(b)
+                label = get_text(inner[0]) if inner else ""
+            sigs[i] = f"synced:{label}"
+        return sigs
+
+    def append(self, parent_id: str, nodes: list, anchor: str) -> str:
+        self.stats["appended"] += len(nodes)
+        if self.dry_run:
+            return anchor
+        created = write_plan_nodes(self.notion, parent_id, nodes, after_block_id=anchor)
+        return created[-1]["id"] if created else anchor
+
+    def update(self, block: dict, node: dict):
+        self.stats["updated"] += 1
+        if self.dry_run:
+            return
+        btype = node["block"]["type"]
+        self.notion.blocks.update(block_id=block["id"], **{btype: node["block"][btype]})
+
+    def delete(self, block: dict):
+        if block.get("type") == "synced_block":
+            return  # Journal이 참조하므로 남긴다
+        self.stats["deleted"] += 1
+        if not self.dry_run:
+            self.notion.blocks.delete(block_id=block["id"])
+
+
+def sync_page(notion: Client, page_id: str, plan: dict, dry_run: bool = False) -> dict:
+    """
+    Daily 페이지 하나를 plan에 맞춘다.
+
+    템플릿 적용이 끊긴 페이지(add_daily.mark_template_pending)는 기록된 계획과 상관없이 repair로
+    빠진 블록을 채우고, 다시 읽어 모두 채워졌을 때만 계획을 기록하고 pending을 지운다.
+
+    Returns:
+        {"mode": "unchanged"|"3-way"|"append"|"repair", "appended", "updated", "deleted", "kept",
+         "reads", "missing_synced", "complete"}
+        complete: repair가 끝났는지 (repair가 아니면 항상 True)
+    """
+    pending = is_template_pending(page_id)
+    base = None if pending else load_page_plan(page_id)
+    if base and base["hash"] == plan["hash"]:
+        return {"mode": "unchanged", "appended": 0, "updated": 0, "deleted": 0, "kept": 0,
+                "reads": 0, "missing_synced": [], "complete": True}
+
+    sync = _Sync(notion, dry_run, load_page_synced(page_id), fill_synced=pending)
+    missing = sync.sync_level(
+        page_id, base["nodes"] if base else None, plan["nodes"], sync.children(page_id)
+    )
+    complete = not pending
+    if pending and not dry_run:
+        check = _Sync(notion, True, load_page_synced(page_id), fill_synced=True)
+        check.sync_level(page_id, None, plan["nodes"], check.children(page_id))
+        sync.stats["reads"] += check.stats["reads"]
+        complete = check.stats["appended"] == 0
+    if not dry_run and complete:
+        record_page_plan(page_id, plan["hash"])
+        if pending:
+            mark_template_pending(page_id, None)
+    mode = "repair" if pending else "3-way" if base else "append"
+    return {"mode": mode, **sync.stats, "missing_synced": missing, "complete": complete}
+
+
+def run_template_sync(
+    notion: Client,
+    profile: Profile,
+    start: date,
+    end: date | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    start~end(종료일 생략 시 이후 전체) 날짜의 Daily 페이지에 현재 템플릿을 반영한다.
+
+    Returns:
+        {"pages", "unchanged", "appended", "updated", "deleted", "failed"}
+    """
+    with bypass():
+        return _run_template_sync(notion, profile, start, end, dry_run)
+
+
+def _run_template_sync(notion, profile, start, end, dry_run) -> dict:
+    # 템플릿과 페이지는 Notion에서 직접 고쳐지므로 캐시를 거치지 않고 읽는다
+    plan = compile_template(notion, profile.template_page_id, refresh=True)
+    date_filter = {"property": "날짜", "date": {"on_or_after": start.isoformat()}}
+    if end:
+        date_filter = {"and": [
+            date_filter,
+            {"property": "날짜", "date": {"on_or_before": end.isoformat()}},
+        ]}
+    pages = query_all(notion, profile.daily_ds_id, filter=date_filter)
+    log.info(
+        f"[템플릿 동기화] {profile.name} | Daily {len(pages)}개 | 계획 {plan['hash']}"
+        f"{' (dry-run)' if dry_run else ''}"
+    )
+
+    summary = {"pages": len(pages), "unchanged": 0, "appended": 0, "updated": 0,
+               "deleted": 0, "failed": 0}
+    for page in pages:
+        title = "".join(
+            t.get("plain_text", "") for t in page["properties"].get("일간", {}).get("title", [])
+        )
+        try:
+            result = sync_page(notion, page["id"], plan, dry_run)
+        except Exception as e:
+            summary["failed"] += 1
+            log.error(f"  {title} | 실패: {e}")
+            continue
+        if result["mode"] == "unchanged":
+            summary["unchanged"] += 1
+            continue
+        for key in ("appended", "updated", "deleted"):
+            summary[key] += result[key]
+        log.info(
+            f"  {title} | {result['mode']} | 추가 {result['appended']} 수정 {result['updated']} "
+            f"삭제 {result['deleted']} (읽기 {result['reads']}회)"
+        )
+        if result["kept"]:
+            log.warning(
+                f"  {title} | 템플릿과 다른 블록 {result['kept']}개는 그대로 둠 "
+                f"(만들 때의 계획 기록 없음)"
+            )
+        if not result["complete"] and not dry_run:
+            log.warning(f"  {title} | 템플릿 적용이 끝나지 않음 (다음 동기화에서 다시 채움)")
+        if result["missing_synced"]:
+            log.warning(f"  {title} | synced_block 새로 생성: {result['missing_synced']} (audit --fix로 Journal 연결)")
+
+    log.info(
+        f"  완료: 변경 없음 {summary['unchanged']}, 추가 {summary['appended']}, "
+        f"수정 {summary['updated']}, 삭제 {summary['deleted']}, 실패 {summary['failed']}"
+    )
+    return summary
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 모듈이 import 시점에 state/ 경로를 정하므로 먼저 임시 디렉터리로 돌린다
+os.environ.setdefault("NOTION_STATE_DIR", tempfile.mkdtemp(prefix="notion_state_"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
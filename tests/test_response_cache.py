@@ -0,0 +1,91 @@
+import pytest
+
+from response_cache import ResponseCache, request_tags, QUERY_TAG
+
+PAGE = "1111aaaa-0000-0000-0000-000000000000"
+BLOCK = "2222bbbb-0000-0000-0000-000000000000"
+OTHER = "3333cccc-0000-0000-0000-000000000000"
+
+
+def _children(parent_id: str, *block_ids: str) -> dict:
+    return {
+        "results": [
+            {"object": "block", "id": b, "parent": {"type": "page_id", "page_id": parent_id}}
+            for b in block_ids
+        ],
+        "has_more": False,
+    }
+
+
+def _put(cache: ResponseCache, path: str, value, method="GET", body=None) -> str:
+    key = cache.make_key(method, path, body=body)
+    cache.put(key, path, value)
+    return key
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(max_entries=10, ttl_sec=60)
+
+
+def test_request_tags():
+    assert request_tags(f"blocks/{BLOCK}/children") == {BLOCK.replace("-", "")}
+    assert request_tags("data_sources/ds1/query") == {"ds1", QUERY_TAG}
+    assert request_tags("search") == set()
+
+
+def test_write_to_block_invalidates_its_children(cache):
+    key = _put(cache, f"blocks/{PAGE}/children", _children(PAGE, BLOCK))
+    other = _put(cache, f"blocks/{OTHER}/children", _children(OTHER))
+    assert cache.get(key)["results"][0]["id"] == BLOCK
+
+    # 하이픈 없는 ID로 써도 같은 태그
+    cache.invalidate_write("PATCH", f"blocks/{PAGE.replace('-', '')}/children")
+    assert cache.get(key) is None
+    assert cache.get(other) is not None
+
+
+def test_write_to_child_invalidates_parent_listing(cache):
+    key = _put(cache, f"blocks/{PAGE}/children", _children(PAGE, BLOCK))
+    # 응답에 parent가 없어도 목록에서 배운 부모 ID로 지운다
+    cache.invalidate_write("DELETE", f"blocks/{BLOCK}", response={"id": BLOCK})
+    assert cache.get(key) is None
+
+
+def test_page_write_invalidates_queries(cache):
+    query = _put(cache, "data_sources/ds1/query", {"results": []}, method="POST", body={"filter": {}})
+    listing = _put(cache, f"blocks/{OTHER}/children", _children(OTHER))
+
+    cache.invalidate_write("PATCH", f"pages/{PAGE}", body={"properties": {}})
+    assert cache.get(query) is None
+    assert cache.get(listing) is not None
+
+
+def test_unknown_write_clears_everything(cache):
+    key = _put(cache, f"blocks/{PAGE}/children", _children(PAGE))
+    cache.invalidate_write("POST", "comments")
+    assert cache.get(key) is None
+
+
+def test_lru_keeps_max_entries():
+    cache = ResponseCache(max_entries=2, ttl_sec=60)
+    keys = [_put(cache, f"blocks/{b}/children", _children(b)) for b in (PAGE, BLOCK, OTHER)]
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats()["size"] == 2
+
+
+def test_disk_invalidation_is_shared(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    writer = ResponseCache(disk_path=path, namespace="tok")
+    key = _put(writer, f"blocks/{PAGE}/children", _children(PAGE, BLOCK))
+
+    reader = ResponseCache(disk_path=path, namespace="tok")
+    assert reader.get(key) is not None
+    assert reader.stats()["disk_hits"] == 1
+    # 다른 토큰(namespace)의 항목은 보이지 않는다
+    assert ResponseCache(disk_path=path, namespace="other").get(key) is None
+
+    # 다른 프로세스의 쓰기 무효화는 디스크 단계로 전해진다
+    reader.invalidate_write("PATCH", f"blocks/{BLOCK}")
+    assert ResponseCache(disk_path=path, namespace="tok").get(key) is None
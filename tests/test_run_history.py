@@ -0,0 +1,125 @@
+import sqlite3
+
+import pytest
+
+import run_daily
+import run_history
+
+
+@pytest.fixture(autouse=True)
+def history_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_history, "HISTORY_PATH", tmp_path / "run_history.sqlite")
+    monkeypatch.setattr(run_history, "STEP_SLO_SEC", {})
+    monkeypatch.setattr(run_history, "MIN_HISTORY_RUNS", 5)
+    monkeypatch.setattr(run_history, "REGRESSION_RATIO", 1.5)
+    return tmp_path / "run_history.sqlite"
+
+
+def _summary(step="Journal", status="기존", duration=1.0, calls=3, profile="default"):
+    return {
+        "date": "2026-03-01",
+        "profile": profile,
+        "results": {step: {"status": status, "detail": ""}},
+        "durations": {step: duration},
+        "api_calls": {step: calls},
+    }
+
+
+def _fill(n, **kwargs):
+    for _ in range(n):
+        assert run_history.check_run(_summary(**kwargs)) == []
+
+
+# ── percentile ──
+
+
+def test_percentile_empty():
+    assert run_history.percentile([], 95) == 0.0
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 21))
+    assert run_history.percentile(values, 50) == 10
+    assert run_history.percentile(values, 95) == 19
+    assert run_history.percentile(values, 100) == 20
+    assert run_history.percentile([7, 3, 5], 0) == 3
+
+
+# ── check_run ──
+
+
+def test_no_regression_before_min_history():
+    _fill(4, duration=1.0)
+    assert run_history.check_run(_summary(duration=30.0)) == []
+
+
+def test_time_and_api_regression():
+    _fill(5, duration=1.0, calls=3)
+    alerts = run_history.check_run(_summary(duration=10.0, calls=20))
+    assert [(a["kind"], a["status"]) for a in alerts] == [("시간", "기존"), ("API", "기존")]
+    assert alerts[0]["stats"]["runs"] == 5
+
+
+def test_small_delta_is_ignored():
+    _fill(5, duration=0.2, calls=1)
+    # p95의 1.5배는 넘지만 차이가 1초/2회보다 작다
+    assert run_history.check_run(_summary(duration=0.9, calls=2)) == []
+
+
+def test_compares_only_same_status():
+    # 매일 "기존"으로 끝나는 Weekly가 주 시작에 "생성"되면 더 오래 걸리는 게 정상
+    _fill(10, step="Weekly", status="기존", duration=0.5, calls=2)
+    assert run_history.check_run(
+        _summary(step="Weekly", status="생성", duration=8.0, calls=40)
+    ) == []
+    # "생성" 이력이 쌓인 뒤에는 "생성"끼리 비교한다
+    _fill(4, step="Weekly", status="생성", duration=8.0, calls=40)
+    alerts = run_history.check_run(_summary(step="Weekly", status="생성", duration=30.0, calls=40))
+    assert [(a["kind"], a["status"]) for a in alerts] == [("시간", "생성")]
+
+
+def test_slo_alert(monkeypatch):
+    monkeypatch.setattr(run_history, "STEP_SLO_SEC", {"Journal": 5.0})
+    alerts = run_history.check_run(_summary(duration=6.0))
+    assert [a["kind"] for a in alerts] == ["SLO"]
+    assert run_history.format_alert(alerts[0]) == "Journal 6.0초 > SLO 5초"
+
+
+def test_skip_and_failed_steps_are_not_recorded(history_db):
+    run_history.check_run(_summary(status="실패", duration=60.0))
+    run_history.check_run(_summary(step="Daily"), skip=("Daily",))
+    conn = sqlite3.connect(history_db)
+    assert conn.execute("SELECT COUNT(*) FROM steps").fetchone()[0] == 0
+    conn.close()
+
+
+def test_history_is_pruned_per_status(history_db, monkeypatch):
+    monkeypatch.setattr(run_history, "HISTORY_RUNS", 3)
+    _fill(5, status="기존")
+    _fill(2, status="생성")
+    conn = sqlite3.connect(history_db)
+    counts = dict(conn.execute("SELECT status, COUNT(*) FROM steps GROUP BY status"))
+    conn.close()
+    assert counts == {"기존": 3, "생성": 2}
+
+
+# ── 종료 코드 ──
+
+
+@pytest.mark.parametrize("has_error, slow, code", [
+    (False, [], 0),
+    (False, ["Journal"], run_daily.SLOW_EXIT_CODE),
+    (True, ["Journal"], 1),
+])
+def test_run_target_exit_code(monkeypatch, has_error, slow, code):
+    monkeypatch.setattr(run_daily, "setup_logging", lambda *a, **k: None)
+    monkeypatch.setattr(run_daily, "default_profile", lambda: None)
+    monkeypatch.setattr(
+        run_daily, "run_pipeline",
+        lambda *a, **k: {"has_error": has_error, "slow": slow},
+    )
+    assert run_daily._run_target(None, None) == code
+
+
+def test_slow_exit_code_differs_from_error():
+    assert run_daily.SLOW_EXIT_CODE not in (0, 1)
@@ -0,0 +1,186 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+import add_daily
+import template_sync
+
+
+class FakeNotion:
+    """블록 목록/추가/수정/삭제만 흉내 내는 메모리 클라이언트."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.store = {}  # block_id → block
+        self.kids = {}  # parent_id → [block_id]
+        # parent 블록을 받아 True면 그 아래 추가를 실패시키거나(fail) 조용히 버린다(drop)
+        self.fail_append = None
+        self.drop_append = None
+        self.blocks = SimpleNamespace(
+            children=SimpleNamespace(list=self._list, append=self._append),
+            update=self._update,
+            delete=self._delete,
+        )
+
+    def page(self) -> str:
+        page_id = f"page-{next(self._ids)}"
+        self.kids[page_id] = []
+        return page_id
+
+    def add(self, parent_id: str, block: dict, position: dict | None = None) -> dict:
+        btype = block["type"]
+        data = {k: v for k, v in block[btype].items() if k != "children"} if block[btype] else {}
+        for rt in data.get("rich_text", []):
+            rt["plain_text"] = rt["text"]["content"]
+        new = {
+            "object": "block", "id": f"block-{next(self._ids)}", "type": btype,
+            btype: data, "has_children": False, "parent": {"block_id": parent_id},
+        }
+        self.store[new["id"]] = new
+        self.kids[new["id"]] = []
+        siblings = self.kids[parent_id]
+        if position and position["type"] == "start":
+            siblings.insert(0, new["id"])
+        elif position:
+            siblings.insert(siblings.index(position["after_block"]["id"]) + 1, new["id"])
+        else:
+            siblings.append(new["id"])
+        if parent_id in self.store:
+            self.store[parent_id]["has_children"] = True
+        for child in (block[btype] or {}).get("children", []):
+            self.add(new["id"], child)
+        return new
+
+    def _list(self, block_id, start_cursor=None):
+        return {"results": [self.store[i] for i in self.kids[block_id]], "has_more": False}
+
+    def _append(self, block_id, children, position=None):
+        parent = self.store.get(block_id)
+        if self.fail_append and self.fail_append(parent):
+            raise RuntimeError("append 실패")
+        if self.drop_append and self.drop_append(parent):
+            return {"results": []}
+        results = []
+        for child in children:
+            results.append(self.add(block_id, child, position))
+            position = {"type": "after_block", "after_block": {"id": results[-1]["id"]}}
+        return {"results": results}
+
+    def _update(self, block_id, **data):
+        block = self.store[block_id]
+        block[block["type"]].update(data[block["type"]])
+
+    def _delete(self, block_id):
+        block = self.store.pop(block_id)
+        self.kids[block["parent"]["block_id"]].remove(block_id)
+
+    def tree(self, block_id: str) -> list:
+        """(텍스트, 자식 트리) 목록. synced_block은 "synced"로 표시한다."""
+        out = []
+        for i in self.kids[block_id]:
+            block = self.store[i]
+            text = "synced" if block["type"] == "synced_block" else add_daily.get_text(block)
+            out.append((text, self.tree(i)))
+        return out
+
+
+def _text(btype: str, content: str, **extra) -> dict:
+    return {"type": btype, btype: {
+        "rich_text": [{"type": "text", "text": {"content": content}}], **extra,
+    }}
+
+
+def _inside_synced_heading(parent) -> bool:
+    return bool(parent) and parent["type"] == "heading_3"
+
+
+@pytest.fixture(autouse=True)
+def plan_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(add_daily, "TEMPLATE_STATE_PATH", tmp_path / "template_plans.sqlite")
+    monkeypatch.setattr(add_daily, "_template_cache", {})
+    monkeypatch.setattr(add_daily.time, "sleep", lambda sec: None)
+
+
+@pytest.fixture
+def notion():
+    return FakeNotion()
+
+
+@pytest.fixture
+def template(notion):
+    page_id = notion.page()
+    notion.add(page_id, _text("heading_2", "오늘"))
+    for label in ("기록 - 개인", "기록 - 업무"):
+        heading = notion.add(page_id, _text("heading_3", label, is_toggleable=True))
+        notion.add(heading["id"], _text("paragraph", "메모"))
+    return page_id
+
+
+def _heading_children(notion: FakeNotion, page_id: str) -> dict:
+    """synced_block 내부 heading label → 그 아래 블록 텍스트."""
+    out = {}
+    for text, kids in notion.tree(page_id):
+        if text == "synced":
+            (label, items), = kids
+            out[label] = [t for t, _ in items]
+    return out
+
+
+def test_template_change_follows_synced_id_after_swap(notion, template):
+    page_id = notion.page()
+    synced_ids = add_daily.copy_template_with_synced(notion, template, page_id)
+    # 사용자가 두 기록 블록의 순서를 바꿈
+    kids = notion.kids[page_id]
+    i, j = kids.index(synced_ids["기록 - 개인"]), kids.index(synced_ids["기록 - 업무"])
+    kids[i], kids[j] = kids[j], kids[i]
+
+    personal = notion.kids[template][1]
+    notion.add(personal, _text("paragraph", "감사 3가지"))
+    plan = add_daily.compile_template(notion, template, refresh=True)
+    result = template_sync.sync_page(notion, page_id, plan)
+
+    assert result["mode"] == "3-way"
+    assert _heading_children(notion, page_id) == {
+        "기록 - 업무": ["메모"],
+        "기록 - 개인": ["메모", "감사 3가지"],
+    }
+    assert add_daily.load_page_plan(page_id)["hash"] == plan["hash"]
+
+
+def test_interrupted_template_is_repaired_inside_synced_heading(notion, template):
+    page_id = notion.page()
+    notion.fail_append = _inside_synced_heading
+    with pytest.raises(RuntimeError):
+        add_daily._apply_template(notion, page_id, template)
+    assert add_daily.is_template_pending(page_id)
+    assert _heading_children(notion, page_id) == {"기록 - 개인": [], "기록 - 업무": []}
+
+    notion.fail_append = None
+    synced_ids = add_daily.daily_synced_ids(notion, page_id, template)
+
+    assert set(synced_ids) == {"기록 - 개인", "기록 - 업무"}
+    assert _heading_children(notion, page_id) == {
+        "기록 - 개인": ["메모"],
+        "기록 - 업무": ["메모"],
+    }
+    assert not add_daily.is_template_pending(page_id)
+    assert add_daily.load_page_plan(page_id) is not None
+
+
+def test_incomplete_repair_keeps_page_pending(notion, template):
+    page_id = notion.page()
+    notion.fail_append = _inside_synced_heading
+    with pytest.raises(RuntimeError):
+        add_daily._apply_template(notion, page_id, template)
+
+    # 다시 채우는 중에도 heading 아래 쓰기가 반영되지 않음
+    notion.fail_append = None
+    notion.drop_append = _inside_synced_heading
+    plan = add_daily.compile_template(notion, template)
+    result = template_sync.sync_page(notion, page_id, plan)
+
+    assert result["mode"] == "repair"
+    assert not result["complete"]
+    assert add_daily.is_template_pending(page_id)
+    assert add_daily.load_page_plan(page_id) is None
@@ -0,0 +1,107 @@
+import pytest
+
+import work_queue
+from work_queue import WorkQueue
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(work_queue.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    q = WorkQueue(tmp_path / "queue.sqlite", lease_sec=60, max_attempts=2)
+    yield q
+    q.close()
+
+
+def _status(queue: WorkQueue, date: str) -> tuple:
+    return queue._conn.execute(
+        "SELECT status, attempts, owner, last_error FROM tasks WHERE date = ?", (date,)
+    ).fetchone()
+
+
+def test_enqueue_is_unique_per_profile_date(queue):
+    assert queue.enqueue("default", "2026-03-01", ["week:10"])
+    assert not queue.enqueue("default", "2026-03-01", ["week:10"])
+    assert queue.enqueue("work", "2026-03-01", ["week:10"])
+    assert queue.counts()["pending"] == 2
+
+
+def test_claim_in_date_order_and_idempotent(queue):
+    queue.enqueue("default", "2026-03-02", ["a"])
+    queue.enqueue("default", "2026-03-01", ["b"])
+
+    task = queue.claim("w1")
+    assert (task.date, task.attempts) == ("2026-03-01", 1)
+    # 같은 worker가 다시 claim하면 잡고 있던 작업을 돌려준다 (시도 횟수는 그대로)
+    again = queue.claim("w1")
+    assert (again.id, again.attempts) == (task.id, 1)
+    assert queue.counts() == {"pending": 1, "leased": 1, "done": 0, "failed": 0}
+
+
+def test_resource_lock_blocks_other_workers(queue):
+    queue.enqueue("default", "2026-03-01", ["week:10", "month:3"])
+    queue.enqueue("default", "2026-03-02", ["week:10", "month:3"])
+    queue.enqueue("default", "2026-03-09", ["week:11", "month:3"])
+
+    first = queue.claim("w1")
+    # 같은 주/월을 쓰는 작업은 건너뛰고, 겹치지 않는 작업도 month:3 때문에 기다린다
+    assert queue.claim("w2") is None
+
+    queue.complete(first, "w1")
+    second = queue.claim("w2")
+    assert second.date == "2026-03-02"
+    assert queue.claim("w1") is None
+    assert _status(queue, "2026-03-01")[0] == "done"
+
+
+def test_fail_backs_off_then_marks_failed(queue, clock):
+    queue.enqueue("default", "2026-03-01", ["a"])
+    task = queue.claim("w1")
+    queue.fail(task, "w1", "Daily: 오류")
+    assert _status(queue, "2026-03-01") == ("pending", 1, None, "Daily: 오류")
+    assert queue.claim("w1") is None  # backoff 대기
+
+    clock[0] += 30
+    task = queue.claim("w1")
+    assert task.attempts == 2
+    queue.fail(task, "w1", "Daily: 오류")
+    assert _status(queue, "2026-03-01")[0] == "failed"
+
+
+def test_expired_lease_is_reclaimed(queue, clock):
+    queue.enqueue("default", "2026-03-01", ["a"])
+    queue.claim("w1")
+
+    clock[0] += 61
+    task = queue.claim("w2")
+    assert task.attempts == 2
+    assert _status(queue, "2026-03-01")[:3] == ("leased", 2, "w2")
+
+
+def test_expired_lease_without_attempts_left_fails(queue, clock):
+    queue.enqueue("default", "2026-03-01", ["a"])
+    queue.claim("w1")
+    clock[0] += 61
+    queue.claim("w2")
+
+    # worker를 죽게 만드는 작업은 시도 횟수를 다 쓰면 더 돌지 않는다
+    clock[0] += 61
+    assert queue.claim("w3") is None
+    assert _status(queue, "2026-03-01") == ("failed", 2, None, "lease 만료")
+    assert queue.counts()["failed"] == 1
+
+
+def test_release_returns_tasks_and_resources(queue):
+    queue.enqueue("default", "2026-03-01", ["a"])
+    queue.enqueue("default", "2026-03-02", ["a"])
+    queue.claim("w1")
+    assert queue.claim("w2") is None
+
+    queue.release("w1")
+    assert _status(queue, "2026-03-01")[:3] == ("pending", 1, None)
+    assert queue.claim("w2").date == "2026-03-01"
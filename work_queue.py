@@ -0,0 +1,252 @@
+"""
+대량 backfill용 로컬 작업 큐 (SQLite).
+- 날짜 단위 작업을 lease 방식으로 여러 worker 프로세스에 나눠 준다
+- 작업마다 Weekly/Monthly 페이지와 Journal 월 토글을 리소스 키로 가지며,
+  같은 리소스를 쓰는 작업은 동시에 한 worker만 잡을 수 있다 (relation 갱신 경합 방지)
+- 실패한 작업은 backoff 후 재시도하고, 죽은 worker의 lease는 만료 후 회수된다
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    profile TEXT NOT NULL,
+    date TEXT NOT NULL,
+    resources TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_until REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    UNIQUE (profile, date)
+);
+CREATE TABLE IF NOT EXISTS resource_leases (
+    resource TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    lease_until REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rate_slots (
+    token_key TEXT PRIMARY KEY,
+    next_slot REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Task:
+    id: int
+    profile: str
+    date: str
+    resources: list
+    attempts: int
+
+
+class WorkQueue:
+    """
+    SQLite 파일 하나로 여러 프로세스가 공유하는 작업 큐.
+
+    Args:
+        path: 큐 파일 경로
+        lease_sec: 작업 lease 시간. 실행 예산보다 길게 잡는다
+        max_attempts: 이 횟수만큼 실패하면 failed로 남긴다
+    """
+
+    def __init__(self, path: str | Path, lease_sec: float = 1200, max_attempts: int = 3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _tx(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (claim 경합 방지)."""
+        return _Transaction(self._conn)
+
+    def enqueue(self, profile: str, date: str, resources: list) -> bool:
+        """작업을 추가한다. 같은 (profile, date)가 이미 있으면 False."""
+        with self._tx() as cur:
+            cur.execute(
+                "INSERT OR IGNORE INTO tasks (profile, date, resources) VALUES (?, ?, ?)",
+                (profile, date, json.dumps(resources, ensure_ascii=False)),
+            )
+            return cur.rowcount > 0
+
+    def claim(self, worker: str) -> Task | None:
+        """
+        실행할 작업 하나를 lease한다.
+        이미 이 worker가 잡고 있는 작업이 있으면 그 작업을 다시 돌려준다 (멱등).
+        """
+        now = time.time()
+        with self._tx() as cur:
+            # 만료된 lease 회수 (worker를 죽게 만드는 작업이 계속 돌지 않도록 시도 횟수 확인)
+            self._reclaim(cur, "lease_until < ?", (now,), "lease 만료")
+            cur.execute("DELETE FROM resource_leases WHERE lease_until < ?", (now,))
+
+            row = cur.execute(
+                "SELECT id, profile, date, resources, attempts FROM tasks "
+                "WHERE status = 'leased' AND owner = ?",
+                (worker,),
+            ).fetchone()
+            if row:
+                task = _to_task(row)
+                self._lease(cur, task, worker, now, renew=True)
+                return task
+
+            busy = {
+                r for (r,) in cur.execute(
+                    "SELECT resource FROM resource_leases WHERE owner != ?", (worker,)
+                )
+            }
+            rows = cur.execute(
+                "SELECT id, profile, date, resources, attempts FROM tasks "
+                "WHERE status = 'pending' AND available_at <= ? ORDER BY date, id",
+                (now,),
+            )
+            for row in rows:
+                task = _to_task(row)
+                if busy.isdisjoint(task.resources):
+                    self._lease(cur, task, worker, now)
+                    task.attempts += 1
+                    return task
+        return None
+
+    def _lease(self, cur, task: Task, worker: str, now: float, renew: bool = False):
+        until = now + self.lease_sec
+        if renew:
+            cur.execute("UPDATE tasks SET lease_until = ? WHERE id = ?", (until, task.id))
+        else:
+            cur.execute(
+                "UPDATE tasks SET status = 'leased', owner = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (worker, until, task.id),
+            )
+        cur.executemany(
+            "INSERT OR REPLACE INTO resource_leases (resource, owner, lease_until) "
+            "VALUES (?, ?, ?)",
+            [(r, worker, until) for r in task.resources],
+        )
+
+    def complete(self, task: Task, worker: str):
+        with self._tx() as cur:
+            cur.execute(
+                "UPDATE tasks SET status = 'done', owner = NULL, last_error = NULL "
+                "WHERE id = ? AND owner = ?",
+                (task.id, worker),
+            )
+            self._release_resources(cur, task, worker)
+
+    def fail(self, task: Task, worker: str, error: str):
+        """실패를 기록한다. 재시도 횟수가 남아 있으면 backoff 후 다시 pending."""
+        with self._tx() as cur:
+            if task.attempts >= self.max_attempts:
+                cur.execute(
+                    "UPDATE tasks SET status = 'failed', owner = NULL, last_error = ? "
+                    "WHERE id = ? AND owner = ?",
+                    (error, task.id, worker),
+                )
+            else:
+                retry_at = time.time() + 30 * 2 ** (task.attempts - 1)
+                cur.execute(
+                    "UPDATE tasks SET status = 'pending', owner = NULL, last_error = ?, "
+                    "available_at = ? WHERE id = ? AND owner = ?",
+                    (error, retry_at, task.id, worker),
+                )
+            self._release_resources(cur, task, worker)
+
+    def _release_resources(self, cur, task: Task, worker: str):
+        cur.executemany(
+            "DELETE FROM resource_leases WHERE resource = ? AND owner = ?",
+            [(r, worker) for r in task.resources],
+        )
+
+    def release(self, worker: str):
+        """worker 종료 시 잡고 있던 작업과 리소스를 모두 돌려놓는다."""
+        with self._tx() as cur:
+            self._reclaim(cur, "owner = ?", (worker,), "worker 종료")
+            cur.execute("DELETE FROM resource_leases WHERE owner = ?", (worker,))
+
+    def _reclaim(self, cur, where: str, params: tuple, error: str):
+        """
+        lease 중인 작업을 돌려놓는다. 시도 횟수가 다 찬 작업은 failed로 남기고
+        (last_error가 없으면 error를 기록), 나머지는 다시 pending.
+        """
+        cur.execute(
+            "UPDATE tasks SET status = 'failed', owner = NULL, "
+            "last_error = COALESCE(last_error, ?) "
+            f"WHERE status = 'leased' AND {where} AND attempts >= ?",
+            (error, *params, self.max_attempts),
+        )
+        cur.execute(
+            f"UPDATE tasks SET status = 'pending', owner = NULL WHERE status = 'leased' AND {where}",
+            params,
+        )
+
+    def counts(self) -> dict:
+        """상태별 작업 수. {"pending": 10, "leased": 2, "done": 30, "failed": 0}"""
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def close(self):
+        self._conn.close()
+
+
+class SharedRateLimiter:
+    """
+    큐 파일을 통해 여러 worker 프로세스가 함께 쓰는 토큰별 속도 제한.
+    notion_config.RateLimiter와 같은 acquire() 인터페이스를 가진다.
+    """
+
+    def __init__(self, path: str | Path, token: str, rate: float):
+        self.rate = rate
+        # 토큰 원문 대신 해시를 키로 저장
+        self.token_key = hashlib.sha256(token.encode()).hexdigest()[:16]
+        # hedge 스레드 등 여러 스레드에서 호출되므로 연결을 잠금으로 보호
+        self._conn = sqlite3.connect(
+            Path(path), timeout=60, isolation_level=None, check_same_thread=False
+        )
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock, _Transaction(self._conn) as cur:
+            now = time.time()
+            row = cur.execute(
+                "SELECT next_slot FROM rate_slots WHERE token_key = ?", (self.token_key,)
+            ).fetchone()
+            slot = max(row[0] if row else 0.0, now)
+            cur.execute(
+                "INSERT OR REPLACE INTO rate_slots (token_key, next_slot) VALUES (?, ?)",
+                (self.token_key, slot + 1 / self.rate),
+            )
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __enter__(self) -> sqlite3.Cursor:
+        self._cur = self._conn.cursor()
+        self._cur.execute("BEGIN IMMEDIATE")
+        return self._cur
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cur.execute("ROLLBACK" if exc_type else "COMMIT")
+        self._cur.close()
+
+
+def _to_task(row) -> Task:
+    task_id, profile, date, resources, attempts = row
+    return Task(task_id, profile, date, json.loads(resources), attempts)